@@ -0,0 +1,88 @@
+import numpy as np
+
+# problem classes and the status every solver must report for them
+EXPECTED = {
+    'feasible': 'optimal',
+    'degenerate': 'optimal',
+    'equality': 'optimal',
+    'infeasible': 'infeasible',
+    'unbounded': 'unbounded',
+}
+
+
+def _matrix(rng, m, n, density):
+    # nonnegative integer coefficients keep the tableaus exact enough to compare runs
+    A = rng.integers(1, 10, (m, n)).astype(np.float64)
+    A[rng.random((m, n)) > density] = 0.0
+    # every column needs one nonzero entry or a positive cost makes it unbounded
+    empty = np.flatnonzero(~A.any(axis=0))
+    A[rng.integers(0, m, empty.size), empty] = rng.integers(1, 10, empty.size)
+    return A
+
+
+def feasible(rng, m, n, density):
+    # max c x, A x <= b with A >= 0 and b > 0: x = 0 is feasible and the optimum is finite
+    A = _matrix(rng, m, n, density)
+    b = rng.integers(n, 10 * n, m).astype(np.float64)
+    c = rng.integers(1, 20, n).astype(np.float64)
+    return {'c': c, 'A': A, 'b': b, 'operators': ["≤"] * m, 'is_min': False}
+
+
+def degenerate(rng, m, n, density):
+    # like feasible, but half of the right-hand sides are zero
+    problem = feasible(rng, m, n, density)
+    problem['b'][rng.permutation(m)[:m // 2]] = 0.0
+    return problem
+
+
+def unbounded(rng, m, n, density):
+    # a column with no positive entry and a positive cost can grow forever
+    problem = feasible(rng, m, n, density)
+    j = rng.integers(0, n)
+    problem['A'][:, j] = -problem['A'][:, j]
+    return problem
+
+
+def infeasible(rng, m, n, density):
+    # a feasible model whose last row is forced above its own upper limit
+    problem = feasible(rng, m, n, density)
+    A, b = problem['A'], problem['b']
+    A[-1] = A[0]
+    b[-1] = b[0] + 1.0
+    problem['operators'][-1] = "≥"
+    return problem
+
+
+def equality(rng, m, n, density):
+    # min c x with two thirds of the rows as equalities around a known point x0 >= 0
+    A = _matrix(rng, m, n, density)
+    x0 = rng.integers(0, 5, n).astype(np.float64)
+    b = A.dot(x0)
+    operators = ["="] * m
+    for i in rng.permutation(m)[:m // 3]:
+        operators[i] = "≤"
+        b[i] += rng.integers(1, 10)
+    c = rng.integers(1, 20, n).astype(np.float64)
+    return {'c': c, 'A': A, 'b': b, 'operators': operators, 'is_min': True}
+
+
+GENERATORS = {
+    'feasible': feasible,
+    'degenerate': degenerate,
+    'unbounded': unbounded,
+    'infeasible': infeasible,
+    'equality': equality,
+}
+
+
+def generate(kind, m, n, seed=0, density=None):
+    """ Genera un problema reproducible de la clase kind con m restricciones y n variables
+
+        The same (kind, m, n, seed) always gives the same problem. Large models are
+        sparse by default (about 20 nonzeros per row). """
+    if density is None:
+        density = min(1.0, 20.0 / n)
+    rng = np.random.default_rng([seed, m, n, list(GENERATORS).index(kind)])
+    problem = GENERATORS[kind](rng, m, n, density)
+    problem['vars_name'] = [f"x{j + 1}" for j in range(n)]
+    return problem
@@ -0,0 +1,210 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+from Benchmarks.Generators import EXPECTED, GENERATORS, generate
+from Engine.Batch import solve_problem
+from Engine.Pricing import PRICING
+from Engine.Trace import NONE, SolveCancelled, TraceSink
+
+SOLVERS = ('simplex', 'bigm', 'two-phase')
+# (constraints, variables)
+SIZES = {
+    'quick': [(5, 5), (20, 40), (60, 120)],
+    'full': [(5, 5), (20, 40), (100, 200), (500, 1000), (2000, 4000)],
+}
+
+
+class DeadlineTrace(TraceSink):
+    """ No escribe nada; corta la resolución al pasar time_limit segundos """
+
+    level = NONE
+
+    def __init__(self, time_limit=None):
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    def write(self, text):
+        pass
+
+    def progress(self, iteration, objective):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SolveCancelled()
+
+
+def applicable(solver, problem):
+    # the plain simplex only starts from the slack basis of a max problem with <= rows
+    if solver == 'simplex':
+        return not problem['is_min'] and all(op == "≤" for op in problem['operators'])
+    return True
+
+
+def run_once(solver, problem, time_limit=None, memory=False, pricing=None, presolve=True, scaling=True):
+    """ Resuelve una vez y devuelve (estado, segundos, SolveStats o None, pico de memoria en bytes) """
+    trace = DeadlineTrace(time_limit)
+    problem = dict(problem, method=solver, trace=trace, pricing=pricing, presolve=presolve, scaling=scaling)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    stats = None
+    try:
+        result = solve_problem(problem)
+        status, stats = result['Type'], result.get('Stats')
+    except SolveCancelled:
+        status = 'timeout'
+    finally:
+        seconds = time.perf_counter() - start
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return status, seconds, stats, peak
+
+
+def run_suite(sizes, kinds=None, solvers=SOLVERS, seed=0, repeat=3, time_limit=60.0, memory=True, log=None,
+              pricing='dantzig', presolve=True, scaling=True):
+    """ Ejecuta cada solver sobre cada clase y tamaño y devuelve la lista de mediciones
+
+        Wall time is the best of `repeat` runs. Peak memory comes from one extra run
+        under tracemalloc, which slows the solvers down and so is never timed.
+        Every solver uses the same pricing rule (see Engine.Pricing) and, unless
+        presolve / scaling are False, solves the presolved and scaled problem. """
+    results = []
+    for m, n in sizes:
+        for kind in kinds or GENERATORS:
+            problem = generate(kind, m, n, seed)
+            for solver in solvers:
+                record = {'kind': kind, 'm': m, 'n': n, 'seed': seed, 'solver': solver,
+                          'pricing': pricing, 'presolve': presolve, 'scaling': scaling,
+                          'expected': EXPECTED[kind]}
+                if not applicable(solver, problem):
+                    record['status'] = 'skipped'
+                    results.append(record)
+                    continue
+                times = []
+                for _ in range(repeat):
+                    status, seconds, stats, _ = run_once(solver, problem, time_limit, pricing=pricing, presolve=presolve, scaling=scaling)
+                    times.append(seconds)
+                    if status == 'timeout':
+                        break
+                record.update(status=status, seconds=min(times))
+                if stats is not None:
+                    pivots = stats.total_pivots
+                    record.update(pivots=pivots, seconds_per_pivot=min(times) / pivots if pivots else None,
+                                  phase_pivots=stats.pivots, degenerate=stats.degenerate,
+                                  peak_tableau_bytes=stats.peak_tableau_bytes)
+                if memory and status != 'timeout':
+                    record['peak_bytes'] = run_once(solver, problem, time_limit, True, pricing, presolve, scaling)[3]
+                results.append(record)
+                if log is not None:
+                    log(format_record(record))
+    return results
+
+
+def format_record(record):
+    line = f"{record['kind']:>10} {record['m']:>5}x{record['n']:<5} {record['solver']:>9}: {record['status']:<10}"
+    if 'seconds' in record:
+        line += f" {record['seconds']:10.4f} s"
+    if 'pivots' in record:
+        line += f" {record['pivots']:7d} pivots"
+    if record.get('peak_bytes') is not None:
+        line += f" {record['peak_bytes'] / 2 ** 20:9.1f} MiB"
+    if record['status'] not in ('skipped', 'timeout', record['expected']):
+        line += f"  (expected {record['expected']})"
+    return line
+
+
+def _key(record):
+    # runs saved before pricing rules existed all used dantzig
+    return record['kind'], record['m'], record['n'], record['seed'], record['solver'], \
+        record.get('pricing', 'dantzig')
+
+
+def compare(results, baseline, tolerance=0.2):
+    """ Compara con una ejecución anterior; devuelve las líneas de las regresiones encontradas
+
+        A run regresses when it is more than `tolerance` slower, uses more than
+        `tolerance` more peak memory, needs more pivots or changes its status. """
+    previous = {_key(record): record for record in baseline['results']}
+    regressions = []
+    for record in results:
+        old = previous.get(_key(record))
+        if old is None or record['status'] == 'skipped':
+            continue
+        name = "{} {}x{} {}".format(record['kind'], record['m'], record['n'], record['solver'])
+        if record['status'] != old['status']:
+            regressions.append(f"{name}: status {old['status']} -> {record['status']}")
+            continue
+        # sub-millisecond differences are timer noise, whatever the ratio
+        if 'seconds' in old and record['seconds'] > old['seconds'] * (1 + tolerance) and \
+                record['seconds'] - old['seconds'] > 1e-3:
+            regressions.append(f"{name}: {old['seconds']:.4f} s -> {record['seconds']:.4f} s")
+        if old.get('pivots') is not None and record.get('pivots', 0) > old['pivots']:
+            regressions.append(f"{name}: {old['pivots']} -> {record['pivots']} pivots")
+        if old.get('peak_bytes') and record.get('peak_bytes') and \
+                record['peak_bytes'] > old['peak_bytes'] * (1 + tolerance):
+            regressions.append(f"{name}: peak {old['peak_bytes']} -> {record['peak_bytes']} bytes")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m Benchmarks.Suite',
+        description="Mide tiempo, pivotes y memoria de los tres solvers sobre problemas generados")
+    parser.add_argument('--sizes', default='quick',
+                        help="'quick', 'full' o una lista como 5x5,100x200 (restricciones x variables)")
+    parser.add_argument('--kinds', default=','.join(GENERATORS), help="clases de problema separadas por comas")
+    parser.add_argument('--solvers', default=','.join(SOLVERS), help="solvers separados por comas")
+    parser.add_argument('--pricing', default='dantzig', choices=list(PRICING), help="regla de la variable entrante")
+    parser.add_argument('--no-presolve', action='store_true', help="resolver los problemas generados sin reducirlos")
+    parser.add_argument('--no-scaling', action='store_true', help="resolver sin escalar filas ni columnas")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="ejecuciones cronometradas por caso (se guarda la mejor)")
+    parser.add_argument('--time-limit', type=float, default=60.0, help="segundos por ejecución antes de cortarla")
+    parser.add_argument('--no-memory', action='store_true', help="no medir el pico de memoria")
+    parser.add_argument('-o', '--output', help="archivo JSON donde guardar los resultados")
+    parser.add_argument('--baseline', help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="holgura relativa antes de marcar una regresión")
+    return parser.parse_args(argv)
+
+
+def _sizes(text):
+    if text in SIZES:
+        return SIZES[text]
+    return [tuple(int(v) for v in size.split('x')) for size in text.split(',')]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_suite(_sizes(args.sizes), args.kinds.split(','), args.solvers.split(','), args.seed,
+                        args.repeat, args.time_limit, not args.no_memory,
+                        log=lambda line: print(line, file=sys.stderr, flush=True), pricing=args.pricing,
+                        presolve=not args.no_presolve, scaling=not args.no_scaling)
+    report = {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=1, ensure_ascii=False)
+    wrong = [r for r in results if r['status'] not in ('skipped', 'timeout', r['expected'])]
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+    return 1 if regressions or wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -74,15 +74,19 @@ class BigMCoefficient:
         return float(self) >= float(other)
 
     def __str__(self):
-        if abs(self.m_coeff) < 1e-10 and abs(self.const_coeff) < 1e-10:
+        return self.format(self.m_coeff, self.const_coeff)
+
+    @staticmethod
+    def format(m_coeff, const_coeff):
+        if abs(m_coeff) < 1e-10 and abs(const_coeff) < 1e-10:
             return "0.00"
-        elif abs(self.m_coeff) < 1e-10:
-            return f"{self.const_coeff:.2f}"
-        elif abs(self.const_coeff) < 1e-10:
-            return f"{self.m_coeff:.2f}M"
+        elif abs(m_coeff) < 1e-10:
+            return f"{const_coeff:.2f}"
+        elif abs(const_coeff) < 1e-10:
+            return f"{m_coeff:.2f}M"
         else:
-            sign = "+" if self.const_coeff > 0 else "-"
-            return f"{self.m_coeff:.2f}M{sign}{abs(self.const_coeff):.2f}"
+            sign = "+" if const_coeff > 0 else "-"
+            return f"{m_coeff:.2f}M{sign}{abs(const_coeff):.2f}"
 
     @classmethod
     def from_string(cls, coef_str):
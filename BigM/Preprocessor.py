@@ -1,6 +1,8 @@
 import re
 import sys
 from collections import defaultdict
+import numpy as np
+from Engine.Sparse import as_constraint_matrix, fill_dense
 
 class BigMPreprocessor:
     def __init__(self, coef, constr, op_constr, res_constr, minimize=True):
@@ -10,7 +12,7 @@ class BigMPreprocessor:
         self.res_constr = res_constr
         self.minimize = minimize
         self.num_vars = len(coef)
-        self.num_constraints = len(constr)
+        self.num_constraints = len(res_constr)
 
         self.M = 1000  # Big M value
         self.slack_count = 1
@@ -179,6 +181,47 @@ class BigMPreprocessor:
         
         self.objective = f"{simplified_obj} = {right_side}"
 
+    def build_tableau(self):
+        """ Construye la tabla inicial de Gran M directamente como planos (M, constante) """
+        # A may be dense, a scipy.sparse matrix or a list of (row, col, value) triplets
+        A = as_constraint_matrix(self.constr, (self.num_constraints, self.num_vars))
+        rhs = np.asarray(self.res_constr, dtype=np.float64).reshape(-1)
+        # keep every right-hand side non-negative so the starting basis is feasible
+        flipped = np.flatnonzero(rhs < 0)
+        ops = list(self.op_constr)
+        for i in flipped:
+            ops[i] = {'<=': '>=', '>=': '<=', '=': '='}[ops[i]]
+
+        slack_rows = [i for i, op in enumerate(ops) if op in ('<=', '>=')]
+        artificial_rows = [i for i, op in enumerate(ops) if op in ('>=', '=')]
+        n_slack = len(slack_rows)
+        n_art = len(artificial_rows)
+        cols = self.num_vars + n_slack + n_art + 1
+
+        tableau_m = np.zeros((self.num_constraints + 1, cols), dtype=np.float64)
+        tableau_c = np.zeros((self.num_constraints + 1, cols), dtype=np.float64)
+        if self.num_constraints > 0:
+            fill_dense(tableau_c[:-1, :self.num_vars], A)
+            tableau_c[flipped, :self.num_vars] *= -1.0
+        tableau_c[:-1, -1] = np.abs(rhs)
+        for k, i in enumerate(slack_rows):
+            tableau_c[i, self.num_vars + k] = 1.0 if ops[i] == '<=' else -1.0
+        for k, i in enumerate(artificial_rows):
+            tableau_c[i, self.num_vars + n_slack + k] = 1.0
+
+        # Z row of the maximization form: Z - c'X + M*A = 0, with the artificial
+        # columns priced out by subtracting M times each artificial row
+        coef = np.asarray(self.coef, dtype=np.float64)
+        tableau_c[-1, :self.num_vars] = coef if self.minimize else -coef
+        if n_art > 0:
+            tableau_m[-1] = -tableau_c[artificial_rows].sum(axis=0)
+            tableau_m[-1, self.num_vars + n_slack:-1] = 0.0
+
+        self.artificial_vars = [f"A{k + 1}" for k in range(n_art)]
+        variables = [f"X{j + 1}" for j in range(self.num_vars)] + \
+                    [f"S{k + 1}" for k in range(n_slack)] + self.artificial_vars
+        return tableau_m, tableau_c, variables
+
     def preprocess(self):
         self._add_variables()
         self._construct_objective()
@@ -1,14 +1,15 @@
-from typing import List, Tuple
-from sys import exit
+from typing import List
 # from PolynomialAddition import big_m_addition
 # from Coefficient import BigMCoefficient
 # from Preprocessor import BigMPreprocessor
 from BigM.Coefficient import BigMCoefficient
 from BigM.Preprocessor import BigMPreprocessor
+from Engine.Pivot import pivot_big_m
+from Engine.Pricing import as_pricing
+from Engine.RatioTest import ratio_test
+from Engine.Stats import SolveStats
+from Engine.Trace import SUMMARY, TABLEAU, as_trace
 import numpy as np
-import re
-import tkinter as tk
-import math
 
 class BigMSolver:
     def __init__(
@@ -19,7 +20,8 @@ class BigMSolver:
             coefs_constr: List[List[float]],
             op_constr,
             res_constr: List[float],
-            is_min: bool = False
+            is_min: bool = False,
+            stats: SolveStats = None
         ):
         self.num_var = num_var
         self.num_restr = num_constr
@@ -30,102 +32,165 @@ class BigMSolver:
         self.is_min = is_min
         
         self.all_variables = []
+        self.status = None  # 'optimal', 'unbounded' o 'infeasible' después de solve()
+        self.stats = stats if stats is not None else SolveStats()
+        self._m_scale = 1.0  # largest |M part| in the objective row, see _m_tolerance
 
-        Preprocessor = BigMPreprocessor(coefs_objective, coefs_constr, op_constr, res_constr, is_min)
-        objective, constraints = Preprocessor.preprocess()
-        self.list_tableau = self.parse_problem(objective, constraints)
-
-        self.M = 1000  # A large number to represent M
         self.slack_vars = sum(1 for op in op_constr if op in ['<=', '>='])
         self.artificial_vars = sum(1 for op in op_constr if op in ['=', '>='])
         
-        self.tableau = self.create_initial_tableau()
+        with self.stats.timer('standard form'):
+            self.tableau_m, self.tableau_c = self.create_initial_tableau()
+        self.stats.tableau(self.tableau_m, self.tableau_c)
 
     def create_initial_tableau(self):
-        rows = len(self.list_tableau)
-        cols = len(self.list_tableau[-1])
-        tableau = [[BigMCoefficient(0, 0) for _ in range(cols)] for _ in range(rows)]
-    
-        for i in range(len(self.list_tableau)):
-            for j in range(len(self.list_tableau[i])):
-                if i == rows - 1:  # This is the objective row
-                    if self.is_min:
-                        # For minimization, we negate the objective coefficients
-                        coeff = BigMCoefficient.from_string(self.list_tableau[i][j])
-                        tableau[i][j] = BigMCoefficient(-coeff.m_coeff, coeff.const_coeff, coeff.variable)
-                    else:
-                        # For maximization, we use the coefficients as they are
-                        tableau[i][j] = BigMCoefficient.from_string(self.list_tableau[i][j])
-                else:
-                    # For constraint rows, we use the coefficients as they are
-                    tableau[i][j] = BigMCoefficient.from_string(self.list_tableau[i][j])
-    
-        return tableau
-
-    def solve(self, text_widget):
+        # The tableau is kept as two parallel planes: the coefficient of M and
+        # the constant part of every cell. No numeric value is ever given to M.
+        Preprocessor = BigMPreprocessor(self.coef_objective, self.coef_restr, self.op_constr, self.res_restr, self.is_min)
+        tableau_m, tableau_c, self.all_variables = Preprocessor.build_tableau()
+        return tableau_m, tableau_c
+
+    def problem_text(self):
+        """ Devuelve la función objetivo y las restricciones en forma de texto (solo para mostrar) """
+        Preprocessor = BigMPreprocessor(self.coef_objective, self.coef_restr, self.op_constr, self.res_restr, self.is_min)
+        return Preprocessor.preprocess()
+
+    def _m_tolerance(self, tol=1e-10):
+        # round-off in the M plane grows with its entries, so the tolerance follows the
+        # largest M part seen so far: it outlives the entries that caused it
+        self._m_scale = max(self._m_scale, float(np.abs(self.tableau_m[-1]).max()))
+        return tol * self._m_scale
+
+    def _entering_column(self, pricing, tol=1e-10):
+        # Reduced costs are compared lexicographically as (M part, constant part):
+        # columns that reduce the M part come first, the constant part breaks ties
+        cost_m = self.tableau_m[-1, :-1]
+        m_tol = self._m_tolerance(tol)
+        cost_c = self.tableau_c[-1, :-1]
+        columns = self.tableau_c[:-1, :-1]  # constraint rows have no M part
+        if (cost_m < -m_tol).any():
+            return pricing.select(-cost_m, np.flatnonzero(cost_m < -m_tol), columns, tiebreak=-cost_c)
+        candidates = np.flatnonzero((np.abs(cost_m) <= m_tol) & (cost_c < -tol))
+        return pricing.select(-cost_c, candidates, columns)  # None: optimal solution reached
+
+    def _initial_basis(self):
+        # every row starts with a unit column: its slack (<=) or its artificial variable;
+        # they sit to the right, so they win over any structural column that looks alike
+        rows = self.tableau_c[:-1, :-1]
+        basis = np.zeros(rows.shape[0], dtype=int)
+        unit = (rows == 1.0).sum(axis=0) == 1
+        unit &= np.count_nonzero(rows, axis=0) == 1
+        for j in np.flatnonzero(unit):
+            basis[np.flatnonzero(rows[:, j])[0]] = j
+        return basis
+
+    def solve(self, trace=None, history=None, pricing=None, max_degenerate=50, max_iterations=None):
+        """ trace: TraceSink, widget tk.Text o None (sin traza); history: TableauHistory opcional;
+            pricing: regla de entrada ('dantzig' por defecto, ver Engine.Pricing).
+            Los contadores y tiempos quedan en self.stats
+
+            After max_degenerate degenerate pivots in a row Bland's rule takes over
+            until the objective moves again, which rules out cycling. max_iterations
+            (by default 50 times rows plus columns) is a last guard: reaching it
+            raises RuntimeError. """
+        trace = as_trace(trace)
+        pricing = as_pricing(pricing)
+        bland = as_pricing('bland')
+        if max_iterations is None:
+            max_iterations = 50 * sum(self.tableau_c.shape)
+        degenerate_run = 0
+        basis = self._initial_basis()
+        start = basis.copy()  # their columns hold B^-1, for the lexicographic rule
         iteration = 0
-        while True:
-            self.print_tableau(text_widget, iteration)
-            # self._print_tableau_DEBUG(text_widget, iteration)
-    
-            # Find the pivot column
-            pivot_col = min(range(len(self.tableau[0]) - 1), key=lambda j: float(self.tableau[-1][j]))
-            if float(self.tableau[-1][pivot_col]) >= -1e-10:  # Use a small tolerance for floating-point comparisons
-                break  # Optimal solution reached
-    
-            # Find the pivot row
-            ratios = []
-            for i in range(len(self.tableau) - 1):
-                if float(self.tableau[i][pivot_col]) <= 0:
-                    ratios.append(BigMCoefficient(float('inf'), float('inf')))
-                else:
-                    ratios.append(self.tableau[i][-1] / self.tableau[i][pivot_col])
+        if history is not None:
+            history.start((self.tableau_m, self.tableau_c), label='Big M')
+        with self.stats.run_phase('big m'):
+            while True:
+                if trace.level >= TABLEAU:
+                    with self.stats.timer('display'):
+                        self.print_tableau(trace, iteration)
+                # self._print_tableau_DEBUG(text_widget, iteration)
     
-            if all(ratio.is_infinite() for ratio in ratios):
-                print("The problem is unbounded.\n")
-                text_widget.insert(tk.END, "The problem is unbounded.\n")
-                return None, None
+                # Find the pivot column; Bland's rule after a long degenerate run (anti-cycling fallback)
+                rule = bland if degenerate_run >= max_degenerate else pricing
+                m_tol = self._m_tolerance()
+                if not (self.tableau_m[-1, :-1] < -m_tol).any() and abs(self.tableau_m[-1, -1]) > m_tol:
+                    # the M part can't drop any further but artificials still hold some of
+                    # it: infeasible (checked below), whatever the constant part would find
+                    break
+                pivot_col = self._entering_column(rule)
+                if pivot_col is None:
+                    break
+                if iteration >= max_iterations:
+                    raise RuntimeError(f"Big M: no optimal basis after {iteration} iterations")
     
-            pivot_row = min(range(len(ratios)), key=lambda i: float(ratios[i]))
+                # Find the pivot row (constraint rows have no M part)
+                pivot_row, step = ratio_test(self.tableau_c[:-1, pivot_col], self.tableau_c[:-1, -1], 1e-10,
+                                             lexico=self.tableau_c[:-1, start], basis=basis, bland=rule.bland)
+                if pivot_row is None:
+                    if trace.level >= SUMMARY:
+                        trace.write("The problem is unbounded.\n")
+                    self.status = 'unbounded'
+                    return None, None
     
-            # Perform pivot operation
-            pivot_element = self.tableau[pivot_row][pivot_col]
-            self.tableau[pivot_row] = [elem / pivot_element for elem in self.tableau[pivot_row]]
-            for i in range(len(self.tableau)):
-                if i != pivot_row:
-                    self.tableau[i] = [self.tableau[i][j] - self.tableau[i][pivot_col] * self.tableau[pivot_row][j]
-                                       for j in range(len(self.tableau[i]))]
-    
-            iteration += 1
+                # Perform pivot operation
+                element = self.tableau_c[pivot_row, pivot_col]
+                degenerate = step <= 1e-10
+                degenerate_run = degenerate_run + 1 if degenerate else 0
+                pivot_big_m(self.tableau_m, self.tableau_c, pivot_row, pivot_col)
+                self.stats.pivot(degenerate)
+                pricing.update(self.tableau_c[pivot_row, :-1], pivot_col, basis[pivot_row])
+                basis[pivot_row] = pivot_col
+                if history is not None:
+                    history.pivot(pivot_row, pivot_col, element)
     
+                iteration += 1
+                trace.progress(iteration, self.tableau_c[-1, -1])
+
         # Print final tableau
-        self.print_tableau(text_widget, iteration, is_final=True)
+        if trace.level >= TABLEAU:
+            with self.stats.timer('display'):
+                self.print_tableau(trace, iteration, is_final=True)
         # self._print_tableau_DEBUG(text_widget, iteration, is_final=True)
+
+        # An artificial variable left at a positive level keeps an M part in Z
+        if abs(self.tableau_m[-1, -1]) > self._m_tolerance():
+            if trace.level >= SUMMARY:
+                trace.write("The problem is infeasible.\n")
+            self.status = 'infeasible'
+            return None, None
     
-        # Extract and return the solution
+        # Extract and return the solution; read it off the basis, since a nonbasic
+        # column may also have a single nonzero (e.g. the x⁻ part of a free column)
         solution = [0] * self.num_var
-        for i in range(self.num_var):
-            col = [self.tableau[j][i] for j in range(len(self.tableau) - 1)]
-            if sum(1 for elem in col if float(elem) != 0) == 1:
-                row = next(j for j, elem in enumerate(col) if float(elem) != 0)
-                solution[i] = float(self.tableau[row][-1])
+        for row, i in enumerate(basis):
+            if i < self.num_var:
+                solution[i] = float(self.tableau_c[row, -1])
     
-        objective_value = float(self.tableau[-1][-1])
+        objective_value = float(self.tableau_c[-1, -1])
         if self.is_min:
             objective_value = -objective_value  # Negate for minimization problems
     
+        if trace.level >= SUMMARY:
+            with self.stats.timer('display'):
+                trace.write(f"Optimal solution found after {iteration} iterations:\n")
+                trace.write(f"Optimal Objective Value: {objective_value:.4f}\n")
+                for i, value in enumerate(solution):
+                    trace.write(f"x{i+1}: {value:.4f}\n")
+
+        self.status = 'optimal'
         return solution, objective_value
 
-    def print_tableau(self, text_widget, iteration, is_final=False):
-        text_widget.insert(tk.END, f"{'Final ' if is_final else ''}Tableau - Iteration {iteration}:\n")
+    def print_tableau(self, trace, iteration, is_final=False):
+        trace.write(f"{'Final ' if is_final else ''}Tableau - Iteration {iteration}:\n")
         
         # Use all_variables for headers, adding 'RHS' at the end
         headers = self.all_variables + ['RHS']
-        text_widget.insert(tk.END, "\t".join(headers) + "\n")
+        trace.write("\t".join(headers) + "\n")
 
-        for row in self.tableau:
-            text_widget.insert(tk.END, "\t".join(str(coeff) for coeff in row) + "\n")
-        text_widget.insert(tk.END, "\n")
+        for row_m, row_c in zip(self.tableau_m, self.tableau_c):
+            trace.write("\t".join(BigMCoefficient.format(m, c) for m, c in zip(row_m, row_c)) + "\n")
+        trace.write("\n")
 
     def _print_tableau_DEBUG(self, text_widget, iteration, is_final=False):
         print(f"{'Final ' if is_final else ''}Tableau - Iteration {iteration}:\n")
@@ -134,126 +199,10 @@ class BigMSolver:
         headers = self.all_variables + ['RHS']
         print("\t".join(headers) + "\n")
 
-        for row in self.tableau:
-            print("\t".join(str(coeff) for coeff in row) + "\n")
+        for row_m, row_c in zip(self.tableau_m, self.tableau_c):
+            print("\t".join(BigMCoefficient.format(m, c) for m, c in zip(row_m, row_c)) + "\n")
         print("\n")
 
-    def parse_problem(self, objective: str, constraints: List[str]):
-        def parse_terms(expression):
-            return re.findall(r'([+-]?\s*\d*\.?\d*)\s*(MX\d+|X\d+|MS\d+|S\d+|MA\d+|A\d+|M)', expression)
-
-        def parse_coef(coef):
-            coef = coef.strip().replace(' ', '')
-            if coef in ('+', '-'):
-                return 1.0 if coef == '+' else -1.0
-            elif coef == '':
-                return 1.0
-            else:
-                return float(coef)
-
-        def eliminate_empty_cols(matrix):
-            transposed = list(map(list, zip(*matrix)))
-            filtered = [row for row in transposed if any(value not in {0, None, '0'} for value in row)]
-            result = list(map(list, zip(*filtered)))
-            return result
-
-        # Parse objective function
-        obj_match = re.match(r'Z\s*=\s*(.*)', objective)
-        if not obj_match:
-            obj_match = re.match(r'Z\s*(.*)\s*=\s*(.*)', objective)
-            if obj_match:
-                objective = f"Z = {obj_match.group(1)}{obj_match.group(2)}"
-            else:
-                raise ValueError("Invalid objective function format")
-
-        obj_terms = parse_terms(objective)
-
-        # Collect all variables from objective and constraints
-        x_terms = []
-        a_terms = []
-        s_terms = []
-
-        for _, var in obj_terms:
-            if var not in ['M', 'MX', 'MS', 'MA']:
-                if var.startswith('X') and var not in x_terms:
-                    x_terms.append(var)
-                elif var.startswith('S') and var not in s_terms:
-                    s_terms.append(var)
-                elif var.startswith('A') and var not in a_terms:
-                    a_terms.append(var)
-        for constraint in constraints:
-            constr_terms = parse_terms(constraint.split('=')[0])
-            for _, var in constr_terms:
-                if var not in ['M', 'MX', 'MS', 'MA']:
-                    if var.startswith('X') and var not in x_terms:
-                        x_terms.append(var)
-                    elif var.startswith('S') and var not in s_terms:
-                        s_terms.append(var)
-                    elif var.startswith('A') and var not in a_terms:
-                        a_terms.append(var)
-
-        self.all_variables = x_terms + s_terms + a_terms
-        num_var = len(self.all_variables)
-        var_to_index = {x: i for i, x in enumerate(self.all_variables)}
-
-        # Parse objective function
-        coefs_objective = ['0.0'] * num_var
-        for coef, var in obj_terms:
-            coef = coef.replace(" ", "")
-            if var == 'M':
-                coefs_objective.append(coef + 'M')
-            elif var.startswith('MX') or var.startswith('MS') or var.startswith('MA'):
-                index = var_to_index.get(var[1:], len(coefs_objective))
-                if index == len(coefs_objective):
-                    coefs_objective.append(coef + var)
-                else:
-                    if '0.0' in coefs_objective[index]:
-                        coefs_objective[index] = coef + var
-                    else:
-                        coefs_objective[index] += coef + var
-            elif var in var_to_index:
-                if '0.0' in coefs_objective[var_to_index[var]]:
-                    coefs_objective[var_to_index[var]] = coef + var
-                else:
-                    coefs_objective[var_to_index[var]] += coef + var
-            else:
-                coefs_objective.append(coef + var)
-
-        coefs_objective = [v if not '0.0' in v else '0' for v in coefs_objective]
-
-        # Parse constraints
-        matrix = []
-        coefs_constr = []  # Add objective function as the first row
-
-        for constraint in constraints:
-            left, right = constraint.split('=')
-            constr_terms = parse_terms(left)
-            constr_coefs = ['0'] * len(coefs_objective)
-            
-            for coef, var in constr_terms:
-                if var in var_to_index:
-                    constr_coefs[var_to_index[var]] = coef.replace(" ", "") + var.replace(" ", "")
-                elif var.startswith('MX') or var.startswith('MS') or var.startswith('MA'):
-                    index = next((i for i, v in enumerate(coefs_objective) if v.endswith(var)), None)
-                    if index is not None:
-                        constr_coefs[index] = coef.replace(" ", "") + var.replace(" ", "")
-                    else:
-                        constr_coefs.append(coef.replace(" ", "") + var.replace(" ", ""))
-                else:
-                    constr_coefs.append(coef.replace(" ", "") + var.replace(" ", ""))
-            
-            constr_coefs[-1] = right.strip().replace(" ", "")
-            coefs_constr.append(constr_coefs)
-            
-        coefs_constr.append(coefs_objective)
-
-        return coefs_constr
-
-# PARSED
-# [4.0, 2.0]
-# [[5.0, 1.0], [4.0, 3.0]]
-# [10.0, 36.0]
-
 # FORMATO CANONICO
 # Z = 3X1 + 5X2  
 # X1 + 0X2 ≤ 4
@@ -0,0 +1,272 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from scipy import sparse
+from Engine.Presolve import Presolve
+from Engine.Scaling import Scaling
+from Engine.Sparse import as_constraint_matrix
+from Engine.Stats import SolveStats
+
+# constraint matrices at least this large travel through shared memory
+SHARED_MIN_BYTES = 1 << 20
+
+_OPERATORS = {"≤": "≤", "<=": "≤", "≥": "≥", ">=": "≥", "=": "="}
+
+
+class Operator(object):
+    """ Operador de restricción con la interfaz .get() de tk.StringVar """
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def normalize_operator(op):
+    # tk.StringVar, Operator or a plain string; ASCII '<=' / '>=' are accepted
+    op = op.get() if hasattr(op, 'get') else op
+    if op not in _OPERATORS:
+        raise ValueError(f"Unknown constraint operator: {op!r}")
+    return _OPERATORS[op]
+
+
+def solve_problem(problem):
+    """ Resuelve un problema descrito como dict y devuelve el dict de resultado del solver
+
+        claves: 'c', 'A', 'b' y opcionalmente 'operators' (por defecto todas '≤'),
+        'is_min' (False), 'method' ('two-phase', 'simplex', 'bigm' o 'auto'), 'engine'
+        ('tableau'), 'pricing' ('dantzig', ver Engine.Pricing), 'lower', 'upper', 'vars_name', 'trace' (sin traza por defecto), 'stats'
+        (un SolveStats; si no se da, el solver crea uno y lo devuelve en 'Stats') y
+        'objective_offset', la constante de la función objetivo que traen los lectores.
+        'presolve' (True) reduce el problema antes del solver (ver Engine.Presolve); el
+        resultado trae entonces el informe de la reducción en 'Presolve'. 'scaling' (True)
+        escala filas y columnas (ver Engine.Scaling) y deja el rango de A en 'Scaling'.
+        En lugar de 'c', 'A' y 'b' puede traer 'path', un archivo .mps o .lp que se lee
+        aquí (en el proceso que resuelve); 'fixed' selecciona MPS de columnas fijas """
+    if 'path' in problem:
+        from Readers.Model import read_model
+        options = {'fixed': True} if problem.get('fixed') else {}
+        model = read_model(problem['path'], **options)
+        model.update((key, value) for key, value in problem.items() if key not in ('path', 'fixed'))
+        problem = model
+    result = _solve_problem(problem)
+    if problem.get('negated_columns') or problem.get('split_columns'):
+        from Readers.Model import restore_columns
+        result = restore_columns(result, problem)
+    offset = problem.get('objective_offset') or 0.0
+    if offset and 'Optimal Objective' in result:
+        result['Optimal Objective'] += offset
+    return result
+
+
+def _solve_problem(problem):
+    c = list(problem['c'])
+    b = list(problem['b'])
+    n, m = len(c), len(b)
+    A = problem['A']
+    operators = [normalize_operator(op) for op in problem.get('operators', ["≤"] * m)]
+    is_min = problem.get('is_min', False)
+    method = problem.get('method', 'two-phase')
+    bounded = problem.get('lower') is not None or problem.get('upper') is not None
+    if method == 'auto':
+        # the plain simplex needs nothing but slacks; everything else goes to the
+        # two-phase solver, which picks its own engine
+        simple = not is_min and not bounded and all(op == "≤" for op in operators) and min(b, default=0) >= 0
+        method = 'simplex' if simple else 'two-phase'
+        problem = dict(problem, method=method, engine=problem.get('engine', 'auto'))
+    if method != 'two-phase' and bounded:
+        raise ValueError(f"Variable bounds are only supported by the two-phase method, not {method!r}")
+    if problem.get('presolve', True):
+        return _presolve_and_solve(problem, method, c, A, b, operators, is_min)
+    if problem.get('scaling', True):
+        return _scale_and_solve(problem, method, c, A, b)
+
+    if method == 'simplex':
+        # Import here so worker processes only load the solver they need
+        from Simplex import SimplexSolver
+        if is_min or any(op != "≤" for op in operators):
+            raise ValueError("The simplex method only handles max problems with ≤ constraints")
+        solver = SimplexSolver(n, m, c, A, b)
+        result = solver.simplex(problem.get('trace'), stats=problem.get('stats'), pricing=problem.get('pricing'))
+        if solver.status != 'optimal':
+            return result
+        return _rename(result, problem)
+    if method == 'bigm':
+        from BigM.Solver import BigMSolver
+        ops = [op.replace('≤', '<=').replace('≥', '>=') for op in operators]
+        solver = BigMSolver(n, m, c, A, ops, b, is_min, problem.get('stats'))
+        solution, objective = solver.solve(problem.get('trace'), pricing=problem.get('pricing'))
+        if solver.status != 'optimal':
+            return {'Type': solver.status, 'Stats': solver.stats}
+        return _rename({
+            'Type': 'optimal',
+            'Optimal Solution': {f"x{i+1}": value for i, value in enumerate(solution)},
+            'Optimal Objective': objective,
+            'Stats': solver.stats
+        }, problem)
+    if method == 'two-phase':
+        from Two_Phase import LP_model_solver
+        vars_name = problem.get('vars_name', [f"x{i+1}" for i in range(n)])
+        solver = LP_model_solver(vars_name, c, A, b, [1] * m, problem.get('trace'),
+                                 [Operator(op) for op in operators], is_min,
+                                 lower=problem.get('lower'), upper=problem.get('upper'),
+                                 stats=problem.get('stats'))
+        return solver.optimize(problem.get('engine', 'tableau'), problem.get('pricing'))
+    raise ValueError(f"Unknown method: {method!r}")
+
+
+def _presolve_and_solve(problem, method, c, A, b, operators, is_min):
+    # only the two-phase method takes bounds (and not on its dual engine), so
+    # singleton rows stay rows for the others
+    names = list(problem.get('vars_name', [f"x{i+1}" for i in range(len(c))]))
+    stats = problem.get('stats') if problem.get('stats') is not None else SolveStats()
+    with stats.timer('presolve'):
+        presolve = Presolve(c, A, b, operators, is_min, problem.get('lower'), problem.get('upper'),
+                            bounds=method == 'two-phase' and problem.get('engine') != 'dual')
+        reduced = presolve.run()
+    if reduced is None:
+        result = presolve.result(names)
+        result['Stats'] = stats
+        return result
+    reduced.setdefault('lower', None)
+    reduced.setdefault('upper', None)
+    reduced['vars_name'] = [name for name, keep in zip(names, presolve.cols) if keep]
+    result = _solve_problem(dict(problem, **reduced, method=method, presolve=False, stats=stats))
+    return presolve.postsolve(result, names)
+
+
+def _scale_and_solve(problem, method, c, A, b):
+    names = list(problem.get('vars_name', [f"x{i+1}" for i in range(len(c))]))
+    stats = problem.get('stats') if problem.get('stats') is not None else SolveStats()
+    scaling = Scaling()
+    with stats.timer('scaling'):
+        c, A, b, lower, upper = scaling.scale(c, A, b, problem.get('lower'), problem.get('upper'))
+    result = _solve_problem(dict(problem, c=c, A=A, b=b, lower=lower, upper=upper, vars_name=names,
+                                 method=method, presolve=False, scaling=False, stats=stats))
+    return scaling.unscale(result, names)
+
+
+def _rename(result, problem):
+    # Simplex and Big M name the variables x1..xn; use the problem's names when given
+    if 'vars_name' in problem:
+        result['Optimal Solution'] = dict(zip(problem['vars_name'], result['Optimal Solution'].values()))
+    return result
+
+
+def _solve_quietly(problem):
+    # one failing problem must not take the whole batch down
+    try:
+        return solve_problem(problem)
+    except Exception as ex:
+        return {'Type': 'error', 'Error': f"{type(ex).__name__}: {ex}"}
+
+
+def _share(array):
+    # copy one array into a new shared memory block; returns (block, descriptor)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(descriptor, blocks):
+    name, shape, dtype = descriptor
+    try:
+        block = shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        # Older versions register attached blocks with the resource tracker. Pool
+        # workers (fork, spawn or forkserver) share the parent's tracker, where the
+        # block is already registered, and must leave it alone; only a process
+        # with a tracker of its own would unlink the block on exit.
+        own_tracker = resource_tracker._resource_tracker._fd is None
+        block = shared_memory.SharedMemory(name=name)
+        if own_tracker:
+            resource_tracker.unregister(block._name, 'shared_memory')
+    blocks.append(block)
+    return np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+
+def _pack(problem):
+    # replace a large A by shared memory descriptors; returns (problem, blocks)
+    if 'A' not in problem:
+        return problem, []  # the worker reads the model file itself
+    c, b = problem['c'], problem['b']
+    A = as_constraint_matrix(problem['A'], (len(b), len(c)))
+    nbytes = A.data.nbytes + A.indices.nbytes + A.indptr.nbytes if sparse.issparse(A) else A.nbytes
+    if nbytes < SHARED_MIN_BYTES:
+        return problem, []
+    problem = dict(problem)
+    if sparse.issparse(A):
+        shared = [_share(A.data), _share(A.indices), _share(A.indptr)]
+        problem['A'] = ('csc', A.shape, [d for _, d in shared])
+    else:
+        shared = [_share(A)]
+        problem['A'] = ('dense', A.shape, [shared[0][1]])
+    return problem, [block for block, _ in shared]
+
+
+def _solve_packed(problem):
+    blocks = []
+    try:
+        if isinstance(problem.get('A'), tuple):
+            kind, shape, descriptors = problem['A']
+            arrays = [_attach(d, blocks) for d in descriptors]
+            problem = dict(problem)
+            # the solvers copy A while building the standard form, so the
+            # views below are not used after the solver is constructed
+            problem['A'] = sparse.csc_matrix(tuple(arrays), shape=shape) if kind == 'csc' else arrays[0]
+        return _solve_quietly(problem)
+    finally:
+        problem = None
+        for block in blocks:
+            block.close()
+
+
+def _release(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def solve_many(problems, workers=None, max_pending=None):
+    """ Resuelve muchos problemas independientes en un pool de procesos
+
+        problems es un iterable de dicts (ver solve_problem). Los resultados se
+        entregan en el orden en que terminan, como pares (índice, resultado).
+        Con workers=1 todo se resuelve en el proceso actual. """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, problem in enumerate(problems):
+            yield index, _solve_quietly(problem)
+        return
+
+    # bounded number of submitted problems so an endless iterable never piles up
+    max_pending = max_pending or 2 * workers
+    pending = {}
+    problems = enumerate(problems)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_pending:
+                    item = next(problems, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, problem = item
+                    packed, blocks = _pack(problem)
+                    pending[pool.submit(_solve_packed, packed)] = (index, blocks)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, blocks = pending.pop(future)
+                    _release(blocks)
+                    yield index, future.result()
+        finally:
+            for future, (_, blocks) in pending.items():
+                future.cancel()
+            wait(pending)
+            for _, blocks in pending.values():
+                _release(blocks)
@@ -0,0 +1,34 @@
+import numpy as np
+from Engine.Pivot import pivot
+
+
+def dual_simplex(tableau, basis, tol=1e-9, callback=None, history=None):
+    """ Simplex dual sobre una tabla dual factible; devuelve 'optimal' o 'infeasible' """
+    # Same layout as LP_model_solver: constraint rows, then the objective row with
+    # z_j - c_j (dual feasible when every entry is <= 0) and the RHS in the last column.
+    iteration = 0
+    while True:
+        rhs = tableau[:-1, -1]
+        leave_row = int(np.argmin(rhs))
+        if rhs[leave_row] >= -tol:
+            return 'optimal'
+
+        row = tableau[leave_row, :-1]
+        candidates = np.flatnonzero(row < -tol)
+        if candidates.size == 0:
+            # the row reads (non-negative combination) = negative value
+            return 'infeasible'
+        ratios = tableau[-1, candidates] / row[candidates]
+        ties = candidates[ratios <= ratios.min() + tol]
+        # among tied columns keep the largest pivot for numerical stability
+        enter = int(ties[np.argmax(np.abs(row[ties]))])
+
+        leave = basis[leave_row]
+        element = tableau[leave_row, enter]
+        pivot(tableau, leave_row, enter)
+        basis[leave_row] = enter
+        if history is not None:
+            history.pivot(leave_row, enter, element)
+        if callback is not None:
+            callback(iteration, enter, leave, leave_row)
+        iteration += 1
@@ -0,0 +1,130 @@
+import numpy as np
+from Engine.Pivot import pivot, pivot_big_m
+
+# kinds of recorded operation
+PIVOT = 0
+FLIP = 1
+
+
+class TableauHistory(object):
+    """ Historial compacto de las tablas de un solver: tabla inicial, secuencia de pivotes
+        e instantáneas periódicas; cualquier iteración se reconstruye bajo demanda
+
+        Every call to start() opens a segment (phase 1, phase 2, ...) whose first
+        state is the tableau given. Each pivot or bound flip recorded afterwards adds
+        one state. States are numbered globally from 0 to len(history) - 1. A Big M
+        tableau is given as its two planes (M part, constant part) and is rebuilt as
+        an array of shape (2, rows, cols). """
+
+    def __init__(self, snapshot_every=50):
+        self.snapshot_every = snapshot_every
+        self._segments = []     # (first state, label, initial tableau, initial basis)
+        self._ops = []          # (kind, row, col, value); value is the pivot element or the bound
+        self._snapshots = {}    # state -> (tableau, basis)
+        self._live = None
+        self._basis = None
+
+    def __len__(self):
+        return len(self._segments) + len(self._ops)
+
+    def start(self, tableau, basis=None, label=''):
+        # the solver keeps updating `tableau` in place; the history only reads it
+        # when it takes a snapshot
+        self._live = tableau
+        self._basis = None if basis is None else list(basis)
+        self._segments.append((len(self), label, self._copy_live(), self._copy_basis()))
+
+    def pivot(self, row, col, element):
+        """ Registra un pivote ya aplicado en (row, col); element es el pivote antes de dividir """
+        if self._basis is not None:
+            self._basis[row] = col
+        self._record(PIVOT, row, col, element)
+
+    def flip(self, col, upper):
+        """ Registra el complemento x = upper - x' de la columna col """
+        self._record(FLIP, -1, col, upper)
+
+    def _record(self, kind, row, col, value):
+        self._ops.append((kind, int(row), int(col), float(value)))
+        state = len(self) - 1
+        if (state - self._segments[-1][0]) % self.snapshot_every == 0:
+            self._snapshots[state] = (self._copy_live(), self._copy_basis())
+
+    def _copy_live(self):
+        if isinstance(self._live, (tuple, list)):
+            return np.stack(self._live)
+        return np.array(self._live, dtype=np.float64)
+
+    def _copy_basis(self):
+        return None if self._basis is None else np.array(self._basis)
+
+    def _segment(self, k):
+        # index of the segment that contains state k
+        starts = [segment[0] for segment in self._segments]
+        return int(np.searchsorted(starts, k, side='right')) - 1
+
+    def label(self, k):
+        return self._segments[self._segment(k)][1]
+
+    def rebuild(self, k):
+        """ Devuelve (tabla, base) del estado k, partiendo de la instantánea más cercana """
+        if not 0 <= k < len(self):
+            raise IndexError(f"History has no state {k}")
+        segment = self._segment(k)
+        first, _, tableau, basis = self._segments[segment]
+        start = first
+        taken = [s for s in self._snapshots if first < s <= k]
+        if taken:
+            start = max(taken)
+            tableau, basis = self._snapshots[start]
+        tableau = tableau.copy()
+        basis = None if basis is None else basis.tolist()
+        # state s (after the first one of its segment) is produced by op s - segment - 1
+        for kind, row, col, value in self._ops[start - segment:k - segment]:
+            if kind == FLIP:
+                tableau[..., :, -1] -= value * tableau[..., :, col]
+                tableau[..., :, col] *= -1.0
+            elif tableau.ndim == 3:
+                pivot_big_m(tableau[0], tableau[1], row, col)
+            else:
+                pivot(tableau, row, col)
+            if kind == PIVOT and basis is not None:
+                basis[row] = col
+        return tableau, basis
+
+    def tableau(self, k):
+        return self.rebuild(k)[0]
+
+    def save(self, path):
+        """ Guarda el historial completo en un único archivo .npz """
+        arrays = {
+            'snapshot_every': np.array(self.snapshot_every),
+            'segment_start': np.array([s[0] for s in self._segments], dtype=np.int64),
+            'segment_label': np.array([s[1] for s in self._segments], dtype=str),
+            'ops': np.array([op[:3] for op in self._ops], dtype=np.int64).reshape(-1, 3),
+            'op_value': np.array([op[3] for op in self._ops], dtype=np.float64),
+            'snapshot_state': np.array(sorted(self._snapshots), dtype=np.int64),
+        }
+        for i, (_, _, tableau, basis) in enumerate(self._segments):
+            arrays[f'initial_{i}'] = tableau
+            if basis is not None:
+                arrays[f'basis_{i}'] = basis
+        for state, (tableau, basis) in self._snapshots.items():
+            arrays[f'snapshot_{state}'] = tableau
+            if basis is not None:
+                arrays[f'snapshot_basis_{state}'] = basis
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            history = cls(int(data['snapshot_every']))
+            for i, (first, label) in enumerate(zip(data['segment_start'], data['segment_label'])):
+                basis = data[f'basis_{i}'] if f'basis_{i}' in data else None
+                history._segments.append((int(first), str(label), data[f'initial_{i}'], basis))
+            history._ops = [(int(kind), int(row), int(col), float(value))
+                            for (kind, row, col), value in zip(data['ops'], data['op_value'])]
+            for state in data['snapshot_state']:
+                basis = data[f'snapshot_basis_{state}'] if f'snapshot_basis_{state}' in data else None
+                history._snapshots[int(state)] = (data[f'snapshot_{state}'], basis)
+        return history
@@ -0,0 +1,141 @@
+import numpy as np
+from Engine.Batch import normalize_operator
+from Engine.Pivot import pivot_batch
+from Engine.Pricing import as_pricing
+from Engine.RatioTest import ratio_test_batch
+from Two_Phase import crash_basis, logical_columns
+
+
+def _primal(T, basis, eligible, running, pricing, tol, max_degenerate):
+    """ Itera el simplex primal en todas las tablas activas a la vez
+
+        Same convention as LP_model_solver: the last row holds z_j - c_j and a
+        column enters while its entry is > tol, chosen by pricing.select_batch.
+        The leaving row comes from Engine.RatioTest.ratio_test_batch, with the
+        columns of the starting basis as lexicographic keys; as in
+        Engine.Revised, Bland's rule takes over after too many degenerate pivots
+        in a row. Returns the final status of every problem ('optimal',
+        'unbounded' or None when it was not running) and the recession direction
+        (basis, x_B, y_k, enter) of the unbounded ones. """
+    batch, rows = T.shape[0], T.shape[1] - 1
+    status = np.full(batch, None, dtype=object)
+    degenerate = np.zeros(batch, dtype=int)
+    start = basis.copy()  # their columns hold B^-1 B0, nonsingular: keys for the lexicographic rule
+    bland_rule = as_pricing('bland')
+    directions = {}
+    index = np.flatnonzero(running)
+    while index.size > 0:
+        costs = T[index, -1, :-1]
+        candidates = eligible & (costs > tol)
+        optimal = ~candidates.any(axis=1)
+        status[index[optimal]] = 'optimal'
+        index, costs, candidates = index[~optimal], costs[~optimal], candidates[~optimal]
+        if index.size == 0:
+            break
+
+        bland = pricing.bland | (degenerate[index] >= max_degenerate)
+        columns = T[index, :rows, :-1] if pricing.needs_tableau else None
+        enter = np.where(bland, bland_rule.select_batch(costs, candidates),
+                         pricing.select_batch(costs, candidates, columns))
+        column = T[index, :rows, enter]
+        rhs = T[index, :rows, -1]
+        lexico = T[index[:, None, None], np.arange(rows)[None, :, None], start[index][:, None, :]]
+        leave, step = ratio_test_batch(column, rhs, tol, lexico=lexico, basis=basis[index], bland=bland)
+
+        unbounded = leave < 0
+        for b, k in zip(index[unbounded], np.flatnonzero(unbounded)):
+            status[b] = 'unbounded'
+            directions[b] = (basis[b].copy(), rhs[k].copy(), column[k].copy(), int(enter[k]))
+        keep = ~unbounded
+        index, enter, leave, step = index[keep], enter[keep], leave[keep], step[keep]
+        if index.size == 0:
+            break
+
+        pivot_batch(T, index, leave, enter)
+        basis[index, leave] = enter
+        degenerate[index] = np.where(step <= tol, degenerate[index] + 1, 0)
+    return status, directions
+
+
+def solve_lockstep(vars_name, C, A, RHS, operators, is_min, tol=1e-6, max_degenerate=50, pricing=None):
+    """ Resuelve con el método de dos fases una pila de problemas con las mismas dimensiones
+
+        C es (batch, n), A es (batch, m, n) y RHS es (batch, m); todos los problemas
+        comparten vars_name, operators e is_min. pricing: 'dantzig' (por defecto),
+        'bland' o 'steepest' (las reglas sin estado, ver Engine.Pricing). Devuelve una
+        lista de resultados con el mismo formato que LP_model_solver.optimize(). """
+    C = np.asarray(C, dtype=np.float64)
+    A = np.asarray(A, dtype=np.float64)
+    RHS = np.asarray(RHS, dtype=np.float64)
+    pricing = as_pricing(pricing)
+    if not pricing.batched:
+        raise ValueError(f"The {pricing.name!r} pricing rule has no batched form")
+    batch, m, n = A.shape
+    operators = [normalize_operator(op) for op in operators]
+    # the standard form and crash basis of LP_model_solver, shared by the whole stack
+    coefficient, logical = logical_columns(operators, n)
+    logical_rows = np.flatnonzero(coefficient)
+    k = n + logical_rows.size  # legitimate columns: decision variables, then logicals
+    sign, start = crash_basis(operators, RHS, logical)
+
+    ## phase 1: every row has an artificial column, so the stack keeps one width;
+    ## only the rows the crash basis leaves uncovered start with theirs basic
+    T = np.zeros((batch, m + 1, k + m + 1))
+    T[:, :m, :n] = A * sign[:, :, None]
+    T[:, logical_rows, logical[logical_rows]] = coefficient[logical_rows] * sign[:, logical_rows]
+    T[:, np.arange(m), k + np.arange(m)] = 1.0
+    T[:, :m, -1] = RHS * sign
+    need = start < 0
+    basis = np.where(need, k + np.arange(m), start)
+    T[:, -1, :k] = np.einsum('bi,bij->bj', need.astype(np.float64), T[:, :m, :k])
+    T[:, -1, -1] = np.where(need, T[:, :m, -1], 0.0).sum(axis=1)
+
+    legitimate = np.arange(k + m) < k
+    _primal(T, basis, legitimate, need.any(axis=1), pricing, tol, max_degenerate)
+    infeasible = T[:, -1, -1] > tol
+
+    # artificials still basic at zero level are pivoted out where possible; the
+    # rest sit on redundant rows, which keep zeros in every legitimate column
+    for row in range(m):
+        nonzero = np.abs(T[:, row, :k]) > tol
+        index = np.flatnonzero((basis[:, row] >= k) & ~infeasible & nonzero.any(axis=1))
+        if index.size > 0:
+            enter = np.argmax(nonzero[index], axis=1)
+            pivot_batch(T, index, np.full(index.size, row), enter)
+            basis[index, row] = enter
+
+    ## phase 2: price with the original costs; the artificial columns stay in the
+    ## tableau (they never enter again) so the lexicographic keys remain available
+    costs = np.zeros((batch, k + m))
+    costs[:, :n] = C if is_min else -C  # siempre minimizamos internamente
+    basic_costs = np.take_along_axis(costs, basis, axis=1)
+    T[:, -1, :] = np.einsum('bi,bij->bj', basic_costs, T[:, :m, :])
+    T[:, -1, :-1] -= costs
+
+    status, directions = _primal(T, basis, legitimate, ~infeasible, pricing, tol, max_degenerate)
+
+    results = []
+    for b in range(batch):
+        if infeasible[b]:
+            results.append({'Type': 'infeasible'})
+        elif status[b] == 'unbounded':
+            # rc[var_idx] = (a, b) with value a + b * z, z >= 0
+            problem_basis, x_B, y_k, enter = directions[b]
+            cone = {j: (0.0, 0.0) for j in range(k)}
+            cone[enter] = (0.0, 1.0)
+            for i, j in enumerate(problem_basis):
+                if j < k:
+                    cone[int(j)] = (x_B[i], -y_k[i])
+            results.append({'Type': 'unbounded', 'Recession Cone': cone})
+        else:
+            values = np.zeros(n)
+            for i, j in enumerate(basis[b]):
+                if j < n:
+                    values[j] = T[b, i, -1]
+            objective = T[b, -1, -1] if is_min else -T[b, -1, -1]
+            results.append({
+                'Type': 'optimal',
+                'Optimal Solution': dict(zip(vars_name, values)),
+                'Optimal Objective': objective
+            })
+    return results
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def pivot(tableau, row, col):
+    """ Pivotea la tabla en (row, col) con una actualización de rango 1 in-place """
+    pivot_row = tableau[row]
+    pivot_row /= pivot_row[col]
+
+    # the pivot column gives the multiplier of every row; rows that already
+    # have a zero there are left untouched
+    factors = tableau[:, col].copy()
+    factors[row] = 0.0
+    rows = np.flatnonzero(factors)
+    if rows.size == tableau.shape[0] - 1:
+        # dense column: update the whole tableau in place (pivot row factor is 0)
+        tableau -= np.multiply.outer(factors, pivot_row)
+    elif rows.size > 0:
+        tableau[rows] -= np.multiply.outer(factors[rows], pivot_row)
+    return tableau
+
+
+def pivot_big_m(tableau_m, tableau_c, row, col):
+    """ Pivotea una tabla de Gran M guardada como dos planos (parte M, parte constante) """
+    # the pivot is always taken on a constraint row, and constraint rows carry
+    # no M part, so the pivot element and the pivot row are plain numbers
+    element = tableau_c[row, col]
+    tableau_m[row] /= element
+    tableau_c[row] /= element
+
+    factors_m = tableau_m[:, col].copy()
+    factors_c = tableau_c[:, col].copy()
+    factors_m[row] = 0.0
+    factors_c[row] = 0.0
+    rows = np.flatnonzero((factors_m != 0) | (factors_c != 0))
+    if rows.size > 0:
+        pivot_m = tableau_m[row]
+        pivot_c = tableau_c[row]
+        # (fm*M + fc) * (pm*M + pc) with pm == 0 -> M part fm*pc + fc*pm, constant fc*pc
+        tableau_m[rows] -= np.multiply.outer(factors_m[rows], pivot_c) + \
+                           np.multiply.outer(factors_c[rows], pivot_m)
+        tableau_c[rows] -= np.multiply.outer(factors_c[rows], pivot_c)
+    return tableau_m, tableau_c
+
+
+def pivot_batch(tableaus, problems, rows, cols):
+    """ Pivotea a la vez varias tablas de una pila 3-D (batch, filas, columnas) """
+    # problems selects the tableaus to update; rows/cols give their pivot positions
+    stack = tableaus[problems]
+    index = np.arange(problems.size)
+    pivot_rows = stack[index, rows] / stack[index, rows, cols][:, None]
+    factors = stack[index, :, cols]
+    stack -= factors[:, :, None] * pivot_rows[:, None, :]
+    stack[index, rows] = pivot_rows
+    tableaus[problems] = stack
+    return tableaus
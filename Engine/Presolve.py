@@ -0,0 +1,257 @@
+import numpy as np
+from scipy import sparse
+from Engine.Sparse import as_constraint_matrix
+
+_FLIP = {"≤": "≥", "≥": "≤", "=": "="}
+
+
+class Presolve(object):
+    """ Reducciones previas al solver (presolve) y el camino de vuelta a las variables originales (postsolve)
+
+        The reductions are repeated until none applies:
+        - empty rows are checked for feasibility and dropped
+        - singleton equality rows fix their variable; singleton inequality rows
+          become bounds when the solver takes them (bounds=True), else they stay
+        - fixed variables (lower == upper) are substituted into the rhs
+        - empty columns go to the bound their cost prefers
+        - dominated columns, which can only hurt every row and cost something,
+          are fixed at their lower bound
+        - parallel rows are merged into one row (two if both sides are finite)
+        A column whose cost pushes it to an infinite bound is never removed; the
+        solver finds the unbounded ray. When the reductions decide the problem by
+        themselves, `status` is set and no solver needs to run.
+
+        c, A, b, operators ('≤', '≥', '='), is_min, lower and upper follow the
+        solve_problem conventions. `report` tells how much the problem shrank. """
+
+    def __init__(self, c, A, b, operators, is_min, lower=None, upper=None, bounds=True, tol=1e-9):
+        self.c = np.asarray(c, dtype=np.float64)
+        self.b = np.asarray(b, dtype=np.float64)
+        m, n = self.b.size, self.c.size
+        A = as_constraint_matrix(A, (m, n))
+        self.dense = not sparse.issparse(A)  # the reduced A keeps the caller's format
+        self.A = sparse.csr_matrix(A)
+        self.A.eliminate_zeros()
+        self.operators = list(operators)
+        self.is_min = is_min
+        self.cost = self.c if is_min else -self.c  # minimization sense
+        self.lower = np.zeros(n) if lower is None else np.array(lower, dtype=np.float64)
+        self.upper = np.full(n, np.inf) if upper is None else np.array(upper, dtype=np.float64)
+        self.bounds = bounds
+        self.tol = tol
+        self.rows = np.ones(m, dtype=bool)
+        self.cols = np.ones(n, dtype=bool)
+        self.values = np.zeros(n)  # value of every removed column
+        self.status = None
+        self.report = {'rows': m, 'columns': n, 'nonzeros': self.A.nnz, 'empty_rows': 0, 'singleton_rows': 0,
+                       'fixed_columns': 0, 'empty_columns': 0, 'dominated_columns': 0, 'duplicate_rows': 0}
+
+    def _rhs(self):
+        # right-hand side with every removed column moved over
+        return self.b - self.A.dot(self.values)
+
+    def _fix(self, j, value, reason):
+        self.cols[j] = False
+        self.values[j] = value
+        self.report[reason] += 1
+
+    def _infeasible(self):
+        self.status = 'infeasible'
+        return True
+
+    def run(self):
+        """ Aplica las reducciones; devuelve el problema reducido (dict) o None si quedó resuelto """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            while self.status is None and (self._simple_pass() or self._duplicate_rows()):
+                pass
+        if self.status is None and not self.rows.any():
+            # every row is gone and the columns left are rays toward an infinite bound
+            self.status = 'unbounded' if self.cols.any() else 'optimal'
+        if self.status is not None:
+            return None
+        return self.reduced()
+
+    def _simple_pass(self):
+        changed = False
+        structure = abs(self.A).sign()
+        row_count = structure.dot(self.cols.astype(np.float64))
+        b = self._rhs()
+
+        # empty rows: 0 op b
+        for i in np.flatnonzero(self.rows & (row_count == 0)):
+            op = self.operators[i]
+            if (op == "≤" and b[i] < -self.tol) or (op == "≥" and b[i] > self.tol) or \
+                    (op == "=" and abs(b[i]) > self.tol):
+                return self._infeasible()
+            self.rows[i] = False
+            self.report['empty_rows'] += 1
+            changed = True
+
+        # singleton rows: a x_j op b
+        for i in np.flatnonzero(self.rows & (row_count == 1)):
+            start, end = self.A.indptr[i], self.A.indptr[i + 1]
+            alive = self.cols[self.A.indices[start:end]]
+            if not alive.any():
+                continue  # its column was fixed by an earlier row: empty in the next pass
+            j, a = self.A.indices[start:end][alive][0], self.A.data[start:end][alive][0]
+            op = self.operators[i] if a > 0 else _FLIP[self.operators[i]]
+            value = b[i] / a
+            if op == "=":
+                if value < self.lower[j] - self.tol or value > self.upper[j] + self.tol:
+                    return self._infeasible()
+                self._fix(j, min(max(value, self.lower[j]), self.upper[j]), 'fixed_columns')
+            elif not self.bounds:
+                continue
+            elif op == "≤":
+                self.upper[j] = min(self.upper[j], value)
+            else:
+                self.lower[j] = max(self.lower[j], value)
+            if self.lower[j] > self.upper[j] + self.tol:
+                return self._infeasible()
+            self.rows[i] = False
+            self.report['singleton_rows'] += 1
+            b = self._rhs()
+            changed = True
+
+        # fixed columns
+        for j in np.flatnonzero(self.cols & (self.upper - self.lower <= self.tol)):
+            self._fix(j, self.lower[j], 'fixed_columns')
+            changed = True
+
+        col_count = structure.T.dot(self.rows.astype(np.float64))
+        changed |= self._empty_columns(col_count)
+
+        # dominated columns: raising x_j only tightens every row and costs more
+        operators = np.array(self.operators)
+        is_le = ((operators == "≤") & self.rows).astype(np.float64)
+        is_ge = ((operators == "≥") & self.rows).astype(np.float64)
+        is_eq = ((operators == "=") & self.rows).astype(np.float64)
+        A = self.A
+        helps = (A < 0).T.dot(is_le) + (A > 0).T.dot(is_ge) + structure.T.dot(is_eq)
+        dominated = self.cols & (col_count > 0) & (helps == 0) & (self.cost >= 0) & np.isfinite(self.lower)
+        for j in np.flatnonzero(dominated):
+            self._fix(j, self.lower[j], 'dominated_columns')
+            changed = True
+        return changed
+
+    def _empty_columns(self, col_count):
+        changed = False
+        for j in np.flatnonzero(self.cols & (col_count == 0)):
+            if self.cost[j] >= 0:
+                self._fix(j, self.lower[j], 'empty_columns')
+            elif np.isfinite(self.upper[j]):
+                self._fix(j, self.upper[j], 'empty_columns')
+            else:
+                continue  # unbounded ray: left for the solver to report
+            changed = True
+        return changed
+
+    def _duplicate_rows(self):
+        # rows equal up to a nonzero factor: scale each one by its first entry and group them
+        A = self.A[:, self.cols].tocsr()
+        A.sort_indices()
+        groups = {}
+        for i in np.flatnonzero(self.rows):
+            start, end = A.indptr[i], A.indptr[i + 1]
+            if end - start < 2:
+                continue
+            factor = A.data[start]
+            key = (A.indices[start:end].tobytes(), np.round(A.data[start:end] / factor, 12).tobytes())
+            groups.setdefault(key, []).append((i, factor))
+        b = self._rhs()
+        changed = False
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            # interval lo <= r x <= hi of the scaled row r
+            lo, hi = -np.inf, np.inf
+            for i, factor in group:
+                op = self.operators[i] if factor > 0 else _FLIP[self.operators[i]]
+                if op != "≥":
+                    hi = min(hi, b[i] / factor)
+                if op != "≤":
+                    lo = max(lo, b[i] / factor)
+            # every row bounds one side at least, so tight is finite
+            tight = self.tol * (1.0 + min(abs(lo), abs(hi)))
+            if lo > hi + tight:
+                return self._infeasible()
+            for i, _ in group:
+                self.rows[i] = False
+            # keep rows written as '≤' where possible, which leaves the slack basis intact
+            first, factor = group[0]
+            if hi - lo <= tight:
+                self._keep(first, "=", factor * hi)
+            else:
+                rest = list(group)
+                if np.isfinite(hi):
+                    i, factor = next((g for g in rest if g[1] > 0), rest[0])
+                    rest.remove((i, factor))
+                    self._keep(i, "≤" if factor > 0 else "≥", factor * hi)
+                if np.isfinite(lo):
+                    i, factor = next((g for g in rest if g[1] < 0), rest[0])
+                    self._keep(i, "≤" if factor < 0 else "≥", factor * lo)
+            removed = len(group) - int(self.rows[[i for i, _ in group]].sum())
+            self.report['duplicate_rows'] += removed
+            changed |= removed > 0  # a range kept as two rows is no progress
+        return changed
+
+    def _keep(self, i, op, rhs):
+        # rhs is in terms of the reduced problem; b keeps the removed columns' share
+        self.rows[i] = True
+        self.operators[i] = op
+        self.b[i] = rhs + self.A[i].dot(self.values)[0]
+
+    def reduced(self):
+        """ Problema reducido en el formato de solve_problem (sin 'method', 'trace', etc.) """
+        A = self.A[self.rows][:, self.cols]
+        problem = {
+            'c': self.c[self.cols],
+            'A': A.toarray() if self.dense else A.tocsc(),
+            'b': self._rhs()[self.rows],
+            'operators': [op for op, keep in zip(self.operators, self.rows) if keep],
+            'is_min': self.is_min,
+        }
+        lower, upper = self.lower[self.cols], self.upper[self.cols]
+        if lower.any() or np.isfinite(upper).any():
+            problem['lower'], problem['upper'] = lower, upper
+        self.report.update(reduced_rows=int(self.rows.sum()), reduced_columns=int(self.cols.sum()),
+                           reduced_nonzeros=A.nnz)
+        return problem
+
+    @property
+    def offset(self):
+        # objective value of the removed columns, in the original sense
+        return float(np.dot(self.c, self.values))
+
+    def postsolve(self, result, names):
+        """ Lleva el resultado del problema reducido a las variables originales
+
+            names: the names of all the original columns; the reduced problem must
+            have been solved with the names of the kept columns. Optimal solutions
+            are completed with the removed columns and the objective gets their
+            share; a recession cone keeps the decision variables only, with the
+            removed ones fixed. The reduction report goes under 'Presolve'. """
+        result = dict(result)
+        kept = np.flatnonzero(self.cols)
+        if 'Optimal Solution' in result:
+            solution = result['Optimal Solution']
+            result['Optimal Solution'] = {
+                name: float(solution[name]) if self.cols[j] else float(self.values[j])
+                for j, name in enumerate(names)}
+            result['Optimal Objective'] = result['Optimal Objective'] + self.offset
+        if 'Recession Cone' in result:
+            cone = result['Recession Cone']
+            full = {j: (float(self.values[j]), 0.0) for j in range(self.c.size)}
+            full.update((kept[k], ray) for k, ray in cone.items() if k < kept.size)
+            result['Recession Cone'] = full
+        result['Presolve'] = dict(self.report)
+        return result
+
+    def result(self, names):
+        """ Resultado cuando el presolve decidió el problema sin el solver """
+        result = {'Type': self.status}
+        if self.status == 'optimal':
+            result['Optimal Solution'] = {name: float(value) for name, value in zip(names, self.values)}
+            result['Optimal Objective'] = self.offset
+        result['Presolve'] = dict(self.report)
+        return result
@@ -0,0 +1,163 @@
+import numpy as np
+
+
+class Pricing(object):
+    """ Regla de selección de la variable entrante, compartida por los solvers
+
+        Solvers call select(score, candidates, columns) once per iteration:
+        score holds, for every column, how much the objective improves per unit of
+        the variable (> 0 improves), candidates the eligible column indices in the
+        solver's preferred order, and columns the constraint rows of the tableau
+        (needed by the rules with needs_tableau). After each pivot they call
+        update(pivot_row, enter, leave) with the pivot row already divided by the
+        pivot element. Rules with state (Devex, partial pricing) keep it across
+        calls, so use a fresh rule for every solve. The stateless rules also
+        have select_batch() for a stack of same-shape problems (Engine.Lockstep). """
+
+    name = None
+    bland = False           # the leaving row must follow Bland's rule too
+    needs_tableau = False   # select() needs `columns` / update() the pivot row
+    batched = False         # has select_batch()
+
+    def select(self, score, candidates, columns=None, tiebreak=None):
+        raise NotImplementedError
+
+    def select_batch(self, score, candidates, columns=None):
+        """ select() para una pila: score y candidates (máscara) son (batch, cols), columns
+            (batch, filas, cols); devuelve la columna entrante de cada problema, que debe
+            tener al menos una candidata """
+        raise NotImplementedError
+
+    def update(self, pivot_row, enter, leave):
+        pass
+
+
+class Dantzig(Pricing):
+    """ Mayor costo reducido; ante empates gana la primera candidata (o la mejor según tiebreak) """
+
+    name = 'dantzig'
+    batched = True
+
+    def __init__(self, tol=1e-10):
+        self.tol = tol
+
+    def select(self, score, candidates, columns=None, tiebreak=None):
+        if candidates.size == 0:
+            return None
+        values = score[candidates]
+        if tiebreak is None:
+            return int(candidates[np.argmax(values)])
+        ties = candidates[values >= values.max() - self.tol]
+        return int(ties[np.argmax(tiebreak[ties])])
+
+    def select_batch(self, score, candidates, columns=None):
+        return np.argmax(np.where(candidates, score, -np.inf), axis=1)
+
+
+class Bland(Pricing):
+    """ Regla de Bland: la candidata de menor índice; con la salida también por Bland no cicla """
+
+    name = 'bland'
+    bland = True
+    batched = True
+
+    def select(self, score, candidates, columns=None, tiebreak=None):
+        if candidates.size == 0:
+            return None
+        return int(candidates.min())
+
+    def select_batch(self, score, candidates, columns=None):
+        return np.argmax(candidates, axis=1)
+
+
+class SteepestEdge(Pricing):
+    """ Steepest edge exacto: costo reducido al cuadrado sobre 1 + ||B^-1 a_j||^2
+
+        The tableau already holds B^-1 a_j, so the norms are computed for the
+        candidate columns only, without any reference framework. """
+
+    name = 'steepest'
+    needs_tableau = True
+    batched = True
+
+    def select(self, score, candidates, columns=None, tiebreak=None):
+        if candidates.size == 0:
+            return None
+        block = columns[:, candidates]
+        norms = 1.0 + np.einsum('ij,ij->j', block, block)
+        return int(candidates[np.argmax(score[candidates] ** 2 / norms)])
+
+    def select_batch(self, score, candidates, columns=None):
+        norms = 1.0 + np.einsum('bij,bij->bj', columns, columns)
+        return np.argmax(np.where(candidates, score ** 2 / norms, -np.inf), axis=1)
+
+
+class Devex(Pricing):
+    """ Devex (Forrest-Goldfarb): pesos de referencia que aproximan steepest edge
+
+        The weights start at 1 and are updated from the pivot row only, which is
+        cheaper than the exact norms on tall tableaus. They restart whenever the
+        number of columns changes (e.g. from phase 1 to phase 2). """
+
+    name = 'devex'
+    needs_tableau = True
+
+    def __init__(self):
+        self.weights = None
+
+    def _weights(self, size):
+        if self.weights is None or self.weights.size != size:
+            self.weights = np.ones(size)
+        return self.weights
+
+    def select(self, score, candidates, columns=None, tiebreak=None):
+        if candidates.size == 0:
+            return None
+        weights = self._weights(score.size)[candidates]
+        return int(candidates[np.argmax(score[candidates] ** 2 / weights)])
+
+    def update(self, pivot_row, enter, leave):
+        weights = self._weights(pivot_row.size)
+        ratios = pivot_row ** 2 * weights[enter]
+        np.maximum(weights, ratios, out=weights)
+        weights[leave] = max(ratios[leave], 1.0)
+        weights[enter] = 1.0
+
+
+class PartialPricing(Pricing):
+    """ Pricing parcial para modelos muy anchos: Dantzig dentro del primer segmento con candidatas
+
+        The columns are split into `segments` blocks. Each iteration looks at the
+        block where the last entering variable was found first and moves on to
+        the next blocks only when it has no improving column. """
+
+    name = 'partial'
+
+    def __init__(self, segments=8):
+        self.segments = segments
+        self.offset = 0
+
+    def select(self, score, candidates, columns=None, tiebreak=None):
+        if candidates.size == 0:
+            return None
+        size = -(-score.size // self.segments)
+        # position of each candidate's block, counted from the current block
+        window = (candidates // size - self.offset) % self.segments
+        first = window.min()
+        chosen = candidates[window == first]
+        self.offset = (self.offset + first) % self.segments
+        return int(chosen[np.argmax(score[chosen])])
+
+
+PRICING = {rule.name: rule for rule in (Dantzig, Bland, SteepestEdge, Devex, PartialPricing)}
+
+
+def as_pricing(rule):
+    """ Acepta un nombre ('dantzig', 'bland', 'steepest', 'devex', 'partial'), una instancia o None """
+    if rule is None:
+        return Dantzig()
+    if isinstance(rule, Pricing):
+        return rule
+    if rule not in PRICING:
+        raise ValueError(f"Unknown pricing rule: {rule!r}")
+    return PRICING[rule]()
@@ -0,0 +1,77 @@
+import numpy as np
+
+PIVOT_TOL = 1e-9        # entries at or below this never limit the step
+FEASIBILITY_TOL = 1e-9  # how far a basic variable may go below zero (Harris)
+
+
+def ratio_test(column, rhs, tol=PIVOT_TOL, harris=FEASIBILITY_TOL, lexico=None, basis=None, bland=False):
+    """ Test del cociente de Harris en dos pasadas; devuelve (fila, paso) o (None, inf) si no hay fila que limite
+
+        column: entering column of the constraint rows; rhs: current basic values.
+        Pass 1 finds the largest step that keeps every basic variable above
+        -harris; pass 2 picks, among the rows that block within that step, the
+        one with the largest pivot, which avoids tiny pivots on near ties.
+        A degenerate step (some row blocks at zero) has nothing to trade: the
+        tied rows are broken lexicographically on the rows of `lexico` (the
+        columns of the starting basis, i.e. B^-1) when given, else the first wins.
+        With bland=True the plain minimum ratio is used and ties go to the row
+        with the smallest basic variable in `basis`, as Bland's rule requires.
+        The step is clipped at zero, so a slightly negative rhs is a degenerate step. """
+    eligible = np.flatnonzero(column > tol)
+    if eligible.size == 0:
+        return None, np.inf
+    alpha = column[eligible]
+    values = np.maximum(rhs[eligible], 0.0)
+    ratios = values / alpha
+    if bland:
+        ties = eligible[ratios <= ratios.min() + tol]
+        row = ties[np.argmin(np.asarray(basis)[ties])]
+        return int(row), max(rhs[row], 0.0) / column[row]
+    if ratios.min() <= tol:
+        # degenerate step: the blocking rows all tie at zero and Harris has nothing
+        # to choose from; the lexicographic rule keeps the simplex from cycling
+        ties = eligible[ratios <= tol]
+        if ties.size > 1 and lexico is not None:
+            keys = lexico[ties] / column[ties, None]
+            ties = ties[np.lexsort(keys.T[::-1])]
+        return int(ties[0]), 0.0
+    bound = ((values + harris) / alpha).min()
+    near = ratios <= bound
+    row = eligible[near][np.argmax(alpha[near])]
+    return int(row), max(rhs[row], 0.0) / column[row]
+
+
+def ratio_test_batch(column, rhs, tol=PIVOT_TOL, harris=FEASIBILITY_TOL, lexico=None, basis=None, bland=False):
+    """ ratio_test sobre una pila de problemas; devuelve (filas, pasos) con fila -1 donde no hay fila que limite
+
+        column and rhs are (batch, rows); lexico, when given, is (batch, rows, k)
+        and basis (batch, rows). bland may be a boolean per problem. The rules are
+        those of ratio_test, computed for the whole stack at once; the rare
+        degenerate steps with several tied rows go to ratio_test one by one. """
+    batch = column.shape[0]
+    bland = np.broadcast_to(bland, (batch,))
+    eligible = column > tol
+    alpha = np.where(eligible, column, 1.0)
+    values = np.maximum(rhs, 0.0)
+    ratios = np.where(eligible, values / alpha, np.inf)
+    minimum = ratios.min(axis=1)
+    blocked = np.isfinite(minimum)
+    # pass 1 and 2 of Harris: the largest pivot among the rows blocking within the bound
+    bound = np.where(eligible, (values + harris) / alpha, np.inf).min(axis=1)
+    rows = np.argmax(np.where(ratios <= bound[:, None], alpha, -np.inf), axis=1)
+    # degenerate steps: the first row tied at zero, unless the lexicographic rule decides
+    ties = eligible & (ratios <= tol)
+    degenerate = blocked & (minimum <= tol)
+    rows = np.where(degenerate, np.argmax(ties, axis=1), rows)
+    if bland.any():
+        tied = eligible & (ratios <= minimum[:, None] + tol)
+        smallest = np.argmin(np.where(tied, basis, np.iinfo(np.asarray(basis).dtype).max), axis=1)
+        rows = np.where(bland, smallest, rows)
+    if lexico is not None:
+        for b in np.flatnonzero(degenerate & ~bland & (ties.sum(axis=1) > 1)):
+            rows[b], _ = ratio_test(column[b], rhs[b], tol, harris, lexico=lexico[b])
+    index = np.arange(batch)
+    steps = np.where(degenerate & ~bland, 0.0, values[index, rows] / alpha[index, rows])
+    rows[~blocked] = -1
+    steps[~blocked] = np.inf
+    return rows, steps
@@ -0,0 +1,210 @@
+import numpy as np
+from scipy import sparse
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+from Engine.Pricing import as_pricing
+from Engine.Sparse import column as matrix_column
+
+
+class BasisFactor(object):
+    """ Factorización LU de la base con actualizaciones eta (forma producto de la inversa) """
+
+    def __init__(self, A, basis, refactor_every=50):
+        self.A = A
+        self.basis = list(basis)
+        self.refactor_every = refactor_every
+        self.refactor()
+
+    def refactor(self):
+        B = self.A[:, self.basis]
+        if sparse.issparse(B):
+            # sparse LU keeps the factors proportional to nnz(B)
+            self._splu = splu(sparse.csc_matrix(B))
+        else:
+            self._splu = None
+            self._lu = lu_factor(B)
+        # every eta is (r, d): column r of the identity replaced by d = B^-1 a_q
+        self._etas = []
+
+    def _solve(self, rhs, trans):
+        if self._splu is not None:
+            return self._splu.solve(rhs, trans='T' if trans else 'N')
+        return lu_solve(self._lu, rhs, trans=1 if trans else 0)
+
+    def ftran(self, a):
+        # solve B x = a
+        x = self._solve(np.asarray(a, dtype=np.float64), False)
+        for r, d in self._etas:
+            x_r = x[r] / d[r]
+            x -= x_r * d
+            x[r] = x_r
+        return x
+
+    def btran(self, c):
+        # solve y^T B = c^T
+        c = np.array(c, dtype=np.float64)
+        for r, d in reversed(self._etas):
+            c[r] = (c[r] - (np.dot(c, d) - c[r] * d[r])) / d[r]
+        return self._solve(c, True)
+
+    @property
+    def updates(self):
+        return len(self._etas)
+
+    def update(self, r, d, enter):
+        # basis column at position r is replaced by the entering column
+        self.basis[r] = enter
+        self._etas.append((r, d))
+        if len(self._etas) >= self.refactor_every:
+            self.refactor()
+
+
+class RevisedSimplex(object):
+    """ Simplex revisado (minimización) sobre A x = b, 0 <= x <= upper, a partir de una base factible """
+
+    def __init__(self, A, b, c, basis, tol=1e-9, refactor_every=50, upper=None, at_upper=None, pricing=None):
+        self.A = A
+        self.b = np.asarray(b, dtype=np.float64)
+        self.c = np.asarray(c, dtype=np.float64)
+        self.tol = tol
+        # nonbasic variables sit at zero or, when flagged in at_upper, at their upper bound
+        self.upper = np.full(self.c.size, np.inf) if upper is None else np.asarray(upper, dtype=np.float64)
+        self.at_upper = np.zeros(self.c.size, dtype=bool) if at_upper is None else np.array(at_upper, dtype=bool)
+        self.factor = BasisFactor(A, basis, refactor_every)
+        self.x_B = self._basic_values()
+        self.iterations = 0
+        # only the reduced costs are at hand: rules that need tableau columns don't apply
+        self.pricing = as_pricing(pricing)
+        if self.pricing.needs_tableau:
+            raise ValueError(f"Pricing rule {self.pricing.name!r} needs the full tableau")
+
+    @property
+    def basis(self):
+        return self.factor.basis
+
+    def _basic_values(self):
+        rhs = self.b
+        if self.at_upper.any():
+            cols = np.flatnonzero(self.at_upper)
+            rhs = rhs - self.A[:, cols].dot(self.upper[cols])
+        return self.factor.ftran(rhs)
+
+    def objective(self):
+        return float(np.dot(self.c[self.basis], self.x_B) +
+                     np.dot(self.c[self.at_upper], self.upper[self.at_upper]))
+
+    def reduced_costs(self):
+        y = self.factor.btran(self.c[self.basis])
+        d = self.c - self.A.T.dot(y)
+        d[self.basis] = 0.0
+        return d
+
+    def _entering(self, d, bland):
+        # a variable at zero improves by increasing (d < 0), one at its upper
+        # bound by decreasing (d > 0)
+        candidates = np.flatnonzero(np.where(self.at_upper, d > self.tol, d < -self.tol))
+        if candidates.size == 0:
+            return None
+        if bland:
+            return candidates[0]
+        return self.pricing.select(np.abs(d), candidates)
+
+    def _leaving(self, enter, column, bland):
+        # returns (row, step); row is None when the entering variable reaches its
+        # own bound first (bound flip) and step is inf when the problem is unbounded
+        alpha = -column if self.at_upper[enter] else column
+        x_B = np.maximum(self.x_B, 0.0)
+        u_B = self.upper[self.basis]
+        ratios = np.full(alpha.size, np.inf)
+        down = alpha > self.tol
+        ratios[down] = x_B[down] / alpha[down]
+        up = (alpha < -self.tol) & np.isfinite(u_B)
+        ratios[up] = np.maximum(u_B[up] - x_B[up], 0.0) / -alpha[up]
+        theta = ratios.min() if ratios.size else np.inf
+        if self.upper[enter] <= theta:
+            return None, self.upper[enter]
+        ties = np.flatnonzero(ratios <= theta + self.tol)
+        if bland:
+            r = ties[np.argmin(np.array(self.basis)[ties])]
+        else:
+            # among tied rows keep the largest pivot for numerical stability
+            r = ties[np.argmax(np.abs(alpha[ties]))]
+        return r, ratios[r]
+
+    def step(self, r, enter, column, theta):
+        decreasing = self.at_upper[enter]
+        self.x_B -= (-theta if decreasing else theta) * column
+        if r is None:
+            # bound flip: the basis does not change
+            self.at_upper[enter] = not decreasing
+        else:
+            leave = self.basis[r]
+            # the leaving variable stops at its upper bound when it was increasing
+            # (a dual pivot raises it back to zero, never to an infinite bound)
+            self.at_upper[leave] = (column[r] > 0) == decreasing and np.isfinite(self.upper[leave])
+            self.x_B[r] = self.upper[enter] - theta if decreasing else theta
+            self.at_upper[enter] = False
+            self.factor.update(r, column, enter)
+            if self.factor.updates == 0:
+                # fresh factorization: recompute the basic solution to drop drift
+                self.x_B = self._basic_values()
+        self.iterations += 1
+        return theta
+
+    def pivot(self, r, enter, column):
+        return self.step(r, enter, column, self.x_B[r] / column[r])
+
+    def solve(self, callback=None, max_degenerate=50):
+        """ Itera hasta optimalidad; devuelve ('optimal', None) o ('unbounded', (enter, column)) """
+        degenerate = 0
+        while True:
+            bland = self.pricing.bland or degenerate >= max_degenerate  # anti-cycling fallback
+            d = self.reduced_costs()
+            enter = self._entering(d, bland)
+            if enter is None:
+                return 'optimal', None
+            column = self.ftran_column(enter)
+            r, theta = self._leaving(enter, column, bland)
+            if theta == np.inf:
+                return 'unbounded', (enter, column)
+            leave = None if r is None else self.basis[r]
+            self.step(r, enter, column, theta)
+            degenerate = degenerate + 1 if theta <= self.tol else 0
+            if callback is not None:
+                callback(self.iterations, enter, leave, self)
+
+    def dual_solve(self, callback=None):
+        """ Simplex dual desde una base dual factible (sin cotas superiores);
+            devuelve ('optimal', None) o ('infeasible', None) """
+        while True:
+            r = int(np.argmin(self.x_B))
+            if self.x_B[r] >= -self.tol:
+                return 'optimal', None
+            d = self.reduced_costs()
+            alpha = self.row(r)
+            candidates = np.flatnonzero(alpha < -self.tol)
+            candidates = candidates[~np.isin(candidates, self.basis)]
+            if candidates.size == 0:
+                return 'infeasible', None
+            ratios = d[candidates] / -alpha[candidates]
+            ties = candidates[ratios <= ratios.min() + self.tol]
+            enter = ties[np.argmax(np.abs(alpha[ties]))]
+            leave = self.basis[r]
+            self.pivot(r, enter, self.ftran_column(enter))
+            if callback is not None:
+                callback(self.iterations, enter, leave, self)
+
+    def ftran_column(self, j):
+        return self.factor.ftran(matrix_column(self.A, j))
+
+    def row(self, r):
+        # row r of B^-1 A, computed with one btran and one product
+        e_r = np.zeros(len(self.basis))
+        e_r[r] = 1.0
+        return self.A.T.dot(self.factor.btran(e_r))
+
+    def solution(self):
+        values = {int(v): float(x) for v, x in zip(self.basis, self.x_B)}
+        for v in np.flatnonzero(self.at_upper):
+            values[int(v)] = float(self.upper[v])
+        return dict(sorted(values.items()))
@@ -0,0 +1,97 @@
+import numpy as np
+from scipy import sparse
+from Engine.Sparse import as_constraint_matrix
+
+
+def _extremes(values, index, size):
+    # largest and smallest value of every row (or column); empty ones get 0
+    high = np.full(size, -np.inf)
+    low = np.full(size, np.inf)
+    np.maximum.at(high, index, values)
+    np.minimum.at(low, index, values)
+    empty = ~np.isfinite(high)
+    high[empty] = low[empty] = 0.0
+    return high, low
+
+
+class Scaling(object):
+    """ Escalado de filas y columnas: pasadas de media geométrica y luego equilibrado
+
+        Row i is multiplied by r_i and column j by s_j, so the solvers see
+        A' = R A S, b' = R b, c' = S c and x = S x'. The geometric-mean passes
+        bring every row and column close to max |a| * min |a| = 1; equilibration
+        then leaves the largest entry of each row and column near 1. The costs
+        get one more factor that centers their range on 1 (geometric mean of the
+        largest and smallest), so no reduced cost drops under the solvers' fixed
+        tolerances. Every factor is a power of 2, so scaling adds no rounding
+        error. Signs, and with them the operators, don't change. """
+
+    def __init__(self, passes=4, equilibrate=True):
+        self.passes = passes
+        self.equilibrate = equilibrate
+        self.row_scale = self.col_scale = None
+        self.cost_scale = 1.0
+        self.report = {}
+
+    def _factors(self, A):
+        coo = sparse.coo_matrix(A)
+        keep = coo.data != 0
+        rows, cols = coo.row[keep], coo.col[keep]
+        logs = np.log2(np.abs(coo.data[keep]))
+        m, n = A.shape
+        rho, sigma = np.zeros(m), np.zeros(n)
+        spread = np.inf
+        for _ in range(self.passes):
+            high, low = _extremes(logs + sigma[cols], rows, m)
+            rho = -(high + low) / 2
+            high, low = _extremes(logs + rho[rows], cols, n)
+            sigma = -(high + low) / 2
+            scaled = logs + rho[rows] + sigma[cols]
+            new_spread = scaled.max() - scaled.min() if scaled.size else 0.0
+            if new_spread > spread - 0.1:
+                break  # another pass gains almost nothing
+            spread = new_spread
+        if self.equilibrate:
+            rho -= _extremes(logs + rho[rows] + sigma[cols], rows, m)[0]
+            sigma -= _extremes(logs + rho[rows] + sigma[cols], cols, n)[0]
+        rho, sigma = np.round(rho), np.round(sigma)
+        before = logs.max() - logs.min() if logs.size else 0.0
+        after = logs + rho[rows] + sigma[cols]
+        after = after.max() - after.min() if after.size else 0.0
+        self.report = {'range_before': float(2.0 ** before), 'range_after': float(2.0 ** after)}
+        return np.exp2(rho), np.exp2(sigma)
+
+    def scale(self, c, A, b, lower=None, upper=None):
+        """ Devuelve (c, A, b, lower, upper) escalados; A conserva su formato (denso o disperso) """
+        c = np.asarray(c, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        A = as_constraint_matrix(A, (b.size, c.size))
+        self.row_scale, self.col_scale = r, s = self._factors(A)
+        c = c * s
+        costs = np.log2(np.abs(c[c != 0]))
+        self.cost_scale = float(np.exp2(-np.round((costs.max() + costs.min()) / 2))) if costs.size else 1.0
+        if sparse.issparse(A):
+            A = sparse.csc_matrix(sparse.diags(r) @ A @ sparse.diags(s))
+        else:
+            A = r[:, None] * A * s
+        lower = None if lower is None else np.asarray(lower, dtype=np.float64) / s
+        upper = None if upper is None else np.asarray(upper, dtype=np.float64) / s
+        return self.cost_scale * c, A, r * b, lower, upper
+
+    def unscale(self, result, names):
+        """ Lleva un resultado del problema escalado a las unidades originales
+
+            names: the variable names the solution is keyed by, in column order.
+            A recession cone keeps the decision variables only: the logical
+            columns of the solver's standard form have no scale of their own here. """
+        result = dict(result)
+        if 'Optimal Solution' in result:
+            solution = result['Optimal Solution']
+            result['Optimal Solution'] = {name: float(solution[name] * s) for name, s in zip(names, self.col_scale)}
+            result['Optimal Objective'] = result['Optimal Objective'] / self.cost_scale
+        if 'Recession Cone' in result:
+            n = self.col_scale.size
+            result['Recession Cone'] = {j: (point * self.col_scale[j], ray * self.col_scale[j])
+                                        for j, (point, ray) in result['Recession Cone'].items() if j < n}
+        result['Scaling'] = dict(self.report)
+        return result
@@ -0,0 +1,35 @@
+import numpy as np
+from scipy import sparse
+
+
+def is_triplet_list(A):
+    # a COO triplet list is a list of (row, col, value) tuples; dense rows are lists
+    return isinstance(A, list) and len(A) > 0 and \
+        all(isinstance(t, tuple) and len(t) == 3 for t in A)
+
+
+def as_constraint_matrix(A, shape):
+    """ Devuelve A como matriz CSC si llega dispersa (scipy.sparse o tripletas COO), o como ndarray denso """
+    if sparse.issparse(A):
+        return sparse.csc_matrix(A, dtype=np.float64)
+    if is_triplet_list(A):
+        rows, cols, values = zip(*A)
+        return sparse.csc_matrix((values, (rows, cols)), shape=shape, dtype=np.float64)
+    return np.array(A).astype(np.float64)
+
+
+def fill_dense(target, A):
+    # write A into a preallocated dense block without densifying it first
+    if sparse.issparse(A):
+        A = sparse.coo_matrix(A, copy=True)
+        A.sum_duplicates()
+        target[A.row, A.col] = A.data
+    else:
+        target[...] = A
+    return target
+
+
+def column(A, j):
+    if sparse.issparse(A):
+        return A[:, [j]].toarray().ravel()
+    return A[:, j]
@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+import numpy as np
+from scipy import sparse
+
+
+class SolveStats(object):
+    """ Contadores y tiempos de una resolución, para ver dónde se va el tiempo sin un profiler
+
+        pivots: pivots per phase ('phase 1', 'phase 2', 'dual', 'simplex', 'big m', ...)
+        flips: bound flips (the basis does not change), counted apart from pivots
+        degenerate: pivots that left the objective unchanged
+        times: cumulative perf_counter seconds per stage. 'display' is the time spent
+            formatting the trace, and is also included in the phase it happened in.
+        peak_tableau_bytes: largest tableau (or working matrix) the solver held
+        callback: optional callback(stats, phase) run after every pivot and flip
+
+    The counters accumulate over every solve run with the same object. """
+
+    def __init__(self, callback=None):
+        self.pivots = {}
+        self.flips = 0
+        self.degenerate = 0
+        self.times = {}
+        self.peak_tableau_bytes = 0
+        self.callback = callback
+        self.phase = None
+
+    @property
+    def total_pivots(self):
+        return sum(self.pivots.values())
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.times[stage] = self.times.get(stage, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def run_phase(self, phase):
+        """ Marca la fase actual (a la que se cuentan los pivotes) y mide su duración """
+        previous, self.phase = self.phase, phase
+        self.pivots.setdefault(phase, 0)
+        try:
+            with self.timer(phase):
+                yield self
+        finally:
+            self.phase = previous
+
+    def pivot(self, degenerate=False):
+        self.pivots[self.phase] = self.pivots.get(self.phase, 0) + 1
+        if degenerate:
+            self.degenerate += 1
+        if self.callback is not None:
+            self.callback(self, self.phase)
+
+    def flip(self):
+        self.flips += 1
+        if self.callback is not None:
+            self.callback(self, self.phase)
+
+    def tableau(self, *arrays):
+        # dense arrays or scipy.sparse matrices; several arrays are held at once
+        nbytes = 0
+        for array in arrays:
+            if sparse.issparse(array):
+                array = sparse.csc_matrix(array)
+                nbytes += array.data.nbytes + array.indices.nbytes + array.indptr.nbytes
+            else:
+                nbytes += np.asarray(array).nbytes
+        self.peak_tableau_bytes = max(self.peak_tableau_bytes, nbytes)
+
+    def as_dict(self):
+        return {
+            'pivots': dict(self.pivots),
+            'total_pivots': self.total_pivots,
+            'flips': self.flips,
+            'degenerate': self.degenerate,
+            'times': dict(self.times),
+            'peak_tableau_bytes': self.peak_tableau_bytes,
+        }
+
+    def __getstate__(self):
+        # results travel between processes; a callback usually can't be pickled
+        state = self.__dict__.copy()
+        state['callback'] = None
+        return state
+
+    def __repr__(self):
+        return f"SolveStats({self.as_dict()})"
@@ -0,0 +1,104 @@
+# Trace levels: every level includes the output of the ones below it
+NONE = 0
+SUMMARY = 1     # phase banners and the final result
+ITERATION = 2   # entering/leaving variables and the basic solution of each iteration
+TABLEAU = 3     # the full tableau of each iteration
+
+LEVELS = {'none': NONE, 'summary': SUMMARY, 'iteration': ITERATION, 'tableau': TABLEAU}
+
+
+class SolveCancelled(Exception):
+    """ Lanzada desde progress() cuando se pidió cancelar la resolución """
+
+
+class TraceSink(object):
+    """ Destino de la traza de un solver; los solvers consultan level antes de formatear """
+
+    level = NONE
+
+    def write(self, text):
+        raise NotImplementedError
+
+    def enabled(self, level):
+        return self.level >= level
+
+    def progress(self, iteration, objective):
+        # called once per iteration at every level; must stay cheap
+        pass
+
+
+class NullTrace(TraceSink):
+    """ Descarta la traza: con level NONE los solvers no formatean ninguna cadena """
+
+    def write(self, text):
+        pass
+
+
+class TextWidgetTrace(TraceSink):
+    """ Escribe la traza en un tk.Text (o cualquier objeto con insert(index, text)) """
+
+    def __init__(self, widget, level=TABLEAU):
+        self.widget = widget
+        self.level = LEVELS.get(level, level)
+
+    def write(self, text):
+        self.widget.insert("end", text)
+
+
+class FileTrace(TraceSink):
+    """ Escribe la traza en un archivo abierto o en una ruta """
+
+    def __init__(self, file, level=ITERATION):
+        self._owned = isinstance(file, str)
+        self.file = open(file, 'w', encoding='utf-8') if self._owned else file
+        self.level = LEVELS.get(level, level)
+
+    def write(self, text):
+        self.file.write(text)
+
+    def close(self):
+        if self._owned:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class QueueTrace(TraceSink):
+    """ Envía la traza y el progreso a una cola para que otro hilo (la GUI) los consuma
+
+        Text is buffered and sent as one ('text', chunk) item per iteration;
+        progress arrives as ('progress', iteration, objective). Setting the
+        cancel event makes the next progress() call raise SolveCancelled. """
+
+    def __init__(self, queue, cancel, level=TABLEAU):
+        self.queue = queue
+        self.cancel = cancel
+        self.level = LEVELS.get(level, level)
+        self._buffer = []
+
+    def write(self, text):
+        self._buffer.append(text)
+
+    def flush(self):
+        if self._buffer:
+            self.queue.put(('text', ''.join(self._buffer)))
+            self._buffer = []
+
+    def progress(self, iteration, objective):
+        self.flush()
+        self.queue.put(('progress', iteration, float(objective)))
+        if self.cancel.is_set():
+            raise SolveCancelled()
+
+
+def as_trace(target):
+    """ Acepta un TraceSink, un widget con insert() (compatibilidad con Menu.py) o None """
+    if target is None:
+        return NullTrace()
+    if isinstance(target, TraceSink):
+        return target
+    return TextWidgetTrace(target)
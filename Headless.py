@@ -0,0 +1,143 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import Counter
+from Engine.Batch import solve_many
+from Engine.Pricing import PRICING
+
+MODEL_EXTENSIONS = ('.mps', '.lp', '.mps.gz', '.lp.gz')
+CSV_FIELDS = ['file', 'status', 'objective', 'pivots', 'error']
+
+
+def find_models(paths):
+    """ Recorre archivos y directorios y entrega, de a uno, los modelos .mps / .lp encontrados """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(MODEL_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def to_record(path, result):
+    # one output line per model; numpy scalars become plain floats
+    record = {'file': path, 'status': result['Type']}
+    if 'Optimal Objective' in result:
+        record['objective'] = float(result['Optimal Objective'])
+        record['solution'] = {name: float(value) for name, value in result['Optimal Solution'].items()}
+    if 'Stats' in result:
+        record['pivots'] = result['Stats'].total_pivots
+        record['stats'] = result['Stats'].as_dict()
+    if 'Presolve' in result:
+        record['presolve'] = result['Presolve']
+    if 'Scaling' in result:
+        record['scaling'] = result['Scaling']
+    if 'Error' in result:
+        record['error'] = result['Error']
+    return record
+
+
+class JsonLinesWriter(object):
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+
+class CsvWriter(object):
+    """ Una fila por modelo; la solución completa solo se escribe en JSONL """
+
+    def __init__(self, file):
+        self.file = file
+        self.writer = csv.DictWriter(file, CSV_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+        self.file.flush()
+
+
+def solve_files(paths, writer, method='auto', engine=None, workers=None, fixed=False, pricing=None,
+                presolve=True, scaling=True):
+    """ Resuelve todos los modelos en paths y escribe cada resultado apenas termina
+
+        Models are read by the worker that solves them, so the parent process only
+        holds the file names of the problems in flight. Returns a Counter of the
+        result statuses. """
+    files = {}
+
+    def problems():
+        for index, path in enumerate(find_models(paths)):
+            files[index] = path
+            problem = {'path': path, 'method': method, 'fixed': fixed, 'presolve': presolve,
+                       'scaling': scaling}
+            if engine is not None:
+                problem['engine'] = engine
+            if pricing is not None:
+                problem['pricing'] = pricing
+            yield problem
+
+    statuses = Counter()
+    for index, result in solve_many(problems(), workers):
+        record = to_record(files.pop(index), result)
+        statuses[record['status']] += 1
+        writer.write(record)
+    return statuses
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m Headless',
+        description="Resuelve modelos .mps / .lp sin interfaz gráfica y escribe un resultado por línea")
+    parser.add_argument('paths', nargs='+', help="archivos de modelo o directorios que los contienen")
+    parser.add_argument('-m', '--method', default='auto', choices=['simplex', 'bigm', 'two-phase', 'auto'])
+    parser.add_argument('-e', '--engine', choices=['tableau', 'revised', 'dual', 'auto'],
+                        help="motor del método de dos fases (por defecto 'tableau', o 'auto' con --method auto)")
+    parser.add_argument('-p', '--pricing', choices=list(PRICING),
+                        help="regla de la variable entrante (por defecto 'dantzig'; el motor dual no la usa)")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="procesos en paralelo (por defecto uno por CPU; 1 resuelve en este proceso)")
+    parser.add_argument('-o', '--output', default='-', help="archivo de salida ('-' para stdout)")
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'],
+                        help="formato de salida (por defecto según la extensión de --output, si no jsonl)")
+    parser.add_argument('--no-presolve', action='store_true', help="resolver el modelo tal como se leyó, sin reducirlo")
+    parser.add_argument('--no-scaling', action='store_true', help="no escalar filas ni columnas antes de resolver")
+    parser.add_argument('--fixed-mps', action='store_true', help="leer los .mps en formato de columnas fijas")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    output_format = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    if args.output == '-':
+        file = sys.stdout
+    else:
+        file = open(args.output, 'w', encoding='utf-8', newline='' if output_format == 'csv' else None)
+    try:
+        writer = CsvWriter(file) if output_format == 'csv' else JsonLinesWriter(file)
+        statuses = solve_files(args.paths, writer, args.method, args.engine, args.workers,
+                               args.fixed_mps, args.pricing, not args.no_presolve,
+                               not args.no_scaling)
+    except BrokenPipeError:
+        # the reader of stdout went away (e.g. `| head`): stop without a traceback and
+        # point stdout at devnull, so the interpreter's last flush can't fail again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        if args.output != '-':
+            file.close()
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+    print(f"{sum(statuses.values())} models: {summary or 'none found'}", file=sys.stderr)
+    return 1 if statuses['error'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
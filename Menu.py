@@ -1,17 +1,146 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
 import Simplex
 import Two_Phase
 from Two_Phase import LP_model_solver
+from BigM.Coefficient import BigMCoefficient
 from BigM.Solver import BigMSolver
+from Engine.History import TableauHistory
+from Engine.Batch import Operator
+from Engine.Trace import ITERATION, QueueTrace, SolveCancelled
 from tabulate import tabulate
 
+class TableauViewer:
+    """Visor virtualizado de las tablas de un TableauHistory.
+
+    Solo se reconstruye la iteración elegida con el deslizador y solo se formatean
+    las celdas de la ventana visible (visible_rows x visible_cols); las barras de
+    desplazamiento mueven esa ventana sobre la tabla completa."""
+
+    def __init__(self, parent, visible_rows=12, visible_cols=10):
+        self.visible_rows = visible_rows
+        self.visible_cols = visible_cols
+        self.history = None
+        self.num_vars = None
+        self.names = None
+        self.tableau = None
+        self.basis = None
+        self.row_offset = 0
+        self.col_offset = 0
+        self._pending = None
+
+        self.frame = tk.Frame(parent, bg="#f0f0f0")
+        self.label = tk.Label(self.frame, text="", font=("Arial", 11), bg="#f0f0f0")
+        self.label.grid(row=0, column=0, columnspan=2, sticky="w")
+        self.tree = ttk.Treeview(self.frame, show="headings", height=visible_rows)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.vbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=lambda *a: self._scroll('rows', *a))
+        self.vbar.grid(row=1, column=1, sticky="ns")
+        self.hbar = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=lambda *a: self._scroll('cols', *a))
+        self.hbar.grid(row=2, column=0, sticky="ew")
+        self.slider = tk.Scale(self.frame, from_=0, to=0, orient=tk.HORIZONTAL, label="Iteración",
+                               command=self._on_slider, bg="#f0f0f0", state=tk.DISABLED)
+        self.slider.grid(row=3, column=0, columnspan=2, sticky="ew")
+
+    def show(self, history, num_vars=None, names=None):
+        """Muestra un historial; names son los nombres de las columnas (por defecto x1..xn, s1.., RHS)"""
+        self.history = history
+        self.num_vars = num_vars
+        self.names = names
+        if len(history) == 0:
+            self.slider.config(from_=0, to=0, state=tk.DISABLED)
+            self.tree.delete(*self.tree.get_children())
+            self.label.config(text="")
+            return
+        self.slider.config(from_=0, to=len(history) - 1, state=tk.NORMAL)
+        self.slider.set(0)
+        self._load(0)
+
+    def _on_slider(self, value):
+        # coalesce a drag of the slider into a single rebuild
+        if self._pending is not None:
+            self.frame.after_cancel(self._pending)
+        self._pending = self.frame.after(30, self._load, int(float(value)))
+
+    def _load(self, k):
+        self._pending = None
+        if self.history is None or len(self.history) == 0:
+            return
+        self.tableau, self.basis = self.history.rebuild(k)
+        self.label.config(text=f"{self.history.label(k)} - estado {k}")
+        self._render()
+
+    def _scroll(self, axis, action, amount, unit=None):
+        rows, cols = self.tableau.shape[-2:] if self.tableau is not None else (0, 0)
+        total, shown = (rows, self.visible_rows) if axis == 'rows' else (cols, self.visible_cols)
+        offset = self.row_offset if axis == 'rows' else self.col_offset
+        if action == 'moveto':
+            offset = int(float(amount) * total)
+        else:
+            offset += int(amount) * (shown if unit == 'pages' else 1)
+        offset = max(0, min(offset, total - shown))
+        if axis == 'rows':
+            self.row_offset = offset
+        else:
+            self.col_offset = offset
+        if self.tableau is not None:
+            self._render()
+
+    def _column_name(self, j, cols):
+        if j == cols - 1:
+            return "RHS"
+        if self.names is not None and j < len(self.names):
+            return self.names[j]
+        if self.num_vars is None or j < self.num_vars:
+            return f"x{j+1}"
+        return f"s{j - self.num_vars + 1}"
+
+    def _row_name(self, i, rows, cols):
+        if i == rows - 1:
+            return "z"
+        if self.basis is None:
+            return f"R{i+1}"
+        return self._column_name(int(self.basis[i]), cols)
+
+    def _cell(self, i, j):
+        # formatting happens here, only for the cells on screen
+        if self.tableau.ndim == 3:
+            return BigMCoefficient.format(self.tableau[0, i, j], self.tableau[1, i, j])
+        return f"{self.tableau[i, j]:.2f}"
+
+    def _render(self):
+        rows, cols = self.tableau.shape[-2:]
+        self.row_offset = max(0, min(self.row_offset, rows - self.visible_rows))
+        self.col_offset = max(0, min(self.col_offset, cols - self.visible_cols))
+        row_range = range(self.row_offset, min(rows, self.row_offset + self.visible_rows))
+        col_range = range(self.col_offset, min(cols, self.col_offset + self.visible_cols))
+
+        ids = ["base"] + [str(j) for j in col_range]
+        self.tree.configure(columns=ids)
+        self.tree.heading("base", text="")
+        self.tree.column("base", width=60, anchor="w")
+        for j in col_range:
+            self.tree.heading(str(j), text=self._column_name(j, cols))
+            self.tree.column(str(j), width=80, anchor="e")
+        self.tree.delete(*self.tree.get_children())
+        for i in row_range:
+            values = [self._row_name(i, rows, cols)] + [self._cell(i, j) for j in col_range]
+            self.tree.insert("", tk.END, values=values)
+
+        self.vbar.set(self.row_offset / rows, row_range.stop / rows)
+        self.hbar.set(self.col_offset / cols, col_range.stop / cols)
+
+
 class SimplexApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Métodos de Programación Lineal")
         self.root.configure(bg="#f0f0f0")  # Fondo claro para la ventana
         self.operators = []
+        self.worker = None  # hilo que resuelve el problema actual
+        self.solve_id = 0  # número de la resolución actual; los eventos de las anteriores se descartan
 
         # Variables para los inputs del Simplex
         self.entry_vars = {
@@ -68,6 +197,10 @@ class SimplexApp:
 
     def create_widgets(self):
         """Crea los campos de entrada según el método seleccionado"""
+        # una resolución en curso escribiría en widgets que van a destruirse: se cancela
+        # y sus eventos se descartan
+        self.cancelar()
+        self.solve_id += 1
         for widget in self.root.winfo_children():
             widget.destroy()
 
@@ -106,9 +239,21 @@ class SimplexApp:
         self.text_widget = tk.Text(self.root, height=15, width=70, font=("Arial", 12))
         self.text_widget.pack(pady=10)
 
+        # Visor de las tablas de cada iteración (solo dibuja la parte visible)
+        self.viewer = TableauViewer(self.root)
+        self.viewer.frame.pack(pady=5)
+
+        # Progreso de la resolución en curso (iteración y objetivo actual)
+        self.progress_label = tk.Label(self.root, text="", font=("Arial", 11), bg="#f0f0f0")
+        self.progress_label.pack()
+
         # Botón para resolver
         tk.Button(self.root, text="Resolver", command=self.resolver, font=("Arial", 12, "bold"), bg="#4caf50", fg="white", width=20).pack(pady=10)
 
+        # Botón para cancelar la resolución en curso
+        self.cancel_button = tk.Button(self.root, text="Cancelar", command=self.cancelar, font=("Arial", 12, "bold"), bg="#f44336", fg="white", width=20, state=tk.DISABLED)
+        self.cancel_button.pack(pady=5)
+
         self.constraints_frame = frame
 
     def generar_coeficientes(self):
@@ -222,7 +367,9 @@ class SimplexApp:
 
 
     def resolver(self):
-        """Resuelve el problema con el método seleccionado"""
+        """Lee el problema y lo resuelve en un hilo aparte para que la ventana siga respondiendo"""
+        if self.worker is not None and self.worker.is_alive() and not self.cancel_event.is_set():
+            return
         self.text_widget.delete(1.0, tk.END)
 
         try:
@@ -243,58 +390,141 @@ class SimplexApp:
             if len(b) != m:
                 messagebox.showerror("Error", f"Se esperaban {m} valores en el lado derecho de las restricciones.")
                 return
+        except ValueError as ve:
+            messagebox.showerror("Error", f"Por favor ingrese valores válidos: {ve}")
+            return
 
-            method = self.method.get()
+        method = self.method.get()
+        is_min = self.opt_type.get() == "Minimizar"
+        # Los StringVar solo se leen en el hilo principal; el hilo de trabajo recibe copias
+        operators = [Operator(self.operators[i].get()) for i in range(m)]
 
+        if method == "Simplex":
+            self.text_widget.insert(tk.END, "Resolviendo con Método Simplex...\n")
+        elif method == "Big M":
+            self.text_widget.insert(tk.END, "Resolviendo con Método M...\n")
+        elif method == "Two Phase":
+            self.text_widget.insert(tk.END, "Resolviendo con Método de Dos Fases...\n")
+
+        # cada resolución tiene su propia cola; una resolución cancelada que todavía no
+        # terminó queda reemplazada por esta y sus eventos se descartan
+        self.solve_id += 1
+        events = queue.Queue()
+        self.cancel_event = threading.Event()
+        # las tablas completas van al visor; el texto solo lleva el resumen de cada iteración
+        trace = QueueTrace(events, self.cancel_event, level=ITERATION)
+        self.history = TableauHistory()
+        self.num_vars = n
+        self.worker = threading.Thread(target=self._resolver_en_hilo,
+                                       args=(method, n, m, c, A, b, operators, is_min, trace, self.history, events),
+                                       daemon=True)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_label.config(text="Resolviendo...")
+        self.worker.start()
+        self.root.after(50, self._revisar_eventos, self.solve_id, events)
+
+    def _resolver_en_hilo(self, method, n, m, c, A, b, operators, is_min, trace, history, events):
+        """Corre en el hilo de trabajo: no toca ningún widget, solo deja eventos en su cola"""
+        names = None
+        try:
+            result = None
             if method == "Simplex":
-                self.text_widget.insert(tk.END, "Resolviendo con Método Simplex...\n")
                 solver = Simplex.SimplexSolver(n, m, c, A, b)
-                solver.simplex(self.text_widget)
+                solver.simplex(trace, history)
             elif method == "Big M":
-                self.text_widget.insert(tk.END, "Resolviendo con Método M...\n")
-                o = [self.operators[i].get().replace('≤', '<=').replace('≥', '>=') for i in range(m)]
-                solver = BigMSolver(n, m, c, A, o, b)
-                solver.solve(self.text_widget)
+                o = [op.get().replace('≤', '<=').replace('≥', '>=') for op in operators]
+                solver = BigMSolver(n, m, c, A, o, b, is_min)
+                names = solver.all_variables + ['RHS']
+                solution, objective = solver.solve(trace, history)
+                result = {'Type': solver.status}
+                if solver.status == 'optimal':
+                    result['Optimal Solution'] = {f"x{i+1}": value for i, value in enumerate(solution)}
+                    result['Optimal Objective'] = objective
             elif method == "Two Phase":
-                self.text_widget.insert(tk.END, "Resolviendo con Método de Dos Fases...\n")
-
-                if self.opt_type.get() == "Maximizar":
-                    is_min = False
-                else:
-                    is_min = True
-                
-                if is_min == True:
-                    is_min = self.opt_type.get() == "Minimizar"
                 # Crear los nombres de las variables según el número de variables
                 vars_name = [f"x{i+1}" for i in range(n)]
                 
                 # Asume que los coeficientes de las variables holgura (slack_vars) son 1 y tamaño m
                 slack_vars = [1 for _ in range(m)]
 
-                # Crear el objeto del solucionador de dos fases
-                #solver = Two_Phase.LP_model_solver(vars_name, c, A, b, slack_vars, widget=self.text_widget, operators=self.operators ,is_min=True)
-                solver = Two_Phase.LP_model_solver(vars_name, c, A, b, slack_vars, operators=self.operators, widget=self.text_widget, is_min = is_min)
-
-                # Llamar al método para resolver en dos fases
+                # Crear el objeto del solucionador de dos fases y resolver
+                solver = Two_Phase.LP_model_solver(vars_name, c, A, b, slack_vars, operators=operators, widget=trace, is_min = is_min,
+                                                   history=history)
                 result = solver.optimize()
-
-                # Mostrar el resultado en el text_widget
-                if result['Type'] == 'optimal':
-                    self.text_widget.insert(tk.END, "Solución óptima encontrada:\n")
-                    self.text_widget.insert(tk.END, f"Valor óptimo: {result['Optimal Objective']}\n")
-                    self.text_widget.insert(tk.END, "Soluciones óptimas:\n")
-                    for var, value in result['Optimal Solution'].items():
-                        self.text_widget.insert(tk.END, f"Variable {var}: {value}\n")
-                elif result['Type'] == 'unbounded':
-                    self.text_widget.insert(tk.END, "El problema es ilimitado.\n")
-                    self.text_widget.insert(tk.END, f"Cono de recesión: {result['Recession Cone']}\n")
-            else:
-                self.text_widget.insert(tk.END, "El problema no tiene solución factible.\n")
-
-        except ValueError as ve:
-            messagebox.showerror("Error", f"Por favor ingrese valores válidos: {ve}")
+                # columnas de la forma estándar y, en la Fase 1, las artificiales de cada fila
+                names = solver.column_names + [f"a{i+1}" for i in solver.artificial_rows]
+            event = ('done', method, result)
+        except SolveCancelled:
+            event = ('cancelled',)
         except Exception as e:
-            messagebox.showerror("Error", f"Ha ocurrido un error: {e}")
+            event = ('error', e)
+        trace.flush()
+        events.put(('history', names))
+        events.put(event)
+
+    def _revisar_eventos(self, solve_id, events):
+        """Aplica en la ventana los eventos pendientes del hilo de trabajo (el texto se inserta de una vez)"""
+        if solve_id != self.solve_id:
+            return  # la resolución fue reemplazada o la vista se reconstruyó: sus eventos se descartan
+        textos = []
+        progreso = None
+        final = None
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'text':
+                textos.append(event[1])
+            elif event[0] == 'progress':
+                progreso = event
+            elif event[0] == 'history':
+                # el hilo ya no toca el historial: se puede mostrar lo que alcanzó a guardar
+                self.viewer.show(self.history, self.num_vars, event[1])
+            else:
+                final = event
+
+        if textos:
+            self.text_widget.insert(tk.END, "".join(textos))
+        if progreso is not None:
+            self.progress_label.config(text=f"Iteración {progreso[1]} - objetivo actual: {progreso[2]:.4f}")
+        if final is None:
+            self.root.after(50, self._revisar_eventos, solve_id, events)
+            return
+
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text="")
+        if final[0] == 'done':
+            self.mostrar_resultado(final[1], final[2])
+        elif final[0] == 'cancelled':
+            self.text_widget.insert(tk.END, "Resolución cancelada.\n")
+        elif isinstance(final[1], ValueError):
+            messagebox.showerror("Error", f"Por favor ingrese valores válidos: {final[1]}")
+        else:
+            messagebox.showerror("Error", f"Ha ocurrido un error: {final[1]}")
+
+    def cancelar(self):
+        """Pide al hilo de trabajo que se detenga en la siguiente iteración"""
+        if self.worker is not None and self.worker.is_alive():
+            self.cancel_event.set()
+            self.progress_label.config(text="Cancelando...")
+
+    def mostrar_resultado(self, method, result):
+        """Muestra el resultado de los métodos de dos fases y Gran M en el text_widget"""
+        if result is None:
+            return  # el simplex ya escribió su solución en la traza
+        if result['Type'] == 'optimal':
+            self.text_widget.insert(tk.END, "Solución óptima encontrada:\n")
+            self.text_widget.insert(tk.END, f"Valor óptimo: {result['Optimal Objective']}\n")
+            self.text_widget.insert(tk.END, "Soluciones óptimas:\n")
+            for var, value in result['Optimal Solution'].items():
+                self.text_widget.insert(tk.END, f"Variable {var}: {value}\n")
+        elif result['Type'] == 'unbounded':
+            self.text_widget.insert(tk.END, "El problema es ilimitado.\n")
+            if 'Recession Cone' in result:
+                self.text_widget.insert(tk.END, f"Cono de recesión: {result['Recession Cone']}\n")
+        else:
+            self.text_widget.insert(tk.END, "El problema no tiene solución factible.\n")
 
 # Ejecutar la aplicación de Tkinter
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+import re
+import numpy as np
+from Readers.Model import ModelBuilder, open_text
+
+_OPERATORS = {'<=': "≤", '=<': "≤", '<': "≤", '>=': "≥", '=>': "≥", '>': "≥", '=': "="}
+_REVERSED = {"≤": "≥", "≥": "≤", "=": "="}
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<op><=|=<|>=|=>|<|>|=)
+  | (?P<sign>[+-])
+  | (?P<colon>:)
+  | (?P<name>[A-Za-z_!"\#$%&()/,;?@'`{}|~][A-Za-z0-9_!"\#$%&()/,.;?@'`{}|~]*)
+  | (?P<other>\S))""", re.VERBOSE)
+_SECTION = re.compile(r"""\s*(?:
+    (?P<max>maximi[sz]e|maximum|max)
+  | (?P<min>minimi[sz]e|minimum|min)
+  | (?P<constraints>subject\s+to|such\s+that|s\.t\.|st)
+  | (?P<bounds>bounds?)
+  | (?P<general>generals?|gen|integers?)
+  | (?P<binary>binary|binaries|bin)
+  | (?P<end>end)
+  )(?=\s|$)(?!\s*:)""", re.VERBOSE | re.IGNORECASE)
+_INFINITY = ('inf', 'infinity')
+
+
+def _tokens(line):
+    tokens = []
+    for match in _TOKEN.finditer(line):
+        kind = match.lastgroup
+        if kind == 'other':
+            # '[' opens a quadratic term, '->' an indicator constraint
+            raise ValueError(f"Unsupported LP syntax near {match.group(kind)!r}")
+        tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _LpReader(object):
+    """ Lee las secciones de un archivo CPLEX LP línea por línea sobre un ModelBuilder """
+
+    def __init__(self):
+        self.model = ModelBuilder()
+        self.section = None
+        self._reset()
+
+    def _reset(self):
+        # state of the objective or constraint being read; it may span several lines
+        self.label = None
+        self.terms = {}
+        self.constant = 0.0
+        self.sign = 1.0
+        self.coefficient = None
+        self.operator = None
+        self.started = False
+
+    def _value(self, kind, text):
+        if kind == 'number':
+            return float(text)
+        if kind == 'name' and text.lower() in _INFINITY:
+            return np.inf
+        return None
+
+    def _flush_constant(self):
+        # a number that is not followed by a variable is a constant term
+        if self.coefficient is not None:
+            self.constant += self.sign * self.coefficient
+            self.coefficient = None
+        self.sign = 1.0
+
+    def _expression(self, tokens, i):
+        """ Consume un término de la expresión lineal; devuelve la posición siguiente """
+        kind, text = tokens[i]
+        if kind == 'name' and i + 1 < len(tokens) and tokens[i + 1][0] == 'colon':
+            if self.started:
+                raise ValueError(f"Unexpected label {text!r} inside an expression")
+            self.label = text
+            return i + 2
+        self.started = True
+        if kind == 'sign':
+            self._flush_constant()
+            self.sign = -1.0 if text == '-' else 1.0
+        elif kind == 'number':
+            value = float(text)
+            self.coefficient = value if self.coefficient is None else self.coefficient * value
+        elif kind == 'name':
+            j = self.model.column(text)
+            coefficient = 1.0 if self.coefficient is None else self.coefficient
+            self.terms[j] = self.terms.get(j, 0.0) + self.sign * coefficient
+            self.coefficient, self.sign = None, 1.0
+        else:
+            raise ValueError(f"Unexpected {text!r} in the LP expression")
+        return i + 1
+
+    def objective(self, tokens):
+        i = 0
+        while i < len(tokens):
+            i = self._expression(tokens, i)
+
+    def end_objective(self):
+        self._flush_constant()
+        for j, value in self.terms.items():
+            self.model.add_objective(j, value)
+        self.model.offset += self.constant
+        self._reset()
+
+    def constraint(self, tokens):
+        i = 0
+        while i < len(tokens):
+            kind, text = tokens[i]
+            if self.operator is None and kind != 'op':
+                i = self._expression(tokens, i)
+                continue
+            if kind == 'op':
+                if self.operator is not None:
+                    raise ValueError("Ranged constraints with two operators are not supported in LP files")
+                self._flush_constant()
+                self.operator = _OPERATORS[text]
+                i += 1
+                continue
+            # right-hand side: an optionally signed constant closes the constraint
+            if kind == 'sign':
+                self.sign = -self.sign if text == '-' else self.sign
+                i += 1
+                continue
+            value = self._value(kind, text)
+            if value is None:
+                raise ValueError(f"Expected a constant right-hand side, found {text!r}")
+            self._add_constraint(self.sign * value)
+            i += 1
+
+    def _add_constraint(self, rhs):
+        model = self.model
+        name = self.label or f"R{len(model.operators) + 1}"
+        # constants written on the left-hand side move to the right
+        row = model.add_row(name, self.operator, rhs - self.constant)
+        for j, value in self.terms.items():
+            model.add_entry(row, j, value)
+        self._reset()
+
+    def bound(self, tokens):
+        # collapse signed constants: x >= -inf, -5 <= x, ...
+        items = []
+        sign = 1.0
+        for kind, text in tokens:
+            if kind == 'sign':
+                sign = -sign if text == '-' else sign
+                continue
+            value = self._value(kind, text)
+            if value is not None:
+                items.append(('value', sign * value))
+            elif kind == 'name':
+                items.append(('name', text))
+            elif kind == 'op':
+                items.append(('op', _OPERATORS[text]))
+            else:
+                raise ValueError(f"Unexpected {text!r} in the bounds section")
+            sign = 1.0
+        kinds = tuple(kind for kind, _ in items)
+        model = self.model
+        if kinds == ('name', 'name') and items[1][1].lower() == 'free':
+            j = model.column(items[0][1])
+            model.lower[j], model.upper[j] = -np.inf, np.inf
+        elif kinds == ('name', 'op', 'value'):
+            self._set_bound(model.column(items[0][1]), items[1][1], items[2][1])
+        elif kinds == ('value', 'op', 'name'):
+            self._set_bound(model.column(items[2][1]), _REVERSED[items[1][1]], items[0][1])
+        elif kinds == ('value', 'op', 'name', 'op', 'value'):
+            j = model.column(items[2][1])
+            self._set_bound(j, _REVERSED[items[1][1]], items[0][1])
+            self._set_bound(j, items[3][1], items[4][1])
+        elif items:
+            raise ValueError(f"Unsupported bound: {' '.join(text for _, text in tokens)}")
+
+    def _set_bound(self, j, operator, value):
+        if operator in ("≤", "="):
+            self.model.upper[j] = value
+        if operator in ("≥", "="):
+            self.model.lower[j] = value
+
+    def binary(self, tokens):
+        for kind, text in tokens:
+            j = self.model.column(text)
+            self.model.lower[j], self.model.upper[j] = 0.0, 1.0
+
+    def general(self, tokens):
+        # integrality is dropped: the LP relaxation is read; the names still
+        # declare the columns
+        for kind, text in tokens:
+            self.model.column(text)
+
+    def close_section(self):
+        if self.section == 'objective':
+            self.end_objective()
+        elif self.section == 'constraints' and (self.started or self.operator is not None):
+            raise ValueError("Incomplete constraint at the end of the section")
+
+
+def read_lp(path):
+    """ Lee un modelo en formato CPLEX LP en una pasada, línea por línea
+
+        Supported sections: the objective (maximize/minimize), subject to, bounds,
+        general/integer (ignored, the LP relaxation is read), binary (0..1 bounds)
+        and end. Columns are numbered in order of first appearance. """
+    reader = _LpReader()
+    handlers = {'objective': reader.objective, 'constraints': reader.constraint,
+                'bounds': reader.bound, 'general': reader.general, 'binary': reader.binary}
+    with open_text(path) as lines:
+        for line in lines:
+            line = line.split('\\', 1)[0]
+            if not line.strip():
+                continue
+            match = _SECTION.match(line)
+            if match:
+                reader.close_section()
+                section = match.lastgroup
+                if section == 'end':
+                    reader.section = None
+                    break
+                if section in ('max', 'min'):
+                    reader.model.is_min = section == 'min'
+                    section = 'objective'
+                reader.section = section
+                line = line[match.end():]
+                if not line.strip():
+                    continue
+            if reader.section is None:
+                raise ValueError("LP file must start with an objective section")
+            handlers[reader.section](_tokens(line))
+    reader.close_section()
+    return reader.model.build()
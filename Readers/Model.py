@@ -0,0 +1,175 @@
+import gzip
+from array import array
+import numpy as np
+from scipy import sparse
+
+
+def open_text(path):
+    # models are read line by line; .gz files are decompressed on the fly
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+class ModelBuilder(object):
+    """ Acumula un modelo leído en una sola pasada: nombres, tripletas COO, lados derechos y cotas """
+
+    def __init__(self):
+        self.name = ''
+        self.columns = {}       # column name -> index, in order of first appearance
+        self.rows = {}          # row name -> index
+        self.operators = []
+        self.rhs = array('d')
+        self.objective = {}     # column index -> cost
+        self.offset = 0.0       # constant term of the objective
+        self.is_min = True
+        self.lower = {}
+        self.upper = {}
+        self.ranges = {}        # row index -> range value (MPS RANGES)
+        self._rows, self._cols, self._values = array('q'), array('q'), array('d')
+
+    def column(self, name):
+        index = self.columns.get(name)
+        if index is None:
+            index = self.columns[name] = len(self.columns)
+        return index
+
+    def add_row(self, name, operator, rhs=0.0):
+        if name in self.rows:
+            raise ValueError(f"Duplicate constraint name: {name}")
+        index = self.rows[name] = len(self.operators)
+        self.operators.append(operator)
+        self.rhs.append(rhs)
+        return index
+
+    def add_entry(self, row, column, value):
+        # repeated (row, column) pairs are summed when the matrix is built
+        self._rows.append(row)
+        self._cols.append(column)
+        self._values.append(value)
+
+    def add_objective(self, column, value):
+        self.objective[column] = self.objective.get(column, 0.0) + value
+
+    def build(self):
+        """ Devuelve el problema como dict con las claves que usa Engine.Batch.solve_problem """
+        m, n = len(self.operators), len(self.columns)
+        A = sparse.csc_matrix((np.frombuffer(self._values, dtype=np.float64),
+                               (np.frombuffer(self._rows, dtype=np.int64),
+                                np.frombuffer(self._cols, dtype=np.int64))), shape=(m, n))
+        b = np.frombuffer(self.rhs, dtype=np.float64).copy()
+        operators = list(self.operators)
+
+        if self.ranges:
+            # a ranged row l <= a x <= u becomes two rows; the extra one gets the other bound
+            ranged = sorted(self.ranges)
+            extra_b, extra_ops = [], []
+            for r in ranged:
+                R, op = self.ranges[r], operators[r]
+                if op == "≤":
+                    extra_ops.append("≥"), extra_b.append(b[r] - abs(R))
+                elif op == "≥":
+                    extra_ops.append("≤"), extra_b.append(b[r] + abs(R))
+                elif R >= 0:
+                    operators[r] = "≥"
+                    extra_ops.append("≤"), extra_b.append(b[r] + R)
+                else:
+                    operators[r] = "≤"
+                    extra_ops.append("≥"), extra_b.append(b[r] + R)
+            A = sparse.vstack([A, A[ranged]], format='csc')
+            b = np.concatenate([b, extra_b])
+            operators += extra_ops
+
+        c = np.zeros(n)
+        for j, value in self.objective.items():
+            c[j] = value
+        lower, upper = np.zeros(n), np.full(n, np.inf)
+        for j, value in self.lower.items():
+            lower[j] = value
+        for j, value in self.upper.items():
+            upper[j] = value
+        names = list(self.columns)
+
+        # the solvers want x >= l with a finite l: x <= u becomes -x >= -u, and a free
+        # column is split into x = x⁺ - x⁻; restore_columns undoes both in the result
+        unbounded = np.flatnonzero(lower == -np.inf)
+        negated = unbounded[upper[unbounded] < np.inf]
+        split = unbounded[upper[unbounded] == np.inf]
+        if negated.size:
+            sign = np.ones(n)
+            sign[negated] = -1.0
+            A = A @ sparse.diags(sign, format='csc')
+            c[negated] = -c[negated]
+            lower[negated], upper[negated] = -upper[negated], np.inf
+        if split.size:
+            A = sparse.hstack([A, -A[:, split]], format='csc')
+            c = np.concatenate([c, -c[split]])
+            lower[split] = 0.0
+            lower = np.concatenate([lower, np.zeros(split.size)])
+            upper = np.concatenate([upper, np.full(split.size, np.inf)])
+            taken = set(names)
+            for j in split:
+                minus = names[j] + '⁻'
+                while minus in taken:
+                    minus += '⁻'
+                taken.add(minus)
+                names.append(minus)
+
+        problem = {
+            'name': self.name,
+            'vars_name': names,
+            'c': c,
+            'A': A,
+            'b': b,
+            'operators': operators,
+            'is_min': self.is_min,
+            'objective_offset': self.offset,
+            'lower': None,
+            'upper': None,
+        }
+        if lower.any() or (upper < np.inf).any():
+            problem['lower'], problem['upper'] = lower, upper
+        if negated.size:
+            problem['negated_columns'] = negated.tolist()
+        if split.size:
+            problem['split_columns'] = dict(zip(split.tolist(), range(n, n + split.size)))
+        return problem
+
+
+def restore_columns(result, problem):
+    """ Lleva el resultado a las columnas del modelo leído: deshace las columnas negadas y
+        junta las partes x⁺ - x⁻ de las columnas libres (ver ModelBuilder.build) """
+    negated = problem.get('negated_columns', [])
+    split = problem.get('split_columns', {})
+    names = problem['vars_name']
+    result = dict(result)
+    if 'Optimal Solution' in result:
+        solution = dict(result['Optimal Solution'])
+        for j in negated:
+            solution[names[j]] = -solution[names[j]]
+        for j, k in split.items():
+            solution[names[j]] -= solution.pop(names[k])
+        result['Optimal Solution'] = solution
+    if 'Recession Cone' in result:
+        cone = dict(result['Recession Cone'])
+        for j in negated:
+            if j in cone:
+                cone[j] = (-cone[j][0], -cone[j][1])
+        for j, k in split.items():
+            point, ray = cone.get(j, (0.0, 0.0))
+            minus_point, minus_ray = cone.pop(k, (0.0, 0.0))
+            cone[j] = (point - minus_point, ray - minus_ray)
+        result['Recession Cone'] = dict(sorted(cone.items()))
+    return result
+
+
+def read_model(path, **options):
+    """ Lee un archivo .mps (libre o fijo, opcionalmente .gz) o .lp según su extensión """
+    name = str(path).lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith('.lp'):
+        from Readers.Lp import read_lp
+        return read_lp(path)
+    from Readers.Mps import read_mps
+    return read_mps(path, **options)
@@ -0,0 +1,111 @@
+import numpy as np
+from Readers.Model import ModelBuilder, open_text
+
+_ROW_TYPES = {'L': "≤", 'G': "≥", 'E': "="}
+_SECTIONS = ('NAME', 'OBJSENSE', 'OBJSENSE MAX', 'OBJSENSE MIN', 'OBJSENSE MAXIMIZE', 'OBJSENSE MINIMIZE',
+             'ROWS', 'COLUMNS', 'RHS', 'RANGES', 'BOUNDS', 'ENDATA')
+# fixed MPS field positions (0-based slices of columns 2-3, 5-12, 15-22, 25-36, 40-47, 50-61)
+_FIXED_FIELDS = ((1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61))
+
+
+def _fixed_fields(line):
+    fields = [line[a:b].strip() for a, b in _FIXED_FIELDS]
+    while fields and not fields[-1]:
+        fields.pop()
+    return fields
+
+
+def read_mps(path, fixed=False):
+    """ Lee un modelo MPS (formato libre por defecto, fixed=True para columnas fijas) en una pasada
+
+        Integrality markers are skipped (the LP relaxation is read). A constant on
+        the objective row in RHS is returned as objective_offset, with the usual
+        MPS sign convention (offset = -value). """
+    model = ModelBuilder()
+    objective = None
+    free_rows = set()       # extra N rows are ignored
+    section = None
+    with open_text(path) as lines:
+        for line in lines:
+            if not line.strip() or line[0] == '*':
+                continue
+            if not line[0].isspace():
+                # section header
+                words = line.split()
+                section = words[0].upper()
+                if section == 'NAME':
+                    model.name = line[4:].strip() if fixed else ' '.join(words[1:])
+                elif section == 'OBJSENSE' and len(words) > 1:
+                    model.is_min = not words[1].upper().startswith('MAX')
+                elif section == 'ENDATA':
+                    break
+                elif section not in _SECTIONS:
+                    raise ValueError(f"Unsupported MPS section: {section}")
+                continue
+
+            if not fixed or section == 'OBJSENSE':
+                fields = line.split()
+            else:
+                fields = _fixed_fields(line)
+                if section not in ('ROWS', 'BOUNDS'):
+                    fields = fields[1:]  # field 1 only carries the row or bound type
+            if section == 'OBJSENSE':
+                model.is_min = not fields[0].upper().startswith('MAX')
+            elif section == 'ROWS':
+                kind, name = fields[0].upper(), fields[1]
+                if kind == 'N':
+                    if objective is None:
+                        objective = name
+                    else:
+                        free_rows.add(name)
+                else:
+                    model.add_row(name, _ROW_TYPES[kind])
+            elif section == 'COLUMNS':
+                if len(fields) > 2 and fields[1].strip("'").upper() == 'MARKER':
+                    continue
+                j = model.column(fields[0])
+                for row, value in zip(fields[1::2], fields[2::2]):
+                    if row == objective:
+                        model.add_objective(j, float(value))
+                    elif row not in free_rows:
+                        model.add_entry(model.rows[row], j, float(value))
+            elif section in ('RHS', 'RANGES'):
+                # the set name is optional in free MPS: pairs start at an odd offset
+                pairs = fields[1:] if len(fields) % 2 == 1 else fields
+                for row, value in zip(pairs[0::2], pairs[1::2]):
+                    if row == objective:
+                        if section == 'RHS':
+                            model.offset = -float(value)
+                    elif row in free_rows:
+                        continue
+                    elif section == 'RHS':
+                        model.rhs[model.rows[row]] = float(value)
+                    else:
+                        model.ranges[model.rows[row]] = float(value)
+            elif section == 'BOUNDS':
+                kind = fields[0].upper()
+                # "TYPE SET COLUMN [VALUE]"; the set name may be missing in free MPS
+                if kind in ('FR', 'MI', 'PL', 'BV') and len(fields) == 2 or \
+                        kind not in ('FR', 'MI', 'PL', 'BV') and len(fields) == 3:
+                    fields = [kind, ''] + fields[1:]
+                j = model.column(fields[2])
+                value = float(fields[3]) if len(fields) > 3 else 0.0
+                if kind in ('UP', 'UI'):
+                    if value < 0 and model.lower.get(j, 0.0) == 0.0:
+                        model.lower[j] = -np.inf
+                    model.upper[j] = value
+                elif kind in ('LO', 'LI'):
+                    model.lower[j] = value
+                elif kind == 'FX':
+                    model.lower[j] = model.upper[j] = value
+                elif kind == 'FR':
+                    model.lower[j], model.upper[j] = -np.inf, np.inf
+                elif kind == 'MI':
+                    model.lower[j] = -np.inf
+                elif kind == 'PL':
+                    model.upper[j] = np.inf
+                elif kind == 'BV':
+                    model.lower[j], model.upper[j] = 0.0, 1.0
+                else:
+                    raise ValueError(f"Unsupported MPS bound type: {kind}")
+    return model.build()
@@ -1,5 +1,10 @@
-import tkinter as tk
-from tkinter import messagebox
+import numpy as np
+from Engine.Pivot import pivot
+from Engine.Pricing import as_pricing
+from Engine.RatioTest import ratio_test
+from Engine.Sparse import as_constraint_matrix, fill_dense
+from Engine.Stats import SolveStats
+from Engine.Trace import ITERATION, SUMMARY, TABLEAU, as_trace
 
 class SimplexSolver:
     def __init__(self, n, m, c, A, b):
@@ -8,68 +13,99 @@ class SimplexSolver:
         self.c = c  # Objective function coefficients
         self.A = A  # Coefficients matrix for constraints
         self.b = b  # Right-hand side values for constraints
+        self.status = None  # 'optimal' o 'unbounded' después de simplex()
 
     def pivot(self, tabla, row, col):
-        pivot_element = tabla[row][col]
-        tabla[row] = [x / pivot_element for x in tabla[row]]
-
-        for i in range(len(tabla)):
-            if i != row:
-                ratio = tabla[i][col]
-                tabla[i] = [tabla[i][j] - ratio * tabla[row][j] for j in range(len(tabla[i]))]
-
-    def simplex(self, text_widget):
+        pivot(tabla, row, col)
+
+    def simplex(self, trace=None, history=None, stats=None, pricing=None):
+        """ trace: TraceSink, widget tk.Text o None (sin traza); history: TableauHistory opcional;
+            stats: SolveStats opcional (si no se da se crea uno; queda en self.stats);
+            pricing: regla de entrada ('dantzig' por defecto, ver Engine.Pricing) """
+        trace = as_trace(trace)
+        pricing = as_pricing(pricing)
+        self.stats = stats = stats if stats is not None else SolveStats()
         iteracion = 1
         n, m, c, A, b = self.n, self.m, self.c, self.A, self.b
         
-        # Initialize table
-        tabla = [[0] * (n + m + 1) for _ in range(m + 1)]
-        for i in range(m):
-            tabla[i][:n] = A[i]
-            tabla[i][n + i] = 1
-            tabla[i][-1] = b[i]
-
-        tabla[-1][:n] = [-ci for ci in c]
-
-        self.imprimir_tabla(tabla, text_widget, iteracion)
+        # Initialize table (contiguous float64 array, allocated once)
+        with stats.timer('standard form'):
+            tabla = np.zeros((m + 1, n + m + 1), dtype=np.float64)
+            fill_dense(tabla[:m, :n], as_constraint_matrix(A, (m, n)))
+            tabla[:m, n:n + m] = np.eye(m)
+            tabla[:m, -1] = b
+            tabla[-1, :n] = [-ci for ci in c]
+        stats.tableau(tabla)
+
+        if trace.level >= TABLEAU:
+            with stats.timer('display'):
+                self.imprimir_tabla(tabla, trace, iteracion)
         iteracion += 1
+        if history is not None:
+            history.start(tabla, range(n, n + m), 'Simplex')
+
+        base = np.arange(n, n + m)  # basic variable of each row
+        with stats.run_phase('simplex'):
+            costos = tabla[-1, :n + m]
+            while (costos < 0).any():
+                col = pricing.select(-costos, np.flatnonzero(costos < 0), tabla[:m, :-1])
+
+                # test del cociente (Harris); las entradas casi nulas nunca limitan el paso.
+                # Las columnas de holgura guardan B^-1 para la regla lexicográfica
+                row, paso = ratio_test(tabla[:m, col], tabla[:m, -1], lexico=tabla[:m, n:n + m],
+                                       basis=base, bland=pricing.bland)
+                if row is None:
+                    if trace.level >= SUMMARY:
+                        trace.write("Problema no acotado, no hay solución óptima.\n")
+                    self.status = 'unbounded'
+                    return {'Type': 'unbounded', 'Stats': stats}
+
+                if trace.level >= ITERATION:
+                    trace.write(f"Pivote en fila {row+1}, columna {col+1}\n")
+                elemento = tabla[row, col]
+                self.pivot(tabla, row, col)
+                stats.pivot(degenerate=paso == 0)
+                pricing.update(tabla[row, :-1], col, base[row])
+                base[row] = col
+                if history is not None:
+                    history.pivot(row, col, elemento)
+                trace.progress(iteracion, tabla[-1, -1])
+                if trace.level >= TABLEAU:
+                    with stats.timer('display'):
+                        self.imprimir_tabla(tabla, trace, iteracion)
+                iteracion += 1
+
+        # la solución se lee de la base: una columna no básica también puede ser unitaria
+        solucion = [0] * n
+        for fila, i in enumerate(base):
+            if i < n:
+                solucion[i] = tabla[fila, -1]
 
-        while any(tabla[-1][j] < 0 for j in range(n + m)):
-            col = min(range(n + m), key=lambda j: tabla[-1][j])
-
-            ratios = []
-            for i in range(m):
-                if tabla[i][col] > 0:
-                    ratios.append((tabla[i][-1] / tabla[i][col], i))
-                else:
-                    ratios.append((float('inf'), i))
-            row = min(ratios)[1]
-
-            if ratios[row][0] == float('inf'):
-                raise ValueError("Problema no acotado, no hay solución óptima.")
+        valor_optimo = tabla[-1][-1]
 
-            text_widget.insert(tk.END, f"Pivote en fila {row+1}, columna {col+1}\n")
-            self.pivot(tabla, row, col)
-            self.imprimir_tabla(tabla, text_widget, iteracion)
-            iteracion += 1
+        if trace.level >= SUMMARY:
+            with stats.timer('display'):
+                self.imprimir_solucion(tabla, trace, solucion, valor_optimo)
 
-        solucion = [0] * n
-        for i in range(n):
-            columna = [tabla[j][i] for j in range(m)]
-            if columna.count(1) == 1 and columna.count(0) == m - 1:
-                fila = columna.index(1)
-                solucion[i] = tabla[fila][-1]
+        self.status = 'optimal'
+        return {
+            'Type': 'optimal',
+            'Optimal Solution': {f"x{i+1}": float(solucion[i]) for i in range(n)},
+            'Optimal Objective': float(valor_optimo),
+            'Stats': stats
+        }
 
-        valor_optimo = tabla[-1][-1]
+    def imprimir_solucion(self, tabla, trace, solucion, valor_optimo):
+        n, m, c = self.n, self.m, self.c
 
         # Mostrar la solución
-        text_widget.insert(tk.END, "Solución óptima:\n")
+        trace.write("Solución óptima:\n")
         for i in range(n):
-            text_widget.insert(tk.END, f"x{i+1} = {solucion[i]:.4f}\n")
-        text_widget.insert(tk.END, f"Valor óptimo de la función objetivo: {valor_optimo:.4f}\n")
+            trace.write(f"x{i+1} = {solucion[i]:.4f}\n")
+        trace.write(f"Valor óptimo de la función objetivo: {valor_optimo:.4f}\n")
 
         # Mostrar la función objetivo en formato estándar
-        text_widget.insert(tk.END, "Función objetivo en formato estándar:\n")
+        trace.write("Función objetivo en formato estándar:\n")
         funcion_objetivo = "Z = "
         for i in range(n):
             funcion_objetivo += f"{c[i]:.2f}*x{i+1} "
@@ -81,12 +117,12 @@ class SimplexSolver:
                 signo = "+ " if valor_slack > 0 else "- "
                 funcion_objetivo += f"{signo}{abs(valor_slack):.2f}*s{i+1} "
         funcion_objetivo += f"= {valor_optimo:.2f}\n"
-        text_widget.insert(tk.END, funcion_objetivo)
+        trace.write(funcion_objetivo)
 
-    def imprimir_tabla(self, tabla, text_widget, iteracion):
-        text_widget.insert(tk.END, f"Tabla Simplex - Iteración {iteracion}:\n")
+    def imprimir_tabla(self, tabla, trace, iteracion):
+        trace.write(f"Tabla Simplex - Iteración {iteracion}:\n")
         for fila in tabla:
-            text_widget.insert(tk.END, "\t".join(map("{:.2f}".format, fila)) + "\n")
-        text_widget.insert(tk.END, "\n")
+            trace.write("\t".join(map("{:.2f}".format, fila)) + "\n")
+        trace.write("\n")
 
 
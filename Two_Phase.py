@@ -1,161 +1,303 @@
 import numpy as np
-import time
-import tkinter as tk
+from scipy import sparse
+from Engine.Dual import dual_simplex
+from Engine.Pivot import pivot
+from Engine.Pricing import as_pricing
+from Engine.RatioTest import ratio_test
+from Engine.Revised import RevisedSimplex
+from Engine.Sparse import as_constraint_matrix
+from Engine.Stats import SolveStats
+from Engine.Trace import ITERATION, SUMMARY, TABLEAU, as_trace
+
+# coefficient of the logical (slack/surplus) column of each kind of row
+_LOGICAL = {"≤": 1.0, "≥": -1.0, "=": 0.0}
+# prefix of each kind of column in the traces: x (decision), s (holgura), e (exceso)
+_PREFIX = {'decision': 'x', 'slack': 's', 'surplus': 'e'}
+
+
+def logical_columns(operators, n):
+    # coefficient of every row's logical column and its index after the n decision
+    # columns (-1 for '=' rows, which get none)
+    coefficient = np.array([_LOGICAL[op] for op in operators])
+    rows = np.flatnonzero(coefficient)
+    logical = np.full(coefficient.size, -1)
+    logical[rows] = n + np.arange(rows.size)
+    return coefficient, logical
+
+
+def crash_basis(operators, RHS, logical):
+    # Crash basis: a row whose slack column (or surplus column, once the row is
+    # multiplied by -1) can be basic at a nonnegative value starts with it, so
+    # only the remaining rows need an artificial variable. Returns the sign of
+    # every row and its starting column (-1 where an artificial is needed).
+    # RHS may be a stack of right-hand sides, one problem per row.
+    operators = np.asarray(operators)
+    sign = np.where((RHS < 0) | ((operators == "≥") & (RHS <= 0)), -1.0, 1.0)
+    covered = ((operators == "≤") & (sign > 0)) | ((operators == "≥") & (sign < 0))
+    return sign, np.where(covered, logical, -1)
 
 class LP_model_solver(object):
-    def __init__(self, vars_name, C, A, RHS, slack_vars, widget, operators, is_min):
+    def __init__(self, vars_name, C, A, RHS, slack_vars, widget, operators, is_min, lower=None, upper=None,
+                 history=None, stats=None):
         self.vars_name = vars_name
         self.C = np.array(C).astype(np.float64)
-        self.A = np.array(A).astype(np.float64)
         self.RHS = np.array(RHS).astype(np.float64)
+        # A may be dense, a scipy.sparse matrix or a list of (row, col, value) triplets
+        self.A = as_constraint_matrix(A, (self.RHS.size, self.C.size))
         self.slack_vars = np.array(slack_vars).astype(np.float64)
         self.original_is_min = is_min  # Guardamos la orientación original del problema
         self.is_min = True  # Siempre trabajamos con minimización internamente
         self._equal_threshold = 1e-6
-        self.text_widget = widget
+        # widget may be a TraceSink, a tk.Text (shown at the full tableau level) or None
+        self.trace = as_trace(widget)
+        self.history = history  # TableauHistory opcional: guarda los pivotes de cada tabla
+        # SolveStats: pivots, times and memory; every result carries it under 'Stats'
+        self.stats = stats if stats is not None else SolveStats()
         self.operators = operators
-        self._convert_to_standard_form()
+        self._warm = None  # final basis kept by optimize() for reoptimize()
+        self._engine = 'tableau'
+        self.pricing = as_pricing(None)  # entering rule, set by optimize()
+        self.artificial_rows = np.zeros(0, dtype=int)  # rows given an artificial variable in phase 1
+        with self.stats.timer('standard form'):
+            self._set_bounds(lower, upper)
+            self._convert_to_standard_form()
+            # upper bound of every standard-form column; slack/surplus columns are free above
+            self.upper_bounds = np.concatenate([self.upper - self.lower,
+                                                np.full(self.var_num - self.upper.size, np.inf)])
+        self._bounded = bool(np.isfinite(self.upper_bounds).any())
+
+    def _set_bounds(self, lower, upper):
+        # Bounded variables: lower <= x <= upper is handled without extra rows.
+        # Variables are shifted to x = lower + x' so that every column starts at zero.
+        n = self.C.size
+        self.lower = np.zeros(n) if lower is None else np.array(lower).astype(np.float64)
+        self.upper = np.full(n, np.inf) if upper is None else np.array(upper).astype(np.float64)
+        if not np.isfinite(self.lower).all():
+            raise ValueError("Lower bounds must be finite")
+        if (self.upper < self.lower).any():
+            raise ValueError("Upper bound smaller than lower bound")
+        if self.lower.any():
+            self.RHS = self.RHS - self.A.dot(self.lower)
+        # objective contribution of the shift, in the internal minimization sense
+        sign = 1.0 if self.original_is_min else -1.0
+        self._lower_offset = sign * float(np.dot(self.C, self.lower))
 
 
     def _convert_to_standard_form(self):
-        self.var_num = self.C.size  # total number of variables (before adding slack/surplus)
+        # Standard form: the decision variables, then one logical column per
+        # inequality row (slack +1 for '≤', surplus -1 for '≥'); '=' rows get none.
+        # slack_vars stays in the signature for the callers but adds no columns.
+        n = self.C.size  # number of decision variables
         self.const_num = self.RHS.size  # total number of constraints
-        
-        new_A = []
-        new_C = list(self.C)
-
-        # For each constraint, add slack or surplus based on the operator
-        for i in range(self.const_num):
-            if self.operators[i].get() == "≤":
-                # Add a slack variable
-                slack_col = np.zeros(self.const_num)
-                slack_col[i] = 1.0  # Slack variable for the `i-th` constraint
-                new_A.append(np.concatenate([self.A[i], slack_col]))  # Append slack to matrix row
-                new_C.append(0.0)  # No cost associated with slack variable
-
-            elif self.operators[i].get() == "≥":
-                # Add a surplus variable
-                surplus_col = np.zeros(self.const_num)
-                surplus_col[i] = -1.0  # Surplus variable (negative coefficient)
-                new_A.append(np.concatenate([self.A[i], surplus_col]))
-                new_C.append(0.0)  # No cost associated with surplus variable
-
-            elif self.operators[i].get() == "=":
-                if i < len(self.A):
-                    # Add the equality constraint without slack or surplus
-                    surplus_col = np.zeros(self.const_num)
-                    surplus_col[i] = 0.0  # Surplus variable (negative coefficient)
-                    new_A.append(np.concatenate([self.A[i], surplus_col]))
-                    new_C.append(0.0)  # No cost associated with surplus variable
-                else:
-                    print(f"Error: Trying to access index {i} in A which has length {len(self.A)}")
-
-                
-
-        # Update `self.A` and `self.C` with the extended matrix and cost vector
-        self.A = np.array(new_A).astype(np.float64)
-        self.C = np.array(new_C).astype(np.float64)
+        # logical column of every row (-1 for '=') and the column map used for display
+        coefficient, self.logical = logical_columns([self.operators[i].get() for i in range(self.const_num)], n)
+        rows = np.flatnonzero(coefficient)
+        self.var_num = n + rows.size  # total number of variables
+        self.column_map = [('decision', j) for j in range(n)] + \
+            [('slack' if coefficient[i] > 0 else 'surplus', int(i)) for i in rows]
 
-        ## convert the original LP to a minimization problem (if not) with standard form
-        self.var_num = self.C.size + self.slack_vars.size  # total number of variables
-        self.const_num = self.RHS.size # total number of constraints
-        # update the cost coefficients
         # Convertimos el problema original a un problema de minimización
-        if not self.original_is_min:
-            self.C = self.C * (-1.0)
-        new_C = list(self.C)
-        for _ in range(self.slack_vars.size):
-            new_C.append(0.0)
-        self.C = np.array(new_C).astype(np.float64)
-        # update the constraint matrix
-        slack_matrix = np.eye(self.slack_vars.size, dtype=np.float64) # identity matrix
-        new_A = []
-        for i in range(self.const_num):
-            new_A.append(np.concatenate([self.A[i], self.slack_vars[i]*slack_matrix[i]]))
-        self.A = np.array(new_A).astype(np.float64)
-
-    def _create_init_phase_1_tableau(self):
-        # Requirement 4: we introduce artificial variables, and start simplex with them
+        C = np.zeros(self.var_num)
+        C[:n] = self.C if self.original_is_min else -self.C
+        self.C = C
+        # the whole matrix is allocated once; sparse input stays sparse
+        if sparse.issparse(self.A):
+            logical = sparse.csc_matrix((coefficient[rows], (rows, np.arange(rows.size))),
+                                        shape=(self.const_num, rows.size))
+            self.A = sparse.hstack([self.A, logical], format='csc', dtype=np.float64)
+            self.A.eliminate_zeros()
+        else:
+            A = np.zeros((self.const_num, self.var_num))
+            A[:, :n] = self.A
+            A[rows, self.logical[rows]] = coefficient[rows]
+            self.A = A
+
+    @property
+    def column_names(self):
+        """ Nombres de las columnas de la forma estándar: x1.., s<fila> (holgura), e<fila> (exceso) """
+        return [self._column_label(col) for col in range(self.var_num)]
+
+    def _column_label(self, col):
+        # standard-form columns by the column map; artificial ones by their row
+        if col < self.var_num:
+            kind, index = self.column_map[col]
+            return f"{_PREFIX[kind]}{index + 1}"
+        return f"a{self.artificial_rows[col - self.var_num] + 1}"
+
+    def _crash_basis(self):
+        # sign of every row and its starting column, see crash_basis()
+        operators = [self.operators[i].get() for i in range(self.const_num)]
+        return crash_basis(operators, self.RHS, self.logical)
+
+    def _create_init_phase_1_tableau(self, sign, start):
+        # Requirement 4: we introduce artificial variables for the rows the crash
+        # basis leaves uncovered, and start simplex with them
+        need = np.flatnonzero(start < 0)
+        self.artificial_num = need.size
+        self.artificial_rows = need
+        width = self.var_num + self.artificial_num
         # index of the basic and non-basic variables
-        self.basis = list(range(self.var_num, (self.var_num + self.const_num)))
-        self.non_basis = list(range(self.var_num))
-        # now B is an identity matrix, based on which we can build the tableau
-        artif_matrix = np.eye(self.const_num, dtype=np.float64) # identity matrix
-        self.tableau = []
-        # there are in total constraints_num + 1 rows in the tableau
-        for row in range(self.const_num):
-            # non-artificial, artificial, RHS
-            self.tableau.append(np.concatenate([self.A[row], artif_matrix[row],
-                                                [self.RHS[row]]]))
-        # compute the last row of the tableau
-        last_row = np.concatenate([np.sum(self.A, axis=0), np.zeros((self.const_num, )),
-                                   [np.sum(self.RHS)]])
-        assert last_row.size == self.var_num + self.const_num + 1
-        self.tableau.append(last_row)
-        self.tableau = np.array(self.tableau).astype(np.float64)
-
-    def _simplex_tableau(self, text_widget):  # Pass in the text widget
+        basis = start.copy()
+        basis[need] = self.var_num + np.arange(self.artificial_num)
+        self.basis = [int(v) for v in basis]
+        in_basis = np.zeros(width, dtype=bool)
+        in_basis[basis] = True
+        self.non_basis = [int(v) for v in np.flatnonzero(~in_basis)]
+        # the tableau itself is dense, so sparse input is expanded here
+        A = self.A.toarray() if sparse.issparse(self.A) else self.A
+        # rows are multiplied by sign so that the starting basis is feasible and,
+        # for the logical columns, an identity
+        self.tableau = np.zeros((self.const_num + 1, width + 1), dtype=np.float64)
+        self.tableau[:-1, :self.var_num] = sign[:, None] * A
+        self.tableau[need, self.var_num + np.arange(self.artificial_num)] = 1.0
+        self.tableau[:-1, -1] = sign * self.RHS
+        # last row: phase 1 minimizes the sum of the artificial variables
+        self.tableau[-1, :self.var_num] = self.tableau[need, :self.var_num].sum(axis=0)
+        self.tableau[-1, -1] = self.tableau[need, -1].sum()
+        # columns currently replaced by their complement upper - x
+        self.flipped = np.zeros(width, dtype=bool)
+        self.column_upper = np.concatenate([self.upper_bounds, np.full(self.artificial_num, np.inf)])
+        self.stats.tableau(self.tableau)
+        if self.history is not None and self.artificial_num:
+            self.history.start(self.tableau, self.basis, 'Fase 1')
+
+    def _simplex_tableau(self):
         assert self.const_num == len(self.basis)
         iteration = 0
+        # the columns of the starting basis hold B^-1 B0, nonsingular: keys for the lexicographic rule
+        self._start_basis = list(self.basis)
         
         while any(self.tableau[-1][self.non_basis] > (0 + self._equal_threshold)):
-            reduced_cost = self.tableau[-1][self.non_basis]
-            
-            # Usar la regla de Bland para seleccionar la variable entrante
-            positive_indices = [i for i in range(len(reduced_cost)) if reduced_cost[i] > self._equal_threshold]
-            if not positive_indices:
+            self.trace.progress(iteration, self._current_objective())
+            # variable entrante según la regla de pricing; candidates keep the non_basis order
+            candidates = np.array(self.non_basis)
+            candidates = candidates[self.tableau[-1, candidates] > self._equal_threshold]
+            enter_axis = self.pricing.select(self.tableau[-1, :-1], candidates, self.tableau[:-1, :-1])
+            if enter_axis is None:
                 break  # No hay costos reducidos positivos, salir del bucle
-            
-            enter_axis_idx = np.argmax(reduced_cost)
-            enter_axis = self.non_basis[enter_axis_idx]
+            enter_axis_idx = self.non_basis.index(enter_axis)
             y_k = self.tableau[:-1, enter_axis]
 
-            if all(y_k <= (0 + self._equal_threshold)):
+            if self._bounded:
+                step, leave_axis_idx = self._bounded_ratio_test(enter_axis, y_k)
+            else:
+                leave_axis_idx, _ = self._ratio_test(y_k)
+                step = 'unbounded' if leave_axis_idx is None else 'lower'
+
+            if step == 'unbounded':
                 rc = self._get_recession_cone(enter_axis, y_k)
-                text_widget.insert(tk.END, "Solution is unbounded\n")
+                if self.trace.level >= SUMMARY:
+                    self.trace.write("Solution is unbounded\n")
                 return {'Type': 'unbounded', 'Recession Cone': rc}
-            
-            # Usar la regla de Bland para seleccionar la variable saliente
-            leave_candidates = [
-                (i, self.tableau[i, -1] / y_k[i])
-                for i in range(len(y_k))
-                if y_k[i] > self._equal_threshold
-            ]
-        
-            if not leave_candidates:
-                break  # No hay candidatos para salir, salir del bucle
-            
-            leave_axis_idx = self._lexicographic_rule(y_k)
-            self._update_tableau(enter_axis_idx, leave_axis_idx)  # Perform pivot
-            
-            # Mostrar tabla con encabezados ordenados
-            self._display_tableau(text_widget, iteration)
 
-            cur_sol, cur_obj = self._get_result()
-            
-            # Display each iteration in the Text widget
-            text_widget.insert(tk.END, f"\n=== Iteration #{iteration} ===\n")
-            text_widget.insert(tk.END, f"Entering variable: x{enter_axis + 1}\n")
-            text_widget.insert(tk.END, f"Leaving variable: x{self.basis[leave_axis_idx] + 1}\n")
-            text_widget.insert(tk.END, f"Current objective value: {cur_obj:.4f}\n")
-            text_widget.insert(tk.END, "Current basic solution:\n")
-            for var, value in cur_sol.items():
-                self.text_widget.insert(tk.END, f"x{var + 1}: {value:.4f}\n")
+            if step == 'flip':
+                # the entering variable reaches its own upper bound before any
+                # basic variable is blocked: complement it, the basis is unchanged
+                self._flip_column(enter_axis)
+                if self.trace.level >= ITERATION:
+                    self.trace.write(f"\n=== Iteration #{iteration} ===\n")
+                    self.trace.write(f"Bound flip: {self._column_label(enter_axis)}\n")
+                iteration += 1
+                continue
+
+            if step == 'upper':
+                # the blocking basic variable leaves at its upper bound
+                leave_axis = self.basis[leave_axis_idx]
+                self._flip_column(leave_axis)
+                self._update_tableau(enter_axis_idx, leave_axis_idx)
+                self.pricing.update(self.tableau[leave_axis_idx, :-1], enter_axis, leave_axis)
+                self._display_iteration(iteration, enter_axis, leave_axis_idx)
+                iteration += 1
+                continue
+
+            leave_axis = self.basis[leave_axis_idx]
+            self._update_tableau(enter_axis_idx, leave_axis_idx)  # Perform pivot
+            self.pricing.update(self.tableau[leave_axis_idx, :-1], enter_axis, leave_axis)
+            self._display_iteration(iteration, enter_axis, leave_axis_idx)
             
             iteration += 1
 
         optimal_solution, optimal_obj = self._get_result()
-        text_widget.insert(tk.END, f"\nOptimal solution found after {iteration} iterations:\n")
-        text_widget.insert(tk.END, f"Optimal Objective Value: {optimal_obj:.4f}\n")
-        text_widget.insert(tk.END, "Optimal solution (variable: value):\n")
-        for var, value in optimal_solution.items():
-            text_widget.insert(tk.END, f"x{var + 1}: {value:.4f}\n")
-        
-        print(self.tableau)
+        if self.trace.level >= SUMMARY:
+            self._write_optimum(iteration, optimal_obj, optimal_solution)
 
         return {'Type': 'optimal', 'Optimal Solution': optimal_solution, 'Optimal Objective': optimal_obj}
 
 
+    def _write_optimum(self, iteration, optimal_obj, optimal_solution):
+        self.trace.write(f"\nOptimal solution found after {iteration} iterations:\n")
+        self.trace.write(f"Optimal Objective Value: {optimal_obj:.4f}\n")
+        self.trace.write("Optimal solution (variable: value):\n")
+        for var, value in optimal_solution.items():
+            self.trace.write(f"{self._column_label(var)}: {value:.4f}\n")
+
+    def _display_iteration(self, iteration, enter_axis, leave_axis_idx):
+        if self.trace.level < ITERATION:
+            return
+        with self.stats.timer('display'):
+            self._write_iteration(iteration, enter_axis, leave_axis_idx)
+
+    def _write_iteration(self, iteration, enter_axis, leave_axis_idx):
+        # Mostrar tabla con encabezados ordenados
+        if self.trace.level >= TABLEAU:
+            self._display_tableau(iteration)
+
+        cur_sol, cur_obj = self._get_result()
+        
+        # Display each iteration in the trace
+        self.trace.write(f"\n=== Iteration #{iteration} ===\n")
+        self.trace.write(f"Entering variable: {self._column_label(enter_axis)}\n")
+        self.trace.write(f"Leaving variable: {self._column_label(self.basis[leave_axis_idx])}\n")
+        self.trace.write(f"Current objective value: {cur_obj:.4f}\n")
+        self.trace.write("Current basic solution:\n")
+        for var, value in cur_sol.items():
+            self.trace.write(f"{self._column_label(var)}: {value:.4f}\n")
+
+    def _bounded_ratio_test(self, enter_axis, y_k):
+        # Ratio test of the bounded-variable simplex. The entering variable grows
+        # until a basic variable hits zero ('lower'), a basic variable hits its
+        # upper bound ('upper') or the entering variable hits its own bound ('flip').
+        rhs = self.tableau[:-1, -1]
+        t_enter = self.column_upper[enter_axis]
+
+        leave_lower, t_lower = self._ratio_test(y_k)
+
+        t_upper, leave_upper = np.inf, None
+        u_B = self.column_upper[self.basis]
+        blocking = (y_k < -self._equal_threshold) & np.isfinite(u_B)
+        if blocking.any():
+            ratios = np.full(y_k.size, np.inf)
+            ratios[blocking] = (u_B[blocking] - rhs[blocking]) / -y_k[blocking]
+            leave_upper = int(np.argmin(ratios))
+            t_upper = ratios[leave_upper]
+
+        if min(t_enter, t_lower, t_upper) == np.inf:
+            return 'unbounded', None
+        if t_enter <= t_lower and t_enter <= t_upper:
+            return 'flip', None
+        if t_upper < t_lower:
+            return 'upper', leave_upper
+        return 'lower', leave_lower
+
+    def _flip_column(self, col):
+        # substitute x = u - x' in every row (objective row included)
+        self.tableau[:, -1] -= self.column_upper[col] * self.tableau[:, col]
+        self.tableau[:, col] *= -1.0
+        self.flipped[col] = not self.flipped[col]
+        self.stats.flip()
+        if self.history is not None:
+            self.history.flip(col, self.column_upper[col])
+
+    def _decision_values(self, solution):
+        # undo the complement and the lower-bound shift of the decision variables
+        values = {}
+        for v in range(len(self.vars_name)):
+            value = solution.get(v, 0.0)
+            if self.flipped[v]:
+                value = self.upper_bounds[v] - value
+            values[self.vars_name[v]] = value + self.lower[v]
+        return values
+
     def _validate_and_correct_z_row(self):
         """ Verifica y corrige si hay valores negativos en la fila Z que deberían ser positivos """
         for i in range(len(self.tableau[-1])):
@@ -163,27 +305,25 @@ class LP_model_solver(object):
                 # Corrige el valor para que sea positivo o igual a cero
                 self.tableau[-1][i] = abs(self.tableau[-1][i])
     
-    def _display_tableau(self, text_widget, iteration):
-        # Crear etiquetas dinámicas para las variables de decisión y holgura
-        decision_vars = [f"x{i+1}" for i in range(len(self.vars_name))]
-        slack_vars = [f"s{i+1}" for i in range(self.const_num)]
-        all_vars = decision_vars + slack_vars
+    def _display_tableau(self, iteration):
+        # Etiquetas de las columnas según el mapa de columnas de la forma estándar
+        all_vars = [self._column_label(col) for col in range(self.tableau.shape[1] - 1)]
         col_labels = all_vars + ["RHS"]
 
         # Encabezado de las columnas
-        text_widget.insert(tk.END, f"\nTabla de Iteración #{iteration}:\n")
-        text_widget.insert(tk.END, "  ".join(col_labels) + "\n")
+        self.trace.write(f"\nTabla de Iteración #{iteration}:\n")
+        self.trace.write("  ".join(col_labels) + "\n")
 
         # Mostrar las filas con las variables básicas
         for row in range(self.const_num):
-        # Variable básica (líder)
-            lead_var = all_vars[self.basis[row]] if self.basis[row] < len(all_vars) else f"s{self.basis[row] - len(all_vars) + 1}"
+            # Variable básica (líder)
+            lead_var = all_vars[self.basis[row]]
             row_values = [f"{v:.2f}" for v in self.tableau[row]]
-            text_widget.insert(tk.END, f"{lead_var}  " + "  ".join(row_values) + "\n")
+            self.trace.write(f"{lead_var}  " + "  ".join(row_values) + "\n")
 
         # Mostrar la última fila (la fila de z)
         z_values = [f"{v:.2f}" for v in self.tableau[-1]]
-        text_widget.insert(tk.END, f"z   " + "  ".join(z_values) + "\n")
+        self.trace.write(f"z   " + "  ".join(z_values) + "\n")
 
     def _format_value(self, value):
     # Si el valor es un número entero, muéstralo como entero, de lo contrario, muéstralo con 2 decimales
@@ -204,6 +344,10 @@ class LP_model_solver(object):
 
         return current_solution, current_obj
 
+    def _current_objective(self):
+        # same orientation as _get_result, without building the solution
+        return self.tableau[-1, -1] if self.original_is_min else -self.tableau[-1, -1]
+
     def _get_recession_cone(self, enter_axis, y_k):
         # the recession cone 'rc' is saved as a dict {var_idx: (a, b), ...},
         # where rc[var_idx] = a + b * z, z >= 0
@@ -226,44 +370,22 @@ class LP_model_solver(object):
         leave_axis = self.basis[leave_axis_idx]
         self.basis[leave_axis_idx] = enter_axis
         self.non_basis[enter_axis_idx] = leave_axis
-        # update the tableau
-        self.tableau[leave_axis_idx] = \
-            self.tableau[leave_axis_idx] / self.tableau[leave_axis_idx][enter_axis]
-        row_num = self.tableau.shape[0]
-        col_num = self.tableau.shape[1]
-        for row in range(row_num):
-            if row == leave_axis_idx:
-                continue
-            temp_ratio = \
-                self.tableau[row][enter_axis] / self.tableau[leave_axis_idx][enter_axis]
-            for col in range(col_num):
-                self.tableau[row][col] = self.tableau[row][col] - \
-                                         temp_ratio * self.tableau[leave_axis_idx][col]
-
-    def _lexicographic_rule(self, y_k):
+        # update the tableau with a single rank-1 elimination
+        element = self.tableau[leave_axis_idx, enter_axis]
+        # the objective moves by rhs * reduced cost / element: zero when either is zero
+        degenerate = abs(self.tableau[leave_axis_idx, -1]) <= self._equal_threshold or \
+            abs(self.tableau[-1, enter_axis]) <= self._equal_threshold
+        pivot(self.tableau, leave_axis_idx, enter_axis)
+        self.stats.pivot(degenerate)
+        if self.history is not None:
+            self.history.pivot(leave_axis_idx, enter_axis, element)
+
+    def _ratio_test(self, y_k):
+        # Harris ratio test; degenerate ties go to the lexicographic rule on the
+        # columns of the starting basis (or to Bland's rule with Bland pricing)
         assert y_k.size == self.const_num, y_k.size
-        ratio = []
-        for i in range(self.const_num):
-            if y_k[i] > 0 + self._equal_threshold:
-                ratio.append(self.tableau[i][-1]/y_k[i])
-            else:
-                ratio.append(float('inf'))
-        ratio = np.array(ratio)
-        leave_axis_list = np.where(ratio == np.min(ratio))[0]
-        if len(leave_axis_list) > 1:
-            col = 0
-            while len(leave_axis_list) > 1:
-                temp_ratio_list = []
-                for r in leave_axis_list:
-                    temp_ratio_list.append(self.tableau[r][col]/y_k[r])
-                temp_ratio_list = np.array(temp_ratio_list)
-                new_leave_axis_list = leave_axis_list[np.where(temp_ratio_list ==
-                                                               np.min(temp_ratio_list))[0]]
-                leave_axis_list = new_leave_axis_list
-                col += 1
-
-        assert len(leave_axis_list) == 1
-        return leave_axis_list[0]
+        return ratio_test(y_k, self.tableau[:-1, -1], self._equal_threshold,
+                          lexico=self.tableau[:-1, self._start_basis], basis=self.basis, bland=self.pricing.bland)
 
     def _categorize_variables(self):
 
@@ -273,7 +395,7 @@ class LP_model_solver(object):
                 basic_legitimate_vars.append(var)
             else:
                 nonbasic_legitimate_vars.append(var)
-        for var in range(self.var_num, self.var_num + self.const_num):  # all the artificial variables
+        for var in range(self.var_num, self.var_num + self.artificial_num):  # all the artificial variables
             if var in self.basis:
                 basic_artificial_vars.append(var)
             else:
@@ -309,70 +431,404 @@ class LP_model_solver(object):
                                 self._categorize_variables()
                             break
                     if is_redundancy:
-                        print("Redundancy occurs at row {} of the tableau!".format(row))
+                        if self.trace.level >= SUMMARY:
+                            self.trace.write("Redundancy occurs at row {} of the tableau!\n".format(row))
 
         # create new tableau for Phase 2
-        new_tableau = []
-        new_basis = []
-        for row in range(self.const_num):
-            if self.basis[row] < self.var_num:
-                new_tableau.append(np.concatenate([self.tableau[row][:self.var_num],
-                                                   [self.tableau[row][-1]]]))
-                new_basis.append(self.basis[row])
-        self.basis = new_basis
-        self.const_num = len(new_basis)
+        rows = [row for row in range(self.const_num) if self.basis[row] < self.var_num]
+        new_tableau = self.tableau[rows + [-1]][:, list(range(self.var_num)) + [-1]]
+        self.basis = [self.basis[row] for row in rows]
+        self.const_num = len(rows)
         # non_basis
-        self.non_basis = []
-        for col in range(self.var_num):
-            if col not in self.basis:
-                self.non_basis.append(col)
-        # last row
+        in_basis = np.zeros(self.var_num, dtype=bool)
+        in_basis[self.basis] = True
+        self.non_basis = [int(col) for col in np.flatnonzero(~in_basis)]
+        # last row; complemented columns carry the negated cost
+        self.flipped = self.flipped[:self.var_num]
+        self.column_upper = self.column_upper[:self.var_num]
+        C = np.where(self.flipped, -self.C, self.C)
+        c_b = C[self.basis]
         last_row = np.zeros((self.var_num + 1, ))
-        for col in self.non_basis:
-            reduced_cost = -self.C[col] # cost coefficient of the original problem,
-            for row in range(self.const_num):
-                c_b = self.C[self.basis[row]]
-                reduced_cost += c_b * new_tableau[row][col]
-            last_row[col] = reduced_cost
-        cur_obj = 0.0
-        for row in range(self.const_num):
-            c_b = self.C[self.basis[row]]
-            cur_obj += c_b * new_tableau[row][-1]
-        last_row[-1] = cur_obj
-        new_tableau.append(last_row)
-        self.tableau = np.array(new_tableau).astype(np.float64)
+        last_row[self.non_basis] = c_b.dot(new_tableau[:-1, self.non_basis]) - C[self.non_basis]
+        # constant part of the objective: complemented columns and lower bounds
+        last_row[-1] = np.dot(self.C[self.flipped], self.column_upper[self.flipped]) + self._lower_offset + \
+            c_b.dot(new_tableau[:-1, -1])
+        new_tableau[-1] = last_row
+        self.tableau = new_tableau
+        self.stats.tableau(self.tableau)
+        if self.history is not None:
+            self.history.start(self.tableau, self.basis, 'Fase 2')
+
+    def _display_revised_iteration(self, iteration, enter, leave, engine):
+        objective = engine.objective()
+        if leave is None:
+            self.stats.flip()
+        else:
+            self.stats.pivot(abs(objective - self._revised_objective) <= self._equal_threshold)
+        self._revised_objective = objective
+        cur_obj = objective if self.original_is_min else -objective
+        self.trace.progress(iteration, cur_obj)
+        if self.trace.level < ITERATION:
+            return
+        with self.stats.timer('display'):
+            self._write_revised_iteration(iteration, enter, leave, engine, cur_obj)
+
+    def _write_revised_iteration(self, iteration, enter, leave, engine, cur_obj):
+        self.trace.write(f"\n=== Iteration #{iteration - 1} ===\n")
+        if leave is None:
+            self.trace.write(f"Bound flip: {self._column_label(enter)}\n")
+            return
+        self.trace.write(f"Entering variable: {self._column_label(enter)}\n")
+        self.trace.write(f"Leaving variable: {self._column_label(leave)}\n")
+        self.trace.write(f"Current objective value: {cur_obj:.4f}\n")
+        self.trace.write("Current basic solution:\n")
+        for var, value in engine.solution().items():
+            self.trace.write(f"{self._column_label(var)}: {value:.4f}\n")
+
+    def _optimize_revised(self):
+        # Two-phase method on the revised simplex engine: only the LU factors of
+        # the basis are kept, never the full tableau
+        sign, start = self._crash_basis()
+        RHS = sign * self.RHS
+        m, n = self.A.shape
+        if sparse.issparse(self.A):
+            A = sparse.csc_matrix(sparse.diags(sign) @ self.A)
+        else:
+            A = sign[:, None] * self.A
+        keep, basis, at_upper = list(range(m)), [int(v) for v in start], None
+        need = np.flatnonzero(start < 0)
+
+        ## phase 1: artificial variables only where the crash basis has no slack
+        if need.size == 0:
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Base de holguras factible: se omite la Fase 1\n")
+        else:
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Inicia Fase 1 (simplex revisado)\n")
+            k = need.size
+            self.artificial_rows = need
+            artificial = sparse.csc_matrix((np.ones(k), (need, np.arange(k))), shape=(m, k))
+            if sparse.issparse(A):
+                A_1 = sparse.hstack([A, artificial], format='csc')
+            else:
+                A_1 = np.hstack([A, artificial.toarray()])
+            C_1 = np.concatenate([np.zeros(n), np.ones(k)])
+            upper_1 = np.concatenate([self.upper_bounds, np.full(k, np.inf)])
+            start = start.copy()
+            start[need] = n + np.arange(k)
+            self.stats.tableau(A_1)
+            with self.stats.run_phase('phase 1'):
+                engine = RevisedSimplex(A_1, RHS, C_1, start, self._equal_threshold, upper=upper_1,
+                                        pricing=self.pricing)
+                self._revised_objective = engine.objective()
+                engine.solve(self._display_revised_iteration)
+                if engine.objective() > self._equal_threshold:
+                    return {'Type': 'infeasible'}
+
+                # pivot the artificial variables left at zero out of the basis; rows
+                # where that is impossible are redundant and are dropped
+                redundant = []
+                for r in range(m):
+                    if engine.basis[r] < n:
+                        continue
+                    row = engine.row(r)[:n]
+                    row[[v for v in engine.basis if v < n]] = 0.0
+                    candidates = np.flatnonzero(np.abs(row) > self._equal_threshold)
+                    if candidates.size == 0:
+                        if self.trace.level >= SUMMARY:
+                            self.trace.write("Redundancy occurs at row {} of the tableau!\n".format(r))
+                        redundant.append(r)
+                        continue
+                    enter = candidates[np.argmax(np.abs(row[candidates]))]
+                    engine.pivot(r, enter, engine.ftran_column(enter))
+                    self.stats.pivot(degenerate=True)  # the artificial variable leaves at zero
+                keep = [r for r in range(m) if r not in redundant]
+                basis = [engine.basis[r] for r in keep]
+                at_upper = engine.at_upper[:n]
+
+        ## phase 2: original costs on the legitimate columns only
+        if self.trace.level >= SUMMARY:
+            self.trace.write("Inicia Fase 2 (simplex revisado)\n")
+        with self.stats.run_phase('phase 2'):
+            engine = RevisedSimplex(A[keep], RHS[keep], self.C, basis, self._equal_threshold,
+                                    upper=self.upper_bounds, at_upper=at_upper, pricing=self.pricing)
+            self._revised_objective = engine.objective()
+            status, info = engine.solve(self._display_revised_iteration)
+        self._warm = {'engine': 'revised', 'rows': keep, 'sign': sign}
+        return self._revised_result(engine, status, info)
+
+    def _revised_result(self, engine, status, info):
+        n = engine.c.size
+        self.basis = list(engine.basis)
+        self.engine = engine
+        # the engine reports actual values, nothing is complemented
+        self.flipped = np.zeros(n, dtype=bool)
+
+        if status == 'unbounded':
+            enter, column = info
+            rc = {v: (0.0, 0.0) for v in range(n)}
+            for i, v in enumerate(engine.basis):
+                rc[v] = (engine.x_B[i], -column[i])
+            rc[enter] = (0.0, 1.0)
+            return {'Type': 'unbounded', 'Recession Cone': dict(sorted(rc.items()))}
+
+        optimal_obj = engine.objective() + self._lower_offset
+        if not self.original_is_min:
+            optimal_obj *= -1.0
+        if self.trace.level >= SUMMARY:
+            self._write_optimum(engine.iterations, optimal_obj, engine.solution())
+        return {
+            'Type': 'optimal',
+            'Optimal Solution': self._decision_values(engine.solution()),
+            'Optimal Objective': optimal_obj
+        }
+
+    def _is_dual_feasible_start(self):
+        # With no equality rows, every row gets its own slack/surplus column. After
+        # multiplying the >= rows by -1 those columns form an identity basis whose
+        # reduced costs are just the (minimization) costs.
+        n = len(self.vars_name)
+        operators = [self.operators[i].get() for i in range(self.const_num)]
+        return "=" not in operators and not self._bounded and \
+            bool((self.C[:n] >= -self._equal_threshold).all())
+
+    def _create_dual_tableau(self):
+        n = len(self.vars_name)
+        m = self.const_num
+        A = self.A.toarray() if sparse.issparse(self.A) else self.A
+        sign = np.array([1.0 if self.operators[i].get() == "≤" else -1.0 for i in range(m)])
+        # with no '=' rows every row has its logical column n + i: after the sign
+        # change they form the identity
+        self.tableau = np.zeros((m + 1, n + m + 1), dtype=np.float64)
+        self.tableau[:m, :-1] = sign[:, None] * A
+        self.tableau[:m, -1] = sign * self.RHS
+        self.tableau[-1, :n] = -self.C[:n]
+        self.tableau[-1, -1] = self._lower_offset
+        self.basis = list(range(n, n + m))
+        self.non_basis = list(range(n))
+        self.flipped = np.zeros(n + m, dtype=bool)
+        self.column_upper = np.full(n + m, np.inf)
+        self.stats.tableau(self.tableau)
+        if self.history is not None:
+            self.history.start(self.tableau, self.basis, 'Simplex Dual')
+
+    def _dual_pivot_callback(self):
+        # dual_simplex reports each pivot after it is applied
+        objective = self.tableau[-1, -1]
+
+        def on_pivot(iteration, enter, leave, leave_row):
+            nonlocal objective
+            self.non_basis[self.non_basis.index(enter)] = leave
+            self.stats.pivot(abs(self.tableau[-1, -1] - objective) <= self._equal_threshold)
+            objective = self.tableau[-1, -1]
+            self.trace.progress(iteration, self._current_objective())
+            self._display_iteration(iteration, enter, leave_row)
+        return on_pivot
+
+    def _optimize_dual(self):
+        # Dual simplex from the slack/surplus basis: no artificial variables and no Phase 1
+        if not self._is_dual_feasible_start():
+            raise ValueError("The slack/surplus basis is not dual feasible for this problem")
+        if self.trace.level >= SUMMARY:
+            self.trace.write("Inicia Simplex Dual\n")
+        with self.stats.run_phase('dual'):
+            self._create_dual_tableau()
+            status = dual_simplex(self.tableau, self.basis, self._equal_threshold,
+                                  self._dual_pivot_callback(), self.history)
+        if status == 'infeasible':
+            return {'Type': 'infeasible'}
+        # the constraint columns of this tableau are the standard form itself, every row kept
+        self._warm = {'engine': 'tableau', 'full_rank': True}
+        optimal_solution, optimal_obj = self._get_result()
+        return {
+            'Type': 'optimal',
+            'Optimal Solution': self._decision_values(optimal_solution),
+            'Optimal Objective': optimal_obj
+        }
+
+    def reoptimize(self, C=None, RHS=None):
+        """ Reoptimiza desde la última base óptima tras cambiar los costos C y/o el lado derecho RHS """
+        result = self._reoptimize(C, RHS)
+        result['Stats'] = self.stats
+        return result
+
+    def _reoptimize(self, C, RHS):
+        n = len(self.vars_name)
+        if C is not None:
+            C = np.array(C).astype(np.float64)
+            self.C[:n] = C if self.original_is_min else -C
+            self._lower_offset = float(np.dot(self.C[:n], self.lower))
+        if RHS is not None:
+            self.RHS = np.array(RHS).astype(np.float64) - self.A[:, :n].dot(self.lower)
+
+        warm, self._warm = self._warm, None
+        if warm is None:
+            return self._restart()
+        if warm['engine'] == 'revised':
+            return self._reoptimize_revised(warm, RHS is not None)
+        return self._reoptimize_tableau(warm, RHS is not None)
+
+    def _restart(self):
+        # reoptimization fallback: a full solve with the same engine and pricing rule;
+        # the dual engine would reject costs that are no longer dual feasible, so
+        # 'auto' picks between it and the tableau
+        engine = 'auto' if self._engine == 'dual' else self._engine
+        return self.optimize(engine, self.pricing)
+
+    def _reoptimize_tableau(self, warm, rhs_changed):
+        if rhs_changed and (not warm['full_rank'] or self._bounded):
+            # redundant rows were dropped or bounds are active: start over
+            return self._restart()
+        n = len(self.vars_name)
+        T = self.tableau
+        cols = T.shape[1] - 1
+        col_sign = np.where(self.flipped, -1.0, 1.0)
+        u = np.where(self.flipped, self.column_upper, 0.0)
+
+        if rhs_changed:
+            # new basic solution x_B = B^-1 b; only the basic columns of A are densified
+            B = self.A[:, self.basis]
+            B = B.toarray() if sparse.issparse(B) else B
+            T[:-1, -1] = np.linalg.solve(B * col_sign[self.basis], self.RHS - self.A.dot(u))
+
+        # objective row: z_j - c_j with the (possibly new) costs
+        costs = np.zeros(cols)
+        costs[:n] = self.C[:n]
+        C = costs * col_sign
+        T[-1, :-1] = C[self.basis].dot(T[:-1, :-1]) - C
+        T[-1, self.basis] = 0.0
+        T[-1, -1] = C[self.basis].dot(T[:-1, -1]) + costs.dot(u) + self._lower_offset
+        if self.history is not None:
+            self.history.start(T, self.basis, 'Reoptimización')
+
+        rhs = T[:-1, -1]
+        if (rhs >= -self._equal_threshold).all():
+            # still primal feasible (cost change): continue with the primal simplex
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Reoptimiza con simplex primal\n")
+            with self.stats.run_phase('reoptimize'):
+                result = self._simplex_tableau()
+        elif (T[-1, self.non_basis] <= self._equal_threshold).all():
+            # still dual feasible (RHS change): continue with the dual simplex
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Reoptimiza con simplex dual\n")
+            with self.stats.run_phase('reoptimize'):
+                status = dual_simplex(T, self.basis, self._equal_threshold, self._dual_pivot_callback(),
+                                      self.history)
+            if status == 'infeasible':
+                return {'Type': 'infeasible'}
+            solution, objective = self._get_result()
+            result = {'Type': 'optimal', 'Optimal Solution': solution, 'Optimal Objective': objective}
+        else:
+            return self._restart()
+
+        if result['Type'] == 'optimal':
+            self._warm = warm
+        return self._final_result(result)
+
+    def _reoptimize_revised(self, warm, rhs_changed):
+        if rhs_changed and (len(warm['rows']) < self.RHS.size or self._bounded):
+            # redundant rows were dropped or bounds are active: start over
+            return self._restart()
+        engine = self.engine
+        engine.c = self.C
+        if rhs_changed:
+            engine.b = (warm['sign'] * self.RHS)[warm['rows']]
+            engine.x_B = engine._basic_values()
+        x_B = engine.x_B
+        if (x_B >= -self._equal_threshold).all() and \
+                (x_B <= engine.upper[engine.basis] + self._equal_threshold).all():
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Reoptimiza con simplex primal (simplex revisado)\n")
+            self._revised_objective = engine.objective()
+            with self.stats.run_phase('reoptimize'):
+                status, info = engine.solve(self._display_revised_iteration)
+        elif not self._bounded and (engine.reduced_costs() >= -self._equal_threshold).all():
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Reoptimiza con simplex dual (simplex revisado)\n")
+            self._revised_objective = engine.objective()
+            with self.stats.run_phase('reoptimize'):
+                status, info = engine.dual_solve(self._display_revised_iteration)
+            if status == 'infeasible':
+                return {'Type': 'infeasible'}
+        else:
+            return self._restart()
+        if status == 'optimal':
+            self._warm = warm
+        return self._revised_result(engine, status, info)
+
+    def _final_result(self, phase_2_result):
+        if phase_2_result['Type'] == 'optimal':
+            # _get_result already reports the objective in the original orientation
+            return {
+                'Type': 'optimal',
+                'Optimal Solution': self._decision_values(phase_2_result['Optimal Solution']),
+                'Optimal Objective': phase_2_result['Optimal Objective']
+            }
+        assert phase_2_result['Type'] == 'unbounded'
+        return {
+            'Type': 'unbounded',
+            'Recession Cone': phase_2_result['Recession Cone']
+        }
 
     # main function: linear optimization with two-phase simplex tableau method
-    def optimize(self):
-        start_time = time.time()
-
-        ## phase 1        
-        print("Inicia Fase 1\n")
-        self._create_init_phase_1_tableau()
-        phase_1_result = self._simplex_tableau(self.text_widget)
-        assert phase_1_result['Type'] == 'optimal'
-
-        if abs(phase_1_result['Optimal Objective']) > self._equal_threshold:
-            return {'Type': 'infeasible'}
+    def optimize(self, engine='tableau', pricing=None):
+        """ engine: 'tableau' (tabla completa), 'revised' (simplex revisado con base factorizada),
+            'dual' (simplex dual desde la base de holguras) o 'auto'
+            pricing: regla de entrada ('dantzig' por defecto, ver Engine.Pricing)
+
+            The result dict carries the solver's SolveStats under 'Stats'. The dual
+            engine picks its leaving row itself and ignores pricing; 'steepest' and
+            'devex' need the full tableau and are rejected by the revised engine. """
+        self.pricing = as_pricing(pricing)
+        result = self._optimize(engine)
+        result['Stats'] = self.stats
+        return result
+
+    def _optimize(self, engine):
+        # a fresh solve starts from the full standard form again
+        self.const_num = self.RHS.size
+        self._warm = None
+        self._engine = engine
+        if engine == 'auto':
+            engine = 'dual' if self._is_dual_feasible_start() else 'tableau'
+        if engine == 'revised':
+            return self._optimize_revised()
+        elif engine == 'dual':
+            return self._optimize_dual()
+        elif engine != 'tableau':
+            raise ValueError(f"Unknown engine: {engine}")
+
+        sign, start = self._crash_basis()
+        if (start >= 0).all():
+            # the slack/surplus basis is already feasible: no artificial variables, no Phase 1
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Base de holguras factible: se omite la Fase 1\nInicia Fase 2\n")
+            with self.stats.run_phase('phase 2'):
+                self._create_init_phase_1_tableau(sign, start)
+                self._convert_tableau_to_Phase_2()
         else:
-            print("Inicia Fase 2\n")
-            self._convert_tableau_to_Phase_2()
-            phase_2_result = self._simplex_tableau(self.text_widget)
-
-            if phase_2_result['Type'] == 'optimal':
-                optimal_obj = phase_2_result['Optimal Objective']
-                if not self.original_is_min:
-                    optimal_obj *= -1.0  # Invertimos el signo si el problema original era de maximización
-                
-                return {
-                    'Type': 'optimal',
-                    'Optimal Solution': {self.vars_name[v]: phase_2_result['Optimal Solution'][v] if v in phase_2_result['Optimal Solution'] else 0.0 for v in range(len(self.vars_name))},
-                    'Optimal Objective': optimal_obj
-                }
-            else:
-                print("Unbounded")
-                assert phase_2_result['Type'] == 'unbounded'
-                return {
-                    'Type': 'unbounded',
-                    'Recession Cone': phase_2_result['Recession Cone']
-                }
\ No newline at end of file
+            ## phase 1
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Inicia Fase 1\n")
+            with self.stats.run_phase('phase 1'):
+                self._create_init_phase_1_tableau(sign, start)
+                phase_1_result = self._simplex_tableau()
+            assert phase_1_result['Type'] == 'optimal'
+
+            if abs(phase_1_result['Optimal Objective']) > self._equal_threshold:
+                return {'Type': 'infeasible'}
+            if self.trace.level >= SUMMARY:
+                self.trace.write("Inicia Fase 2\n")
+            # pivoting the artificial variables out still belongs to phase 1
+            with self.stats.run_phase('phase 1'):
+                self._convert_tableau_to_Phase_2()
+
+        with self.stats.run_phase('phase 2'):
+            phase_2_result = self._simplex_tableau()
+
+        if phase_2_result['Type'] == 'optimal':
+            # keep the final tableau for reoptimize(); B can only be rebuilt
+            # from A when no redundant row was dropped
+            self._warm = {'engine': 'tableau', 'full_rank': self.const_num == self.RHS.size}
+        return self._final_result(phase_2_result)
\ No newline at end of file
@@ -0,0 +1 @@
+# the solvers are top-level modules and packages: let pytest import them from the repo root
@@ -0,0 +1,80 @@
+import csv
+import gzip
+import json
+import os
+import subprocess
+import sys
+import pytest
+from Engine.Batch import solve_problem
+from test_readers import _random_model, _write_lp, _write_mps
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _models(tmp_path):
+    # a tree with .mps, .lp and gzipped models, a file that is not a model and a broken one
+    (tmp_path / "nested").mkdir()
+    paths = []
+    for k, seed in enumerate([2, 5, 14, 20, 31, 33]):  # optimal and unbounded models
+        model = _random_model(seed)
+        if k % 3 == 0:
+            path = tmp_path / f"m{k}.mps"
+            _write_mps(path, model)
+        else:
+            path = tmp_path / "nested" / f"m{k}.lp"
+            _write_lp(path, model)
+        paths.append(str(path))
+    with gzip.open(tmp_path / "nested" / "m6.lp.gz", 'wt') as file:
+        file.write((tmp_path / "nested" / "m5.lp").read_text())
+    paths.append(str(tmp_path / "nested" / "m6.lp.gz"))
+    (tmp_path / "notes.txt").write_text("not a model\n")
+    (tmp_path / "broken.lp").write_text("Foo\n")
+    paths.append(str(tmp_path / "broken.lp"))
+    return paths
+
+
+def _run(*args):
+    return subprocess.run([sys.executable, '-m', 'Headless', *args], cwd=ROOT, capture_output=True,
+                          text=True, encoding='utf-8')
+
+
+@pytest.mark.parametrize("workers", ['1', '2'])
+def test_headless_jsonl(tmp_path, workers):
+    paths = _models(tmp_path)
+    run = _run(str(tmp_path), '-w', workers)
+    assert run.returncode == 1  # the broken model is reported as an error
+    records = {record['file']: record for record in map(json.loads, run.stdout.splitlines())}
+    assert sorted(records) == sorted(paths)
+    assert records[paths[-1]]['status'] == 'error' and records[paths[-1]]['error']
+    for path in paths[:-1]:
+        expected = solve_problem(dict(path=path))
+        record = records[path]
+        assert record['status'] == expected['Type']
+        if record['status'] == 'optimal':
+            assert record['objective'] == pytest.approx(expected['Optimal Objective'])
+            assert record['solution'] == pytest.approx(expected['Optimal Solution'])
+        assert 'pivots' in record and 'stats' in record and 'presolve' in record
+    assert run.stderr.strip().startswith(f"{len(paths)} models: ")
+
+
+def test_headless_csv_and_options(tmp_path):
+    paths = _models(tmp_path)[:-1]
+    output = tmp_path / "results.csv"
+    run = _run(*paths, '-o', str(output), '-w', '1', '-m', 'two-phase', '-e', 'revised', '-p', 'bland',
+               '--no-presolve', '--no-scaling')
+    assert run.returncode == 0 and run.stdout == ""
+    with open(output, newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['file'] for row in rows] == paths
+    for path, row in zip(paths, rows):
+        expected = solve_problem(dict(path=path, presolve=False))
+        assert row['status'] == expected['Type']
+        if row['status'] == 'optimal':
+            assert float(row['objective']) == pytest.approx(expected['Optimal Objective'])
+        assert row['error'] == ""
+
+
+def test_headless_with_no_models(tmp_path):
+    run = _run(str(tmp_path))
+    assert run.returncode == 0 and run.stdout == ""
+    assert "0 models: none found" in run.stderr
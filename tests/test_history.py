@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from BigM.Solver import BigMSolver
+from Engine.Batch import Operator
+from Engine.History import TableauHistory
+from Simplex import SimplexSolver
+from Two_Phase import LP_model_solver
+from test_solvers import _random_lps
+
+
+class _Recorder(TableauHistory):
+    # keeps a copy of the live tableau after every state, to compare with the replay
+    def __init__(self, snapshot_every):
+        super().__init__(snapshot_every)
+        self.states = []
+
+    def start(self, tableau, basis=None, label=''):
+        super().start(tableau, basis, label)
+        self.states.append((self._copy_live(), self._copy_basis()))
+
+    def _record(self, kind, row, col, value):
+        super()._record(kind, row, col, value)
+        self.states.append((self._copy_live(), self._copy_basis()))
+
+
+def _assert_replay(history, states):
+    assert len(history) == len(states)
+    for k, (tableau, basis) in enumerate(states):
+        rebuilt, rebuilt_basis = history.rebuild(k)
+        np.testing.assert_allclose(rebuilt, tableau, atol=1e-9)
+        assert (rebuilt_basis is None) == (basis is None)
+        if basis is not None:
+            assert list(rebuilt_basis) == list(basis)
+
+
+def _two_phase_histories(snapshot_every, engine):
+    rng = np.random.default_rng(3)
+    for c, A, b, operators, is_min in _random_lps(53, 20):
+        history = _Recorder(snapshot_every)
+        lower = upper = None
+        if engine == 'bounded':
+            lower = np.zeros(c.size)
+            upper = np.where(rng.random(c.size) < 0.6, rng.integers(1, 5, c.size), np.inf)
+        elif engine == 'dual':
+            # the slack/surplus basis of a minimization with c >= 0 is dual feasible
+            c, is_min, operators = np.abs(c), True, list(rng.choice(["≤", "≥"], b.size))
+        solver = LP_model_solver([f"x{j+1}" for j in range(c.size)], c, A, b, [1] * b.size, None,
+                                 [Operator(op) for op in operators], is_min, lower, upper, history=history)
+        solver.optimize('tableau' if engine == 'bounded' else engine)
+        yield history
+
+
+@pytest.mark.parametrize("engine", ['tableau', 'dual', 'bounded'])
+@pytest.mark.parametrize("snapshot_every", [1, 3, 1000])
+def test_two_phase_replay(engine, snapshot_every):
+    for history in _two_phase_histories(snapshot_every, engine):
+        _assert_replay(history, history.states)
+
+
+def test_big_m_and_simplex_replay():
+    for c, A, b, _, _ in _random_lps(59, 20):
+        operators = ["<=", ">=", "="] * b.size
+        history = _Recorder(2)
+        solver = BigMSolver(c.size, b.size, c.tolist(), A.tolist(), operators[:b.size], b.tolist())
+        solver.solve(history=history)
+        _assert_replay(history, history.states)
+        assert history.tableau(len(history) - 1).shape == (2,) + solver.tableau_c.shape
+
+        history = _Recorder(2)
+        SimplexSolver(c.size, b.size, c.tolist(), A.tolist(), np.abs(b).tolist()).simplex(history=history)
+        _assert_replay(history, history.states)
+
+
+@pytest.mark.parametrize("engine", ['tableau', 'bounded'])
+def test_saved_history_replays_the_same(tmp_path, engine):
+    for i, history in enumerate(_two_phase_histories(2, engine)):
+        path = tmp_path / f"history_{i}.npz"
+        history.save(path)
+        loaded = TableauHistory.load(path)
+        assert loaded.snapshot_every == history.snapshot_every
+        assert [loaded.label(k) for k in range(len(loaded))] == [history.label(k) for k in range(len(history))]
+        _assert_replay(loaded, history.states)
+
+
+def test_rebuild_out_of_range():
+    history = TableauHistory()
+    history.start(np.eye(2))
+    with pytest.raises(IndexError):
+        history.rebuild(1)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from Engine.Batch import solve_problem
+from Engine.Presolve import Presolve
+
+# one reduction of each kind: row 0 is empty, rows 1 and 2 are singletons (x2 = 3
+# fixes x2), row 4 is row 3 doubled, x4 is an empty column and x5 is dominated;
+# once x5 is gone row 5 is another copy of row 3
+MODEL = dict(c=[1, 1, 2, 0, -1],
+             A=[[0, 0, 0, 0, 0], [1, 0, 0, 0, 0], [0, 1, 0, 0, 0], [1, 0, 1, 0, 0], [2, 0, 2, 0, 0], [1, 0, 1, 0, 1]],
+             b=[5, 4, 3, 10, 30, 12],
+             operators=["≤", "≤", "=", "≤", "≤", "≤"])
+REPORT = {'rows': 6, 'columns': 5, 'nonzeros': 9, 'empty_rows': 1, 'fixed_columns': 1, 'empty_columns': 1,
+          'dominated_columns': 1, 'duplicate_rows': 2, 'reduced_columns': 2}
+
+
+@pytest.mark.parametrize("options,singleton_rows,reduced_rows", [
+    (dict(method='two-phase'), 2, 1),
+    (dict(method='two-phase', engine='revised'), 2, 1),
+    # without bounds the singleton x1 <= 4 stays a row
+    (dict(method='bigm'), 1, 2),
+])
+def test_presolve_report(options, singleton_rows, reduced_rows):
+    result = solve_problem(dict(MODEL, **options))
+    assert result['Presolve'] == dict(REPORT, singleton_rows=singleton_rows, reduced_rows=reduced_rows,
+                                      reduced_nonzeros=reduced_rows + 1)
+    assert result['Type'] == 'optimal'
+    assert list(result['Optimal Solution'].values()) == pytest.approx([0, 3, 10, 0, 0])
+    assert result['Optimal Objective'] == pytest.approx(23)
+
+
+def test_presolve_leaves_singleton_rows_to_the_dual_engine():
+    # the dual engine takes no bounds: x1 >= 1 must stay a row
+    result = solve_problem(dict(c=[1, 1], A=[[1, 0], [1, 1]], b=[1, 3], operators=["≥", "≥"], is_min=True,
+                                engine='dual'))
+    assert result['Presolve']['singleton_rows'] == 0
+    assert result['Optimal Objective'] == pytest.approx(3)
+    result = solve_problem(dict(c=[1, 1], A=[[1, 0], [1, 1]], b=[1, 3], operators=["≥", "≥"], is_min=True))
+    assert result['Presolve']['singleton_rows'] == 1
+    assert result['Optimal Objective'] == pytest.approx(3)
+
+
+def test_presolve_decides_the_problem():
+    # x1 = 3 and x1 <= 2: infeasible before any solver runs
+    result = solve_problem(dict(c=[1, 1], A=[[1, 0], [1, 0]], b=[3, 2], operators=["=", "≤"]))
+    assert result['Type'] == 'infeasible'
+    assert result['Presolve']['fixed_columns'] == 1 and result['Stats'].total_pivots == 0
+
+    # every row goes: x1 = 2 and an empty x2 with a positive minimization cost
+    presolve = Presolve([3, 1], [[1, 0]], [2], ["="], True)
+    assert presolve.run() is None
+    assert presolve.result(['x1', 'x2']) == {
+        'Type': 'optimal', 'Optimal Solution': {'x1': 2.0, 'x2': 0.0}, 'Optimal Objective': 6.0,
+        'Presolve': dict(presolve.report)}
+
+    # a column pushed toward an infinite bound is left for the solver
+    result = solve_problem(dict(c=[1, 1], A=[[1, 0]], b=[2], operators=["≤"]))
+    assert result['Type'] == 'unbounded'
+
+
+def test_presolve_keeps_sparse_input_sparse():
+    from scipy import sparse
+    presolve = Presolve(MODEL['c'], sparse.csr_matrix(MODEL['A']), MODEL['b'], MODEL['operators'], False)
+    assert sparse.issparse(presolve.run()['A'])
+    presolve = Presolve(**MODEL, is_min=False)
+    assert isinstance(presolve.run()['A'], np.ndarray)
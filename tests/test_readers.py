@@ -0,0 +1,186 @@
+import gzip
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+from Engine.Batch import solve_problem
+from Readers.Lp import read_lp
+from Readers.Model import read_model
+from Readers.Mps import read_mps
+
+_MPS_ROWS = {"≤": 'L', "≥": 'G', "=": 'E'}
+_LP_OPERATORS = {"≤": '<=', "≥": '>=', "=": '='}
+
+
+def _random_model(seed, m=5, n=6):
+    rng = np.random.default_rng(seed)
+    A = rng.integers(-4, 8, (m, n)) * (rng.random((m, n)) < 0.7)
+    A[0] = np.where(A[0] == 0, 1, A[0])  # every column appears in some row
+    lower = np.where(rng.random(n) < 0.4, rng.integers(-3, 3, n), 0).astype(float)
+    upper = np.where(rng.random(n) < 0.4, lower + rng.integers(0, 5, n), np.inf)
+    return {
+        'c': rng.integers(-5, 10, n).astype(float),
+        'A': A.astype(float),
+        'b': rng.integers(-5, 20, m).astype(float),
+        'operators': list(rng.choice(["≤", "≥", "="], m)),
+        'is_min': bool(rng.random() < 0.5),
+        'lower': lower,
+        'upper': upper,
+    }
+
+
+def _write_mps(path, model, fixed=False):
+    if fixed:
+        def line(kind, name='', row='', value='', row2='', value2=''):
+            # columns 2-3, 5-12, 15-22, 25-36, 40-47 and 50-61
+            return f" {kind:<2} {name:<8}  {row:<8}  {value:>12}   {row2:<8}  {value2:>12}".rstrip()
+    else:
+        def line(kind, *fields):
+            return " " + " ".join(field for field in (kind,) + fields if field)
+    lines = ["NAME          TEST", "OBJSENSE", "    MIN" if model['is_min'] else "    MAX", "ROWS",
+             line('N', 'obj')]
+    lines += [line(_MPS_ROWS[op], f"R{i}") for i, op in enumerate(model['operators'])]
+    lines.append("COLUMNS")
+    for j in range(model['c'].size):
+        entries = [('obj', model['c'][j])] + [(f"R{i}", v) for i, v in enumerate(model['A'][:, j]) if v]
+        for k in range(0, len(entries), 2):
+            pair = entries[k:k + 2]
+            lines.append(line('', f"x{j}", *(f for row, v in pair for f in (row, f"{v:g}"))))
+    lines.append("RHS")
+    lines += [line('', 'rhs', f"R{i}", f"{v:g}") for i, v in enumerate(model['b'])]
+    lines.append("BOUNDS")
+    for j, (lo, up) in enumerate(zip(model['lower'], model['upper'])):
+        if lo == up:
+            lines.append(line('FX', 'bnd', f"x{j}", f"{lo:g}"))
+            continue
+        if lo:
+            lines.append(line('LO', 'bnd', f"x{j}", f"{lo:g}"))
+        if np.isfinite(up):
+            lines.append(line('UP', 'bnd', f"x{j}", f"{up:g}"))
+    lines.append("ENDATA")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _expression(coefficients):
+    return " ".join(f"{'-' if v < 0 else '+'} {abs(v):g} x{j}" for j, v in coefficients)
+
+
+def _write_lp(path, model):
+    lines = ["Minimize" if model['is_min'] else "Maximize",
+             " obj: " + _expression(enumerate(model['c'])), "Subject To"]
+    for i, (row, op, rhs) in enumerate(zip(model['A'], model['operators'], model['b'])):
+        terms = [(j, v) for j, v in enumerate(row) if v]
+        lines.append(f" R{i}: {_expression(terms)} {_LP_OPERATORS[op]} {rhs:g}")
+    lines.append("Bounds")
+    for j, (lo, up) in enumerate(zip(model['lower'], model['upper'])):
+        if lo == up:
+            lines.append(f" x{j} = {lo:g}")
+        elif np.isfinite(up):
+            lines.append(f" {lo:g} <= x{j} <= {up:g}")
+        elif lo:
+            lines.append(f" x{j} >= {lo:g}")
+    lines.append("End")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _assert_same_model(read, model):
+    assert read['vars_name'] == [f"x{j}" for j in range(model['c'].size)]
+    np.testing.assert_array_equal(read['c'], model['c'])
+    np.testing.assert_array_equal(read['A'].toarray(), model['A'])
+    np.testing.assert_array_equal(read['b'], model['b'])
+    assert read['operators'] == model['operators']
+    assert read['is_min'] == model['is_min']
+    lower = read['lower'] if read['lower'] is not None else np.zeros(model['c'].size)
+    upper = read['upper'] if read['upper'] is not None else np.full(model['c'].size, np.inf)
+    np.testing.assert_array_equal(lower, model['lower'])
+    np.testing.assert_array_equal(upper, model['upper'])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mps_round_trip(tmp_path, seed):
+    model = _random_model(seed)
+    _write_mps(tmp_path / "model.mps", model)
+    _assert_same_model(read_mps(tmp_path / "model.mps"), model)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fixed_mps_round_trip(tmp_path, seed):
+    model = _random_model(seed)
+    _write_mps(tmp_path / "model.mps", model, fixed=True)
+    _assert_same_model(read_mps(tmp_path / "model.mps", fixed=True), model)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lp_round_trip(tmp_path, seed):
+    model = _random_model(seed)
+    _write_lp(tmp_path / "model.lp", model)
+    _assert_same_model(read_lp(tmp_path / "model.lp"), model)
+
+
+def test_gzipped_models_are_read(tmp_path):
+    model = _random_model(11)
+    _write_lp(tmp_path / "model.lp", model)
+    with gzip.open(tmp_path / "model.lp.gz", 'wt') as file:
+        file.write((tmp_path / "model.lp").read_text())
+    _assert_same_model(read_model(tmp_path / "model.lp.gz"), model)
+
+
+FREE_MPS = """NAME          FREE
+ROWS
+ N  obj
+ G  c1
+ L  c2
+ E  c3
+COLUMNS
+    x         obj       1.0        c1        1.0
+    x         c2        1.0
+    y         obj       2.0        c1        1.0
+    y         c3        1.0
+    z         obj       -1.0       c2        1.0
+    z         c3        1.0
+RHS
+    rhs       c1        -4.0       c2        5.0
+    rhs       c3        -2.0
+BOUNDS
+ FR bnd       x
+ MI bnd       y
+ UP bnd       y         3.0
+ LO bnd       z         -6.0
+ UP bnd       z         1.0
+ENDATA
+"""
+
+FREE_LP = """Minimize
+ obj: x + 2 y - z
+Subject To
+ c1: x + y >= -4
+ c2: x + z <= 5
+ c3: y + z = -2
+Bounds
+ x free
+ -inf <= y <= 3
+ -6 <= z <= 1
+End
+"""
+
+
+@pytest.mark.parametrize("name,text", [("free.mps", FREE_MPS), ("free.lp", FREE_LP)])
+@pytest.mark.parametrize("presolve", [True, False])
+def test_free_and_minus_infinite_columns(tmp_path, name, text, presolve):
+    (tmp_path / name).write_text(text)
+    reference = linprog([1, 2, -1], A_ub=[[-1, -1, 0], [1, 0, 1]], b_ub=[4, 5], A_eq=[[0, 1, 1]], b_eq=[-2],
+                        bounds=[(None, None), (None, 3), (-6, 1)])
+    result = solve_problem(dict(path=str(tmp_path / name), presolve=presolve))
+    assert result['Type'] == 'optimal'
+    assert result['Optimal Objective'] == pytest.approx(reference.fun)
+    assert list(result['Optimal Solution']) == ['x', 'y', 'z']
+    np.testing.assert_allclose(list(result['Optimal Solution'].values()), reference.x, atol=1e-9)
+
+
+def test_free_columns_with_bigm(tmp_path):
+    (tmp_path / "free.lp").write_text("Minimize\n obj: x + y\nSubject To\n c1: x - y >= -4\n"
+                                      " c2: x + y >= 2\nBounds\n x free\nEnd\n")
+    result = solve_problem(dict(path=str(tmp_path / "free.lp"), method='bigm'))
+    assert result['Type'] == 'optimal'
+    assert result['Optimal Objective'] == pytest.approx(2.0)
+    x, y = result['Optimal Solution']['x'], result['Optimal Solution']['y']
+    assert x - y >= -4 - 1e-9 and x + y >= 2 - 1e-9
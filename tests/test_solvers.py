@@ -0,0 +1,276 @@
+import itertools
+import numpy as np
+import pytest
+from scipy import sparse
+from scipy.optimize import linprog
+from Engine.Batch import _solve_quietly, solve_problem
+from Engine.Lockstep import solve_lockstep
+
+STATUS = {0: 'optimal', 2: 'infeasible', 3: 'unbounded'}
+
+
+def _random_lps(seed, count, max_size=6):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        m, n = rng.integers(1, max_size + 1, size=2)
+        c = rng.integers(-5, 10, n).astype(float)
+        A = rng.integers(-3, 7, (m, n)) * (rng.random((m, n)) < 0.6)
+        b = rng.integers(-6, 21, m).astype(float)
+        operators = list(rng.choice(["≤", "≥", "="], m))
+        yield c, A.astype(float), b, operators, bool(rng.random() < 0.5)
+
+
+def _reference(c, A, b, operators, is_min, bounds=(0, None)):
+    # scipy's status and objective; HiGHS may call an unbounded model infeasible,
+    # so an 'infeasible' answer is checked again without the objective
+    sign = np.array([1.0 if op == "≤" else -1.0 for op in operators])
+    inequality = np.array([op != "=" for op in operators])
+    kwargs = dict(bounds=bounds)
+    if inequality.any():
+        kwargs.update(A_ub=A[inequality] * sign[inequality, None], b_ub=b[inequality] * sign[inequality])
+    if not inequality.all():
+        kwargs.update(A_eq=A[~inequality], b_eq=b[~inequality])
+    result = linprog(c if is_min else -c, **kwargs)
+    status = STATUS[result.status]
+    if status == 'infeasible' and linprog(np.zeros(c.size), **kwargs).status == 0:
+        status = 'unbounded'
+    objective = None if status != 'optimal' else (result.fun if is_min else -result.fun)
+    return status, objective
+
+
+def _check(result, c, A, b, operators, status, objective):
+    assert result['Type'] == status
+    if status != 'optimal':
+        return
+    assert result['Optimal Objective'] == pytest.approx(objective, rel=1e-6, abs=1e-6)
+    x = np.array(list(result['Optimal Solution'].values()), dtype=float)
+    assert c @ x == pytest.approx(objective, rel=1e-6, abs=1e-6)
+    lhs = A @ x
+    for value, op, rhs in zip(lhs, operators, b):
+        if op == "≤":
+            assert value <= rhs + 1e-6
+        elif op == "≥":
+            assert value >= rhs - 1e-6
+        else:
+            assert value == pytest.approx(rhs, abs=1e-6)
+
+
+@pytest.mark.parametrize("presolve,scaling", list(itertools.product((True, False), (True, False))))
+@pytest.mark.parametrize("method,engine", [('two-phase', 'tableau'), ('two-phase', 'revised'),
+                                           ('two-phase', 'auto'), ('bigm', None), ('auto', None)])
+def test_random_lps_match_linprog(method, engine, presolve, scaling):
+    for c, A, b, operators, is_min in _random_lps(7, 60):
+        status, objective = _reference(c, A, b, operators, is_min)
+        problem = dict(c=c, A=A, b=b, operators=operators, is_min=is_min, method=method,
+                       presolve=presolve, scaling=scaling)
+        if engine is not None:
+            problem['engine'] = engine
+        _check(solve_problem(problem), c, A, b, operators, status, objective)
+
+
+def _two_phase(c, A, b, operators, is_min, lower=None, upper=None):
+    from Engine.Batch import Operator
+    from Two_Phase import LP_model_solver
+    return LP_model_solver([f"x{j+1}" for j in range(len(c))], c, A, b, [1] * len(b), None,
+                           [Operator(op) for op in operators], is_min, lower=lower, upper=upper)
+
+
+def _changes(rng, c, b, count=3):
+    # a sequence of cost, right-hand side or combined changes; costs may turn negative
+    for _ in range(count):
+        kind = rng.choice(['C', 'RHS', 'both'])
+        if kind != 'RHS':
+            c = rng.integers(-4, 10, c.size).astype(float)
+        if kind != 'C':
+            b = rng.integers(-6, 21, b.size).astype(float)
+        yield (c if kind != 'RHS' else None), (b if kind != 'C' else None)
+
+
+@pytest.mark.parametrize("sparse_input", [False, True])
+@pytest.mark.parametrize("engine", ['tableau', 'revised', 'auto'])
+def test_reoptimize_matches_linprog(engine, sparse_input):
+    rng = np.random.default_rng(23)
+    for c, A, b, operators, is_min in _random_lps(29, 60):
+        if rng.random() < 0.3:
+            # a copy of the first row is redundant until the right-hand sides part ways
+            A, b, operators = np.vstack([A, A[:1]]), np.append(b, b[0]), operators + operators[:1]
+        solver = _two_phase(c, sparse.csc_matrix(A) if sparse_input else A, b, operators, is_min)
+        solver.optimize(engine)
+        for new_c, new_b in _changes(rng, c, b):
+            result = solver.reoptimize(C=new_c, RHS=new_b)
+            c = new_c if new_c is not None else c
+            b = new_b if new_b is not None else b
+            _check(result, c, A, b, operators, *_reference(c, A, b, operators, is_min))
+
+
+def test_reoptimize_after_the_dual_engine_with_negative_costs():
+    rng = np.random.default_rng(31)
+    for c, A, b, _, _ in _random_lps(37, 60):
+        operators = list(rng.choice(["≤", "≥"], b.size))
+        c = np.abs(c)  # the slack/surplus basis is dual feasible for a minimization
+        solver = _two_phase(c, A, b, operators, True)
+        solver.optimize('dual')
+        for new_c, new_b in _changes(rng, c, b):
+            result = solver.reoptimize(C=new_c, RHS=new_b)
+            c = new_c if new_c is not None else c
+            b = new_b if new_b is not None else b
+            _check(result, c, A, b, operators, *_reference(c, A, b, operators, True))
+
+
+@pytest.mark.parametrize("engine", ['tableau', 'revised'])
+def test_reoptimize_with_bounds_matches_linprog(engine):
+    rng = np.random.default_rng(41)
+    for c, A, b, operators, is_min in _random_lps(43, 100):
+        lower = rng.integers(-2, 2, c.size).astype(float)
+        upper = np.where(rng.random(c.size) < 0.7, lower + rng.integers(0, 3, c.size), np.inf)
+        bounds = [(lo, None if np.isinf(up) else up) for lo, up in zip(lower, upper)]
+        solver = _two_phase(c, A, b, operators, is_min, lower, upper)
+        solver.optimize(engine)
+        for new_c, new_b in _changes(rng, c, b):
+            result = solver.reoptimize(C=new_c, RHS=new_b)
+            c = new_c if new_c is not None else c
+            b = new_b if new_b is not None else b
+            status, objective = _reference(c, A, b, operators, is_min, bounds)
+            assert result['Type'] == status
+            if status == 'optimal':
+                assert result['Optimal Objective'] == pytest.approx(objective, rel=1e-6, abs=1e-6)
+                x = np.array(list(result['Optimal Solution'].values()))
+                assert (x >= lower - 1e-6).all() and (x <= upper + 1e-6).all()
+
+
+@pytest.mark.parametrize("engine", ['tableau', 'revised'])
+def test_reoptimize_on_a_dropped_redundant_row(engine):
+    # the zero '=' row is redundant with rhs 0 and infeasible once its rhs is -2
+    c, A = np.array([1.0, 2.0]), np.array([[1.0, 1.0], [0.0, 0.0]])
+    solver = _two_phase(c, A, [1.0, 0.0], ["≥", "="], True)
+    assert solver.optimize(engine)['Type'] == 'optimal'
+    assert solver.reoptimize(RHS=[1.0, -2.0])['Type'] == 'infeasible'
+
+
+@pytest.mark.parametrize("presolve,scaling", list(itertools.product((True, False), (True, False))))
+def test_simplex_matches_linprog(presolve, scaling):
+    for c, A, b, _, _ in _random_lps(11, 60):
+        operators, b = ["≤"] * b.size, np.abs(b)
+        status, objective = _reference(c, A, b, operators, False)
+        result = solve_problem(dict(c=c, A=A, b=b, operators=operators, method='simplex',
+                                    presolve=presolve, scaling=scaling))
+        _check(result, c, A, b, operators, status, objective)
+
+
+def test_bigm_round_off_on_m_costs_terminates():
+    # entries of 5e5 leave round-off in the M plane that used to look like improving M costs
+    A = [[-0.03, 0, 0.01, 0, 0, -0.03], [2e5, 0, -2e5, 5e5, -3e5, -3e5], [0, 0, 0, 0, 0, 3],
+         [0, 100, 500, 500, 0, 400], [-200, 0, 0, 100, -100, 0], [0, 0, 0, 0, -0.001, 0]]
+    b = [-4, 6, 5, 10, 11, -1]
+    c = [-1, 4, 0, -1, -2, 0]
+    operators = ["≤", "=", "≤", "≥", "≤", "≥"]
+    status, _ = _reference(np.array(c, float), np.array(A), np.array(b, float), operators, True)
+    for presolve in (True, False):
+        result = solve_problem(dict(c=c, A=A, b=b, operators=operators, is_min=True, method='bigm',
+                                    presolve=presolve, scaling=False))
+        assert result['Type'] == status
+
+
+@pytest.mark.parametrize("engine", ['tableau', 'revised'])
+def test_bounded_variables_match_linprog(engine):
+    rng = np.random.default_rng(5)
+    for c, A, b, operators, is_min in _random_lps(13, 40):
+        lower = rng.integers(-3, 3, c.size).astype(float)
+        upper = np.where(rng.random(c.size) < 0.5, lower + rng.integers(0, 6, c.size), np.inf)
+        status, objective = _reference(c, A, b, operators, is_min,
+                                       [(lo, None if np.isinf(up) else up) for lo, up in zip(lower, upper)])
+        result = solve_problem(dict(c=c, A=A, b=b, operators=operators, is_min=is_min, engine=engine,
+                                    lower=lower, upper=upper))
+        assert result['Type'] == status
+        if status == 'optimal':
+            assert result['Optimal Objective'] == pytest.approx(objective, rel=1e-6, abs=1e-6)
+
+
+@pytest.mark.parametrize("pricing", ['dantzig', 'bland', 'steepest'])
+def test_lockstep_matches_linprog(pricing):
+    rng = np.random.default_rng(17)
+    batch, m, n = 80, 4, 6
+    operators = ["≤", "≥", "=", "≤"]
+    for is_min in (True, False):
+        C = rng.integers(-3, 9, (batch, n)).astype(float)
+        A = rng.integers(-2, 7, (batch, m, n)).astype(float)
+        RHS = rng.integers(-5, 30, (batch, m)).astype(float)
+        results = solve_lockstep([f"x{i+1}" for i in range(n)], C, A, RHS, operators, is_min, pricing=pricing)
+        for c, A_b, b, result in zip(C, A, RHS, results):
+            status, objective = _reference(c, A_b, b, operators, is_min)
+            _check(result, c, A_b, b, operators, status, objective)
+
+
+def test_simplex_errors_are_not_reported_as_unbounded():
+    problem = dict(c=[1, 1], A=[[1, -1]], b=[1], method='simplex')
+    assert solve_problem(problem)['Type'] == 'unbounded'
+    result = _solve_quietly(dict(problem, pricing='nope'))
+    assert result['Type'] == 'error'
+    assert 'pricing' in result['Error']
+
+
+def test_solve_many_over_shared_memory(monkeypatch):
+    # every A goes through shared memory; half of them as CSC arrays
+    import Engine.Batch
+    monkeypatch.setattr(Engine.Batch, 'SHARED_MIN_BYTES', 0)
+    models = list(_random_lps(19, 24))
+    problems = [dict(c=c, A=sparse.csc_matrix(A) if i % 2 else A, b=b, operators=operators, is_min=is_min)
+                for i, (c, A, b, operators, is_min) in enumerate(models)]
+    results = dict(Engine.Batch.solve_many(problems, workers=2, max_pending=3))
+    assert sorted(results) == list(range(len(models)))
+    for index, (c, A, b, operators, is_min) in enumerate(models):
+        _check(results[index], c, A, b, operators, *_reference(c, A, b, operators, is_min))
+
+
+@pytest.mark.parametrize("sparse_input", [False, True])
+def test_dual_engine_matches_linprog(sparse_input):
+    rng = np.random.default_rng(47)
+    for c, A, b, _, _ in _random_lps(61, 80):
+        # min with c >= 0 and no '=' rows: the slack/surplus basis is dual feasible
+        c, operators = np.abs(c), list(rng.choice(["≤", "≥"], b.size))
+        result = solve_problem(dict(c=c, A=sparse.csr_matrix(A) if sparse_input else A, b=b,
+                                    operators=operators, is_min=True, engine='dual'))
+        _check(result, c, A, b, operators, *_reference(c, A, b, operators, True))
+
+
+def test_dual_engine_rejects_a_start_that_is_not_dual_feasible():
+    with pytest.raises(ValueError):
+        solve_problem(dict(c=[1, 1], A=[[1, 1]], b=[2], operators=["="], is_min=True, engine='dual'))
+    with pytest.raises(ValueError):
+        solve_problem(dict(c=[-1, 1], A=[[1, 1]], b=[2], operators=["≤"], is_min=True, engine='dual',
+                           presolve=False))
+
+
+def _triplets(A):
+    # COO triplets with one entry split in two, which must be summed
+    rows, cols = np.nonzero(A)
+    triplets = [(int(i), int(j), float(A[i, j])) for i, j in zip(rows, cols)]
+    if triplets:
+        i, j, value = triplets.pop()
+        triplets += [(i, j, value / 2), (i, j, value / 2)]
+    return triplets
+
+
+@pytest.mark.parametrize("kind", ['csr', 'csc', 'coo', 'triplets'])
+@pytest.mark.parametrize("method,engine", [('two-phase', 'tableau'), ('two-phase', 'revised'), ('bigm', None)])
+def test_sparse_input_matches_linprog(method, engine, kind):
+    convert = {'csr': sparse.csr_matrix, 'csc': sparse.csc_matrix, 'coo': sparse.coo_matrix, 'triplets': _triplets}
+    for c, A, b, operators, is_min in _random_lps(67, 40):
+        if kind == 'triplets' and not A.any():
+            continue  # an empty list is read as a dense matrix with no rows
+        problem = dict(c=c, A=convert[kind](A), b=b, operators=operators, is_min=is_min, method=method)
+        if engine is not None:
+            problem['engine'] = engine
+        for presolve in (True, False):
+            result = solve_problem(dict(problem, presolve=presolve))
+            _check(result, c, A, b, operators, *_reference(c, A, b, operators, is_min))
+
+
+def test_revised_engine_keeps_sparse_input_sparse():
+    # x_i + x_{i+1} >= 1: the revised engine must never build an n x n dense block
+    n = 600
+    A = sparse.eye(n, format='csc') + sparse.eye(n, k=1, format='csc')
+    result = solve_problem(dict(c=np.ones(n), A=A, b=np.ones(n), operators=["≥"] * n, is_min=True,
+                                engine='revised', presolve=False))
+    assert result['Optimal Objective'] == pytest.approx(n / 2)
+    assert result['Stats'].peak_tableau_bytes < n * n * 8 / 10
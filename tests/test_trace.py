@@ -0,0 +1,101 @@
+import io
+import queue
+import threading
+import numpy as np
+import pytest
+from Engine.Batch import solve_problem
+from Engine.Stats import SolveStats
+from Engine.Trace import (ITERATION, NONE, SUMMARY, TABLEAU, FileTrace, NullTrace, QueueTrace,
+                          SolveCancelled, TextWidgetTrace, TraceSink, as_trace)
+
+METHODS = [dict(method='two-phase', engine='tableau'), dict(method='two-phase', engine='revised'),
+           dict(method='bigm'), dict(method='simplex')]
+PROBLEM = dict(c=[3, 2, 4], A=[[1, 1, 2], [2, 0, 3], [2, 1, 3]], b=[4, 5, 7],
+               operators=["≤", "≤", "≤"], scaling=False, presolve=False)
+
+
+class _Recorder(TraceSink):
+    def __init__(self, level):
+        self.level = level
+        self.text = []
+        self.iterations = []
+
+    def write(self, text):
+        self.text.append(text)
+
+    def progress(self, iteration, objective):
+        self.iterations.append(iteration)
+
+
+@pytest.mark.parametrize("options", METHODS)
+def test_trace_levels(options):
+    outputs = {}
+    for level in (NONE, SUMMARY, ITERATION, TABLEAU):
+        sink = _Recorder(level)
+        stats = SolveStats()
+        result = solve_problem(dict(PROBLEM, trace=sink, stats=stats, **options))
+        assert result['Type'] == 'optimal'
+        assert result['Optimal Objective'] == pytest.approx(10.5)
+        # progress arrives at every level, once per iteration
+        assert sink.iterations and sink.iterations == sorted(sink.iterations)
+        outputs[level] = ''.join(sink.text)
+    assert outputs[NONE] == ''  # nothing is formatted at level NONE
+    # Big M adds nothing at the iteration level; the revised engine keeps no tableau to show
+    assert 0 < len(outputs[SUMMARY]) <= len(outputs[ITERATION]) <= len(outputs[TABLEAU])
+    assert len(outputs[SUMMARY]) < len(outputs[TABLEAU])
+    assert "10.5" in outputs[SUMMARY]
+
+
+def test_file_and_widget_sinks(tmp_path):
+    path = tmp_path / "trace.txt"
+    with FileTrace(str(path), level=SUMMARY) as sink:
+        solve_problem(dict(PROBLEM, trace=sink))
+    assert sink.file.closed and path.read_text(encoding='utf-8')
+
+    stream = io.StringIO()
+    with FileTrace(stream) as sink:
+        solve_problem(dict(PROBLEM, trace=sink))
+    assert not stream.closed and stream.getvalue()
+
+    class Widget:
+        def __init__(self):
+            self.text = []
+
+        def insert(self, index, text):
+            assert index == "end"
+            self.text.append(text)
+
+    widget = Widget()
+    sink = as_trace(widget)
+    assert isinstance(sink, TextWidgetTrace) and sink.level == TABLEAU
+    solve_problem(dict(PROBLEM, trace=widget))
+    assert widget.text
+    assert isinstance(as_trace(None), NullTrace) and as_trace(sink) is sink
+    assert TextWidgetTrace(widget, 'summary').level == SUMMARY
+
+
+def test_queue_trace_buffers_text_per_iteration():
+    events = queue.Queue()
+    sink = QueueTrace(events, threading.Event(), level=ITERATION)
+    solve_problem(dict(PROBLEM, trace=sink, method='two-phase'))
+    sink.flush()
+    items = []
+    while not events.empty():
+        items.append(events.get())
+    assert {item[0] for item in items} == {'text', 'progress'}
+    # text never arrives in two consecutive chunks: it is sent once per iteration
+    assert all(not (a[0] == b[0] == 'text') for a, b in zip(items, items[1:]))
+
+
+@pytest.mark.parametrize("options", METHODS)
+def test_queue_trace_cancel(options):
+    events, cancel = queue.Queue(), threading.Event()
+    cancel.set()
+    sink = QueueTrace(events, cancel)
+    with pytest.raises(SolveCancelled):
+        solve_problem(dict(PROBLEM, trace=sink, **options))
+    # the solve stops at the first progress() call, after reporting it
+    items = []
+    while not events.empty():
+        items.append(events.get())
+    assert [item[0] for item in items].count('progress') == 1